@@ -0,0 +1,104 @@
+"""Compare the WSGI and ASGI read paths under concurrent load.
+
+Start the two servers against the same database with read throttling
+disabled, e.g.::
+
+    export THROTTLE_RATE_READ=
+    python manage.py runserver 8000
+    uvicorn social_media_api.asgi:application --port 8001 --workers 1
+
+then point the load generator at both::
+
+    python -m benchmarks.bench_asgi --token <access token> \\
+        --target wsgi=http://127.0.0.1:8000 --target asgi=http://127.0.0.1:8001
+
+``uvicorn`` is not a project requirement; any ASGI server works.
+"""
+
+import argparse
+import asyncio
+import time
+
+import aiohttp
+
+from benchmarks.common import print_table, summarize
+
+PATHS = (
+    "/api/features/post/",
+    "/api/features/comment/",
+    "/api/features/follow/",
+)
+
+
+async def worker(session, base_url, headers, queue, durations, errors):
+    while True:
+        try:
+            path = queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        start = time.perf_counter()
+        try:
+            async with session.get(base_url + path, headers=headers) as response:
+                await response.read()
+                if response.status != 200:
+                    errors.append(response.status)
+        except aiohttp.ClientError as exc:
+            errors.append(type(exc).__name__)
+        durations.append(time.perf_counter() - start)
+
+
+async def run_target(base_url, token, requests, concurrency):
+    queue = asyncio.Queue()
+    for index in range(requests):
+        queue.put_nowait(PATHS[index % len(PATHS)])
+
+    durations, errors = [], []
+    headers = {"Authorization": f"Bearer {token}"}
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(
+                worker(session, base_url, headers, queue, durations, errors)
+                for _ in range(concurrency)
+            )
+        )
+        elapsed = time.perf_counter() - start
+    return summarize(durations, elapsed), errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--token", required=True, help="JWT access token")
+    parser.add_argument(
+        "--target",
+        action="append",
+        required=True,
+        help="name=base_url, may be given several times",
+    )
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    rows = []
+    for target in args.target:
+        name, _, base_url = target.partition("=")
+        summary, errors = asyncio.run(
+            run_target(
+                base_url.rstrip("/"), args.token, args.requests, args.concurrency
+            )
+        )
+        rows.append(
+            {
+                "target": name,
+                "rps": f"{summary['rps']:.0f}",
+                "p50_ms": f"{summary['p50_ms']:.1f}",
+                "p99_ms": f"{summary['p99_ms']:.1f}",
+                "errors": len(errors),
+            }
+        )
+    print_table(rows, ["target", "rps", "p50_ms", "p99_ms", "errors"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Queries and latency per authenticated GET with and without the user query.
+
+Runs the same requests through the test client once with simplejwt's
+``JWTAuthentication`` and once with ``StatelessJWTAuthentication``::
+
+    python -m benchmarks.bench_auth --repeat 500
+"""
+
+import argparse
+from unittest import mock
+
+from benchmarks.common import print_table, setup_django, summarize, test_database, timed
+
+URLS = (
+    "/api/features/post/",
+    "/api/features/follow/",
+    "/api/user/profile/",
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth import get_user_model
+    from django.core.cache import cache
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.test import APIClient
+    from rest_framework.views import APIView
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+
+    from features.models import Post
+    from user.authentication import StatelessJWTAuthentication
+    from user.serializers import LoginSerializer
+
+    with test_database():
+        user = get_user_model().objects.create_user("bench", "benchpass")
+        Post.objects.bulk_create(
+            [Post(author=user, content=f"Post {i}") for i in range(20)]
+        )
+        token = LoginSerializer.get_token(user).access_token
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        rows = []
+        for authentication_class in (JWTAuthentication, StatelessJWTAuthentication):
+            with mock.patch.object(
+                APIView, "authentication_classes", [authentication_class]
+            ):
+                for url in URLS:
+                    cache.clear()
+                    client.get(url)
+                    with CaptureQueriesContext(connection) as queries:
+                        client.get(url)
+                    # Read now, later requests reset the query log
+                    query_count = len(queries)
+                    summary = summarize(timed(lambda: client.get(url), args.repeat))
+                    rows.append(
+                        {
+                            "authentication": authentication_class.__name__,
+                            "url": url,
+                            "queries": query_count,
+                            "p50_ms": f"{summary['p50_ms']:.2f}",
+                            "p99_ms": f"{summary['p99_ms']:.2f}",
+                        }
+                    )
+        print_table(rows, ["authentication", "url", "queries", "p50_ms", "p99_ms"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""CPU time and bytes of polling unchanged lists and profiles.
+
+Each url is polled ``--repeat`` times per round through the test client,
+the fastest round being reported, in three modes: ``uncached`` with the response cache disabled, ``cached`` served
+from the response cache, and ``etag`` sending the ETag of the previous
+response in ``If-None-Match``::
+
+    python -m benchmarks.bench_conditional_get --rounds 5 --repeat 200
+"""
+
+import argparse
+import time
+
+from benchmarks.common import print_table, setup_django, test_database
+
+URLS = (
+    "/api/features/post/?expand=author",
+    "/api/features/comment/?post={post_id}",
+    "/api/user/profile/",
+)
+
+
+def poll(client, url, repeat, headers):
+    """CPU microseconds and response bytes per request"""
+    start = time.process_time()
+    for _ in range(repeat):
+        response = client.get(url, **headers)
+    cpu = (time.process_time() - start) / repeat * 1e6
+    return cpu, len(response.content), response.status_code
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth import get_user_model
+    from django.test.utils import override_settings
+    from rest_framework.test import APIClient
+
+    from features.models import Post, Comment
+    from user.serializers import LoginSerializer
+
+    with test_database():
+        user = get_user_model().objects.create_user("bench", "benchpass")
+        posts = Post.objects.bulk_create(
+            [Post(author=user, content=f"Post {i} " * 20) for i in range(40)]
+        )
+        Comment.objects.bulk_create(
+            [
+                Comment(author=user, post=posts[0], content=f"Reply {i}")
+                for i in range(40)
+            ]
+        )
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {LoginSerializer.get_token(user).access_token}"
+        )
+
+        rows = []
+        for url in URLS:
+            url = url.format(post_id=posts[0].id)
+            etag = client.get(url)["ETag"]
+            modes = {
+                "uncached": ({"RESPONSE_CACHE_TTL": 0}, {}),
+                "cached": ({}, {}),
+                "etag": ({}, {"HTTP_IF_NONE_MATCH": etag}),
+            }
+            samples = {mode: [] for mode in modes}
+            order = list(modes)
+            for _ in range(args.rounds):
+                # Alternate the order so no mode always runs warm
+                order.reverse()
+                for mode in order:
+                    settings, headers = modes[mode]
+                    with override_settings(**settings):
+                        client.get(url, **headers)
+                        samples[mode].append(poll(client, url, args.repeat, headers))
+            results = {
+                mode: (min(cpu for cpu, _, _ in runs), *runs[-1][1:])
+                for mode, runs in samples.items()
+            }
+            for mode, (cpu, size, status) in results.items():
+                rows.append(
+                    {
+                        "url": url,
+                        "mode": mode,
+                        "status": status,
+                        "cpu_us": f"{cpu:.0f}",
+                        "bytes": size,
+                        "cpu_saved": f"{(1 - cpu / results['uncached'][0]) * 100:.0f}%",
+                    }
+                )
+        print_table(rows, ["url", "mode", "status", "cpu_us", "bytes", "cpu_saved"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Latency overhead of the request instrumentation middleware.
+
+Alternates rounds of the same GET requests through the test client with and
+without ``InstrumentationMiddleware`` and compares the medians::
+
+    python -m benchmarks.bench_instrumentation --rounds 10 --repeat 200
+"""
+
+import argparse
+
+from benchmarks.common import print_table, setup_django, summarize, test_database, timed
+
+URLS = (
+    "/api/features/post/",
+    "/api/features/follow/",
+    "/api/user/profile/",
+)
+
+MIDDLEWARE = "social_media_api.instrumentation.InstrumentationMiddleware"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+    from django.test.utils import override_settings
+    from rest_framework.test import APIClient
+
+    from features.models import Post, Follow
+    from user.serializers import LoginSerializer
+
+    with test_database():
+        user = get_user_model().objects.create_user("bench", "benchpass")
+        others = [
+            get_user_model().objects.create_user(f"other{i}", "benchpass")
+            for i in range(20)
+        ]
+        Post.objects.bulk_create(
+            [Post(author=user, content=f"Post {i}") for i in range(20)]
+        )
+        Follow.objects.bulk_create(
+            [Follow(follower=user, followed=other) for other in others]
+        )
+        token = LoginSerializer.get_token(user).access_token
+        without = [name for name in settings.MIDDLEWARE if name != MIDDLEWARE]
+
+        def client():
+            client = APIClient()
+            client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+            return client
+
+        # Response caching would reduce the views to a cache lookup
+        with override_settings(RESPONSE_CACHE_TTL=0):
+            rows = []
+            for url in URLS:
+                samples = {"off": [], "on": []}
+                modes = [("off", without), ("on", settings.MIDDLEWARE)]
+                for _ in range(args.rounds):
+                    # Alternate the order so neither mode always runs warm
+                    modes.reverse()
+                    for mode, middleware in modes:
+                        with override_settings(MIDDLEWARE=middleware):
+                            instance = client()
+                            instance.get(url)
+                            samples[mode] += timed(
+                                lambda: instance.get(url), args.repeat
+                            )
+                off = summarize(samples["off"])
+                on = summarize(samples["on"])
+                rows.append(
+                    {
+                        "url": url,
+                        "off_p50_ms": f"{off['p50_ms']:.3f}",
+                        "on_p50_ms": f"{on['p50_ms']:.3f}",
+                        "overhead": f"{(on['p50_ms'] / off['p50_ms'] - 1) * 100:+.1f}%",
+                    }
+                )
+        print_table(rows, ["url", "off_p50_ms", "on_p50_ms", "overhead"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Storing notification events one at a time and in coalesced batches.
+
+``--events`` likes by ``--events`` distinct users, spread over ``--posts``
+posts, are delivered by ``features.notifications.deliver`` one event per
+call, as a task per request would, and in batches of ``--batch`` events,
+as the ``deliver_notifications`` task receives them. Notifications are
+marked read between rounds so every round starts from new rows::
+
+    python -m benchmarks.bench_notifications --events 2000 --batch 200
+"""
+
+import argparse
+import time
+
+from benchmarks.common import print_table, setup_django, test_database
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--posts", type=int, default=20)
+    parser.add_argument("--batch", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth import get_user_model
+
+    from features import notifications
+    from features.models import Post, Notification
+
+    with test_database():
+        users = get_user_model().objects.bulk_create(
+            get_user_model()(username=f"bench{i}", password="x")
+            for i in range(args.events + 1)
+        )
+        posts = Post.objects.bulk_create(
+            Post(author=users[-1], content=f"Benchmark post {i}")
+            for i in range(args.posts)
+        )
+        events = [
+            (Notification.Verb.LIKE, users[i].id, posts[i % args.posts].id)
+            for i in range(args.events)
+        ]
+        sizes = {"per-event": 1, f"batch-{args.batch}": args.batch}
+
+        samples = {mode: [] for mode in sizes}
+        rows_written = {}
+        for _ in range(args.rounds):
+            for mode, size in sizes.items():
+                notifications.mark_read(users[-1].id)
+                before = Notification.objects.count()
+                start = time.perf_counter()
+                for index in range(0, len(events), size):
+                    notifications.deliver(events[index : index + size])
+                samples[mode].append(time.perf_counter() - start)
+                rows_written[mode] = Notification.objects.count() - before
+
+    baseline = min(samples["per-event"])
+    rows = [
+        {
+            "mode": mode,
+            "total_ms": f"{min(samples[mode]) * 1000:.1f}",
+            "events_per_s": f"{args.events / min(samples[mode]):.0f}",
+            "rows": rows_written[mode],
+            "speedup": f"{baseline / min(samples[mode]):.1f}x",
+        }
+        for mode in sizes
+    ]
+    print_table(rows, ["mode", "total_ms", "events_per_s", "rows", "speedup"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,398 @@
+"""Throughput and latency of every route in features/urls.py and user/urls.py.
+
+Seeds a throwaway database with the synthetic graph of ``seed_synthetic``
+and requests each route through the test client as its most active user::
+
+    python -m benchmarks.bench_routes --users 5000 --posts 100000 \\
+        --output results.json
+    python -m benchmarks.bench_routes --users 5000 --posts 100000 \\
+        --baseline results.json
+
+``--existing`` skips seeding and uses the configured database, e.g. one
+filled with ``manage.py seed_synthetic --posts 10000000``. Every route runs
+in a transaction that is rolled back, so write routes leave no trace and
+``on_commit`` work (cache invalidation, timeline fan-out) is not measured.
+Response caching and throttling are disabled. With ``--baseline`` the
+exit status is 1 when a route's p95 regressed by more than ``--threshold``
+percent.
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime, timezone
+
+from benchmarks.common import print_table, setup_django, summarize, test_database
+
+NAMESPACES = ("features", "user")
+
+# Routes whose handlers hash a password are repeated fewer times
+AUTH_ROUTES = {"user:create", "user:login"}
+
+
+class Rollback(Exception):
+    pass
+
+
+def scenarios(ctx):
+    """``{(method, route name): spec(i) -> (path, data)}`` for every route"""
+    from django.urls import reverse
+
+    def url(name, *args):
+        return reverse(name, args=args)
+
+    def nth(ids, i):
+        return ids[i % len(ids)]
+
+    return {
+        ("POST", "user:create"): lambda i: (
+            url("user:create"),
+            {"username": f"bench{i}", "password": "benchpass123"},
+        ),
+        ("POST", "user:login"): lambda i: (
+            url("user:login"),
+            {"username": ctx["username"], "password": ctx["password"]},
+        ),
+        ("POST", "user:token_refresh"): lambda i: (
+            url("user:token_refresh"),
+            {"refresh": ctx["refresh"]},
+        ),
+        ("POST", "user:logout"): lambda i: (
+            url("user:logout"),
+            {"refresh_token": str(ctx["new_refresh"]())},
+        ),
+        ("GET", "user:profile"): lambda i: (url("user:profile"), None),
+        ("PATCH", "user:profile"): lambda i: (url("user:profile"), {"bio": f"Bio {i}"}),
+        ("GET", "features:api-root"): lambda i: (url("features:api-root"), None),
+        ("GET", "features:export"): lambda i: (url("features:export"), None),
+        ("GET", "features:post-list"): lambda i: (url("features:post-list"), None),
+        ("POST", "features:post-list"): lambda i: (
+            url("features:post-list"),
+            {"content": f"Benchmark post {i}"},
+        ),
+        ("POST", "features:post-bulk"): lambda i: (
+            url("features:post-bulk"),
+            [{"content": f"Benchmark post {i}.{j}"} for j in range(10)],
+        ),
+        ("GET", "features:post-detail"): lambda i: (
+            url("features:post-detail", nth(ctx["posts"], i)),
+            None,
+        ),
+        ("PUT", "features:post-like"): lambda i: (
+            url("features:post-like", nth(ctx["posts"], i)),
+            None,
+        ),
+        ("DELETE", "features:post-like"): lambda i: (
+            url("features:post-like", nth(ctx["liked"], i)),
+            None,
+        ),
+        ("GET", "features:comment-list"): lambda i: (
+            url("features:comment-list"),
+            {"post": nth(ctx["posts"], i)},
+        ),
+        ("POST", "features:comment-list"): lambda i: (
+            url("features:comment-list"),
+            {"post": nth(ctx["posts"], i), "content": f"Benchmark comment {i}"},
+        ),
+        ("POST", "features:comment-bulk"): lambda i: (
+            url("features:comment-bulk"),
+            [
+                {"post": nth(ctx["posts"], i), "content": f"Comment {i}.{j}"}
+                for j in range(10)
+            ],
+        ),
+        ("GET", "features:comment-detail"): lambda i: (
+            url("features:comment-detail", nth(ctx["comments"], i)),
+            None,
+        ),
+        ("GET", "features:like-list"): lambda i: (
+            url("features:like-list"),
+            {"user": ctx["user_id"]},
+        ),
+        ("POST", "features:like-list"): lambda i: (
+            url("features:like-list"),
+            {"post": nth(ctx["unliked"], i)},
+        ),
+        ("POST", "features:like-bulk"): lambda i: (
+            url("features:like-bulk"),
+            [{"post": nth(ctx["unliked"], i * 10 + j)} for j in range(10)],
+        ),
+        ("GET", "features:follow-list"): lambda i: (
+            url("features:follow-list"),
+            {"follower": ctx["user_id"]},
+        ),
+        ("POST", "features:follow-list"): lambda i: (
+            url("features:follow-list"),
+            {"follower": nth(ctx["unfollowed"], i)},
+        ),
+        ("POST", "features:follow-bulk"): lambda i: (
+            url("features:follow-bulk"),
+            {"users": [nth(ctx["unfollowed"], i * 10 + j) for j in range(10)]},
+        ),
+        ("POST", "features:follow-bulk-unfollow"): lambda i: (
+            url("features:follow-bulk-unfollow"),
+            {"users": [nth(ctx["followed"], i)]},
+        ),
+        ("GET", "features:follow-is-following"): lambda i: (
+            url("features:follow-is-following"),
+            {"user": nth(ctx["followed"], i)},
+        ),
+        ("GET", "features:follow-are-following"): lambda i: (
+            url("features:follow-are-following"),
+            {"ids": ",".join(map(str, ctx["followed"][:100]))},
+        ),
+        ("GET", "features:follow-mutuals"): lambda i: (
+            url("features:follow-mutuals"),
+            None,
+        ),
+        ("GET", "features:follow-suggestions"): lambda i: (
+            url("features:follow-suggestions"),
+            None,
+        ),
+        ("GET", "features:follow-detail"): lambda i: (
+            url("features:follow-detail", nth(ctx["follows"], i)),
+            None,
+        ),
+        ("DELETE", "features:follow-detail"): lambda i: (
+            url("features:follow-detail", nth(ctx["follows"], i)),
+            None,
+        ),
+        ("GET", "features:feed-list"): lambda i: (url("features:feed-list"), None),
+        ("GET", "features:trending-list"): lambda i: (
+            url("features:trending-list"),
+            {"limit": 20},
+        ),
+        ("GET", "features:search-list"): lambda i: (
+            url("features:search-list"),
+            {"q": nth(ctx["terms"], i)},
+        ),
+    }
+
+
+def route_names(patterns=None, namespace=None):
+    """Names of the routes in the ``features`` and ``user`` namespaces"""
+    from django.urls import URLResolver, get_resolver
+
+    names = set()
+    for pattern in get_resolver().url_patterns if patterns is None else patterns:
+        if isinstance(pattern, URLResolver):
+            names |= route_names(pattern.url_patterns, pattern.namespace or namespace)
+        elif pattern.name and namespace in NAMESPACES:
+            names.add(f"{namespace}:{pattern.name}")
+    return names
+
+
+def context(username=None):
+    from django.contrib.auth import get_user_model
+
+    from features.models import Post, Comment, Like, Follow
+    from features.synthetic import PASSWORD
+    from user.serializers import LoginSerializer
+
+    users = get_user_model().objects.select_related("userprofile")
+    if username:
+        user = users.get(username=username)
+    else:
+        user = users.order_by("-userprofile__following_count").first()
+    followed = list(
+        Follow.objects.filter(follower=user).values_list("followed_id", flat=True)
+    )
+    liked = set(Like.objects.filter(user=user).values_list("post_id", flat=True))
+    posts = list(Post.objects.order_by("-id").values_list("id", flat=True)[:1000])
+    words = [
+        word
+        for content in Post.objects.values_list("content", flat=True)[:50]
+        for word in content.split()[:2]
+    ]
+    return {
+        "user_id": user.id,
+        "username": user.username,
+        "password": PASSWORD,
+        "token": str(LoginSerializer.get_token(user).access_token),
+        "refresh": str(LoginSerializer.get_token(user)),
+        "new_refresh": lambda: LoginSerializer.get_token(user),
+        "posts": posts,
+        "liked": list(liked) or posts,
+        "unliked": [post_id for post_id in posts if post_id not in liked] or posts,
+        "comments": list(
+            Comment.objects.order_by("-id").values_list("id", flat=True)[:1000]
+        ),
+        "followed": followed or [user.id],
+        "unfollowed": list(
+            users.exclude(id__in=[user.id, *followed]).values_list("id", flat=True)[
+                :5000
+            ]
+        ),
+        "follows": list(
+            Follow.objects.filter(follower=user).values_list("id", flat=True)
+        )
+        or [0],
+        "terms": words or ["post"],
+    }
+
+
+def measure(ctx, method, spec, repeat):
+    from django.db import transaction
+    from rest_framework.test import APIClient
+
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {ctx['token']}")
+    call = getattr(client, method.lower())
+    requests = [spec(i) for i in range(repeat + 1)]
+    durations = []
+    errors = 0
+    try:
+        with transaction.atomic():
+            started = None
+            for index, (path, data) in enumerate(requests):
+                start = time.perf_counter()
+                if method == "GET":
+                    response = call(path, data)
+                else:
+                    response = call(path, data, format="json")
+                if response.streaming:
+                    b"".join(response.streaming_content)
+                end = time.perf_counter()
+                if index == 0:
+                    # Warm-up request
+                    started = end
+                    continue
+                durations.append(end - start)
+                errors += response.status_code >= 400
+            elapsed = time.perf_counter() - started
+            raise Rollback
+    except Rollback:
+        pass
+    return {**summarize(durations, elapsed), "errors": errors}
+
+
+def compare(results, baseline, threshold):
+    rows = []
+    regressed = False
+    for route, summary in results.items():
+        before = baseline.get(route)
+        if before is None:
+            continue
+        change = (summary["p95_ms"] / before["p95_ms"] - 1) * 100
+        regression = change > threshold
+        regressed |= regression
+        rows.append(
+            {
+                "route": route,
+                "base_p95_ms": f"{before['p95_ms']:.2f}",
+                "p95_ms": f"{summary['p95_ms']:.2f}",
+                "change": f"{change:+.1f}%",
+                "status": "REGRESSION" if regression else "ok",
+            }
+        )
+    print_table(rows, ["route", "base_p95_ms", "p95_ms", "change", "status"])
+    return regressed
+
+
+def run(args):
+    from django.core.management import call_command
+    from django.db import connection
+    from django.test.utils import override_settings
+
+    if not args.existing:
+        call_command(
+            "seed_synthetic",
+            users=args.users,
+            posts=args.posts,
+            comments=args.posts * 2,
+            likes=args.posts * 5,
+            follows=args.follows,
+            seed=args.seed,
+        )
+
+    from features import trending
+
+    trending.rebuild()
+    ctx = context(args.username)
+    specs = scenarios(ctx)
+    missing = route_names() - {name for _, name in specs}
+    if missing:
+        print(f"Routes without a scenario: {', '.join(sorted(missing))}")
+
+    results = {}
+    with override_settings(RESPONSE_CACHE_TTL=0, THROTTLE_RATES={}):
+        for (method, name), spec in specs.items():
+            if args.route and not any(part in name for part in args.route):
+                continue
+            repeat = args.auth_repeat if name in AUTH_ROUTES else args.repeat
+            results[f"{method} {name}"] = measure(ctx, method, spec, repeat)
+
+    print_table(
+        [
+            {
+                "route": route,
+                "rps": f"{summary['rps']:.0f}",
+                "p50_ms": f"{summary['p50_ms']:.2f}",
+                "p95_ms": f"{summary['p95_ms']:.2f}",
+                "p99_ms": f"{summary['p99_ms']:.2f}",
+                "errors": summary["errors"],
+            }
+            for route, summary in results.items()
+        ],
+        ["route", "rps", "p50_ms", "p95_ms", "p99_ms", "errors"],
+    )
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(
+                {
+                    "meta": {
+                        "date": datetime.now(timezone.utc).isoformat(),
+                        "vendor": connection.vendor,
+                        "users": args.users,
+                        "posts": args.posts,
+                        "existing": args.existing,
+                        "repeat": args.repeat,
+                    },
+                    "routes": results,
+                },
+                output,
+                indent=2,
+            )
+
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            return compare(results, json.load(baseline)["routes"], args.threshold)
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--posts", type=int, default=20_000)
+    parser.add_argument("--follows", type=float, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=100)
+    parser.add_argument("--auth-repeat", type=int, default=10)
+    parser.add_argument(
+        "--route", action="append", help="Only routes containing this text"
+    )
+    parser.add_argument("--username", help="User the requests are made as")
+    parser.add_argument("--existing", action="store_true")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=20,
+        help="p95 increase in percent reported as a regression",
+    )
+    args = parser.parse_args()
+
+    setup_django()
+    if args.existing:
+        regressed = run(args)
+    else:
+        with test_database():
+            regressed = run(args)
+    sys.exit(1 if regressed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Latency of full-text search over synthetic posts.
+
+Fills a throwaway database with ``--posts`` posts whose words follow a
+Zipf-like distribution, then times the first page and a later page of
+searches for rare, medium and common terms::
+
+    python -m benchmarks.bench_search --posts 1000000
+
+Uses the database configured in settings (a ``test_`` copy of it).
+"""
+
+import argparse
+import itertools
+import random
+import time
+
+from benchmarks.common import print_table, setup_django, summarize, test_database, timed
+
+PAGE_SIZE = 20
+
+
+def populate(posts, batch_size, words, rng):
+    from django.contrib.auth import get_user_model
+
+    from features.models import Post
+
+    author = get_user_model().objects.create_user("bench", "benchpass")
+    cum_weights = list(
+        itertools.accumulate(1 / rank for rank in range(1, len(words) + 1))
+    )
+    start = time.perf_counter()
+    for offset in range(0, posts, batch_size):
+        Post.objects.bulk_create(
+            [
+                Post(
+                    author=author,
+                    content=" ".join(
+                        rng.choices(
+                            words, cum_weights=cum_weights, k=rng.randint(8, 40)
+                        )
+                    ),
+                )
+                for _ in range(min(batch_size, posts - offset))
+            ]
+        )
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--posts", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--vocabulary", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    setup_django()
+    from features.models import Post
+    from features.search import SearchResults
+    from features.synthetic import vocabulary
+
+    rng = random.Random(args.seed)
+    words = vocabulary(args.vocabulary, rng)
+    with test_database():
+        elapsed = populate(args.posts, args.batch_size, words, rng)
+        print(f"Inserted {args.posts} posts in {elapsed:.1f}s")
+
+        queries = {
+            "rare": words[-1],
+            "medium": words[len(words) // 100],
+            "common": words[0],
+            "two terms": f"{words[10]} {words[200]}",
+        }
+        rows = []
+        for name, query in queries.items():
+            results = SearchResults(Post.objects.all(), query)
+            first = results.page(None, PAGE_SIZE + 1)
+            position = (
+                (first[PAGE_SIZE - 1].score, first[PAGE_SIZE - 1].id)
+                if len(first) > PAGE_SIZE
+                else None
+            )
+            for page, cursor in (("first", None), ("second", position)):
+                if page == "second" and cursor is None:
+                    continue
+                summary = summarize(
+                    timed(lambda: results.page(cursor, PAGE_SIZE + 1), args.repeat)
+                )
+                rows.append(
+                    {
+                        "query": name,
+                        "page": page,
+                        "p50_ms": f"{summary['p50_ms']:.1f}",
+                        "p99_ms": f"{summary['p99_ms']:.1f}",
+                    }
+                )
+        print_table(rows, ["query", "page", "p50_ms", "p99_ms"])
+
+
+if __name__ == "__main__":
+    main()
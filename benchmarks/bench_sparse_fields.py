@@ -0,0 +1,105 @@
+"""CPU time and payload size of a post page per response encoding.
+
+Pages of ``--page-size`` posts with long ``content`` are fetched through
+the test client with the response cache disabled, with every field or
+only ``?fields=id,created_at``, rendered by DRF's ``JSONRenderer`` or
+``ORJSONRenderer``, and with or without ``Accept-Encoding: gzip``::
+
+    python -m benchmarks.bench_sparse_fields --rounds 5 --repeat 100
+"""
+
+import argparse
+import itertools
+import random
+import time
+from unittest import mock
+
+from benchmarks.common import print_table, setup_django, test_database
+
+RENDERERS = ("json", "orjson")
+FIELDS = {"all": None, "sparse": "id,created_at"}
+ENCODINGS = {"identity": {}, "gzip": {"HTTP_ACCEPT_ENCODING": "gzip"}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--posts", type=int, default=200)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--content-length", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth import get_user_model
+    from django.test.utils import override_settings
+    from rest_framework.renderers import JSONRenderer
+    from rest_framework.test import APIClient
+
+    from features.models import Post
+    from features.synthetic import vocabulary
+    from features.views import PostViewSet
+    from social_media_api.renderers import ORJSONRenderer
+
+    renderer_classes = {"json": JSONRenderer, "orjson": ORJSONRenderer}
+    rng = random.Random(0)
+    words = vocabulary(2000, rng)
+
+    with test_database():
+        user = get_user_model().objects.create_user("bench", "benchpass")
+        Post.objects.bulk_create(
+            Post(
+                author=user,
+                content=" ".join(rng.choice(words) for _ in range(400))[
+                    : args.content_length
+                ],
+            )
+            for _ in range(args.posts)
+        )
+        client = APIClient()
+        client.force_authenticate(user)
+
+        modes = list(itertools.product(FIELDS, RENDERERS, ENCODINGS))
+        samples = {mode: [] for mode in modes}
+        sizes = {}
+        with override_settings(RESPONSE_CACHE_TTL=0):
+            for _ in range(args.rounds):
+                # Alternate the order so no mode always runs warm
+                modes.reverse()
+                for mode in modes:
+                    fields, renderer, encoding = mode
+                    params = {"page_size": args.page_size}
+                    if FIELDS[fields]:
+                        params["fields"] = FIELDS[fields]
+                    with mock.patch.object(
+                        PostViewSet, "renderer_classes", [renderer_classes[renderer]]
+                    ):
+                        start = time.process_time()
+                        for _ in range(args.repeat):
+                            response = client.get(
+                                "/api/features/post/", params, **ENCODINGS[encoding]
+                            )
+                        elapsed = time.process_time() - start
+                    samples[mode].append(elapsed / args.repeat * 1000)
+                    sizes[mode] = len(response.content)
+
+    baseline = min(samples[("all", "json", "identity")])
+    rows = [
+        {
+            "fields": fields,
+            "renderer": renderer,
+            "encoding": encoding,
+            "cpu_ms": f"{min(samples[mode]):.2f}",
+            "vs_baseline": f"{(min(samples[mode]) / baseline - 1) * 100:+.0f}%",
+            "bytes": sizes[mode],
+        }
+        for mode in sorted(samples)
+        for fields, renderer, encoding in [mode]
+    ]
+    print_table(
+        rows, ["fields", "renderer", "encoding", "cpu_ms", "vs_baseline", "bytes"]
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Concurrent writers on SQLite with default and tuned connection settings.
+
+For each mode a fresh database file is migrated, then ``--writers``
+processes commit transactions that create a post and a comment while
+``--readers`` processes keep reading the latest posts::
+
+    python -m benchmarks.bench_sqlite_writers --writers 8 --readers 4 --seconds 10
+
+``default`` is Django's stock SQLite connection (rollback journal,
+``synchronous=FULL``); ``tuned`` applies the ``SQLITE_TUNED`` pragmas of
+``social_media_api.db``.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.common import print_table, setup_django, summarize
+
+MODES = {"default": "False", "tuned": "True"}
+
+
+def work(role, seconds, start_at):
+    setup_django()
+    from django.contrib.auth import get_user_model
+    from django.db import OperationalError, transaction
+
+    from features.models import Post, Comment
+
+    author = get_user_model().objects.get(username="bench")
+    time.sleep(max(0.0, start_at - time.time()))
+    durations = []
+    errors = 0
+    deadline = start_at + seconds
+    while time.time() < deadline:
+        start = time.perf_counter()
+        try:
+            if role == "write":
+                with transaction.atomic():
+                    post = Post.objects.create(author=author, content="Benchmark")
+                    Comment.objects.create(author=author, post=post, content="Reply")
+            else:
+                list(Post.objects.order_by("-created_at", "-id")[:20])
+        except OperationalError:
+            # "database is locked"
+            errors += 1
+            continue
+        durations.append(time.perf_counter() - start)
+    print(json.dumps({"durations": durations, "errors": errors}))
+
+
+def spawn(args, env):
+    return subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.bench_sqlite_writers", *args],
+        env=env,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+
+
+def run_mode(mode, args, directory):
+    env = {
+        **os.environ,
+        "SQLITE_PATH": str(Path(directory) / f"{mode}.sqlite3"),
+        "SQLITE_TUNED": MODES[mode],
+    }
+    manage = [sys.executable, "manage.py"]
+    subprocess.run([*manage, "migrate", "-v", "0"], env=env, check=True)
+    subprocess.run(
+        [
+            *manage,
+            "shell",
+            "-c",
+            "from django.contrib.auth import get_user_model; "
+            "get_user_model().objects.create_user('bench', 'benchpass')",
+        ],
+        env=env,
+        check=True,
+    )
+
+    start_at = time.time() + 3
+    worker = ["--seconds", str(args.seconds), "--start-at", str(start_at)]
+    processes = [
+        ("write", spawn(["--worker", "write", *worker], env))
+        for _ in range(args.writers)
+    ] + [
+        ("read", spawn(["--worker", "read", *worker], env)) for _ in range(args.readers)
+    ]
+
+    results = {
+        "write": {"durations": [], "errors": 0},
+        "read": {"durations": [], "errors": 0},
+    }
+    for role, process in processes:
+        output, _ = process.communicate()
+        result = json.loads(output.strip().splitlines()[-1])
+        results[role]["durations"] += result["durations"]
+        results[role]["errors"] += result["errors"]
+
+    rows = []
+    for role, result in results.items():
+        summary = summarize(result["durations"], args.seconds)
+        rows.append(
+            {
+                "mode": mode,
+                "role": role,
+                "ops": summary["count"],
+                "ops_per_s": f"{summary.get('rps', 0):.0f}",
+                "p50_ms": f"{summary['p50_ms']:.2f}",
+                "p99_ms": f"{summary['p99_ms']:.2f}",
+                "locked": result["errors"],
+            }
+        )
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--worker", choices=["write", "read"], help=argparse.SUPPRESS)
+    parser.add_argument("--start-at", type=float, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        work(args.worker, args.seconds, args.start_at)
+        return
+
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        for mode in MODES:
+            rows += run_mode(mode, args, directory)
+    print_table(
+        rows, ["mode", "role", "ops", "ops_per_s", "p50_ms", "p99_ms", "locked"]
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Serializing 1,000 rows with the model and the ``.values()`` serializers.
+
+For posts, comments, likes and follows, ``--rows`` rows are rendered by the
+DRF serializer from model instances and by the ``features.values``
+serializer from ``.values()`` rows, checking that both give the same
+output. ``serialize`` times the rendering alone, with the rows already
+fetched; ``query+serialize`` includes the query::
+
+    python -m benchmarks.bench_values_serializers --rows 1000 --repeat 50
+"""
+
+import argparse
+
+from benchmarks.common import print_table, setup_django, summarize, test_database, timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth import get_user_model
+
+    from features.models import Post, Comment, Like, Follow
+    from features.values import (
+        PostValuesSerializer,
+        CommentValuesSerializer,
+        LikeValuesSerializer,
+        FollowValuesSerializer,
+    )
+
+    with test_database():
+        users = get_user_model().objects.bulk_create(
+            get_user_model()(username=f"bench{i}", password="x")
+            for i in range(args.rows + 1)
+        )
+        posts = Post.objects.bulk_create(
+            Post(author=users[i % 10], content=f"Benchmark post {i} " * 10)
+            for i in range(args.rows)
+        )
+        Comment.objects.bulk_create(
+            Comment(author=users[i % 10], post=post, content=f"Comment {i}")
+            for i, post in enumerate(posts)
+        )
+        Like.objects.bulk_create(
+            Like(user=users[i], post=posts[0]) for i in range(args.rows)
+        )
+        Follow.objects.bulk_create(
+            Follow(follower=users[-1], followed=users[i]) for i in range(args.rows)
+        )
+
+        cases = (
+            ("post", Post, PostValuesSerializer),
+            ("comment", Comment, CommentValuesSerializer),
+            ("like", Like, LikeValuesSerializer),
+            ("follow", Follow, FollowValuesSerializer),
+        )
+        rows = []
+        for name, model, values_serializer_class in cases:
+            queryset = model.objects.order_by("-id")[: args.rows]
+            values_serializer = values_serializer_class()
+            model_serializer_class = values_serializer.serializer_class
+
+            instances = list(queryset)
+            values = list(values_serializer.values(queryset))
+            assert model_serializer_class(
+                instances, many=True
+            ).data == values_serializer.to_representation(values)
+
+            runs = {
+                "serialize": (
+                    lambda: model_serializer_class(instances, many=True).data,
+                    lambda: values_serializer.to_representation(values),
+                ),
+                "query+serialize": (
+                    lambda: model_serializer_class(queryset.all(), many=True).data,
+                    lambda: values_serializer.to_representation(
+                        values_serializer.values(queryset.all())
+                    ),
+                ),
+            }
+            for run, (model_path, values_path) in runs.items():
+                model_ms = summarize(timed(model_path, args.repeat))["p50_ms"]
+                values_ms = summarize(timed(values_path, args.repeat))["p50_ms"]
+                rows.append(
+                    {
+                        "model": name,
+                        "run": run,
+                        "drf_ms": f"{model_ms:.2f}",
+                        "values_ms": f"{values_ms:.2f}",
+                        "speedup": f"{model_ms / values_ms:.1f}x",
+                    }
+                )
+        print_table(rows, ["model", "run", "drf_ms", "values_ms", "speedup"])
+
+
+if __name__ == "__main__":
+    main()
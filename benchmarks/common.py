@@ -0,0 +1,83 @@
+"""Helpers shared by the benchmark scripts.
+
+Run the scripts from the project root as modules, e.g.
+``python -m benchmarks.bench_asgi --help``.
+"""
+
+import os
+import statistics
+import time
+from contextlib import contextmanager
+
+
+def setup_django():
+    import django
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "social_media_api.settings")
+    django.setup()
+
+
+@contextmanager
+def test_database(verbosity=0):
+    """Create a throwaway database and run with DEBUG off, like the test runner.
+
+    Throttling is disabled so repeated requests measure the views.
+    """
+    from django.db import connection
+    from django.test.utils import (
+        override_settings,
+        setup_test_environment,
+        teardown_test_environment,
+    )
+
+    setup_test_environment(debug=False)
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=verbosity, keepdb=False)
+    try:
+        with override_settings(THROTTLE_RATES={}):
+            yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=verbosity)
+        teardown_test_environment()
+
+
+def percentile(samples, percent):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(samples, elapsed=None):
+    """Latency summary in milliseconds for a list of durations in seconds"""
+    summary = {
+        "count": len(samples),
+        "mean_ms": statistics.fmean(samples) * 1000 if samples else 0.0,
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+    }
+    if elapsed:
+        summary["rps"] = len(samples) / elapsed
+    return summary
+
+
+def timed(func, repeat):
+    """Call ``func`` ``repeat`` times and return the individual durations"""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def print_table(rows, columns):
+    widths = {
+        column: max(len(column), *(len(f"{row[column]}") for row in rows))
+        for column in columns
+    }
+    print("  ".join(column.ljust(widths[column]) for column in columns))
+    for row in rows:
+        print("  ".join(f"{row[column]}".ljust(widths[column]) for column in columns))
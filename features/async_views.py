@@ -0,0 +1,189 @@
+"""Native async read path for the features API.
+
+Under ASGI (``ASYNC_READ_PATH``), GET requests for the post, comment and
+follow list/detail routes are answered by coroutines using Django's async
+ORM, so a request waiting on the database does not hold a worker thread.
+The routes keep the router's urls, names, serializers, pagination, ETags
+and response cache; any other method is handed to the regular DRF viewset.
+"""
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.urls import URLPattern
+from rest_framework import exceptions, status
+from rest_framework.request import Request
+
+from features.cache import CachedListMixin, ConditionalListMixin
+from features.values import ValuesListMixin
+from social_media_api.renderers import ORJSONRenderer
+from user.authentication import StatelessJWTAuthentication
+
+ASYNC_ROUTES = {
+    "post-list",
+    "post-detail",
+    "comment-list",
+    "comment-detail",
+    "follow-list",
+    "follow-detail",
+}
+
+
+def render(data, status_code=status.HTTP_200_OK, headers=None):
+    return HttpResponse(
+        ORJSONRenderer().render(data),
+        status=status_code,
+        content_type="application/json",
+        headers=headers,
+    )
+
+
+async def authenticate(request):
+    authenticator = StatelessJWTAuthentication()
+    header = authenticator.get_header(request)
+    raw_token = authenticator.get_raw_token(header) if header else None
+    if raw_token is None:
+        raise exceptions.NotAuthenticated()
+
+    return await authenticator.aget_user(authenticator.get_validated_token(raw_token))
+
+
+async def filter_queryset(view, queryset):
+    """Async stand-in for ``DjangoFilterBackend`` on foreign key filters"""
+    errors = {}
+    for field in getattr(view, "filterset_fields", []):
+        value = view.request.query_params.get(field)
+        if not value:
+            continue
+        related_model = queryset.model._meta.get_field(field).related_model
+        if not (
+            value.isdigit() and await related_model.objects.filter(pk=value).aexists()
+        ):
+            errors[field] = [
+                "Select a valid choice. "
+                "That choice is not one of the available choices."
+            ]
+            continue
+        queryset = queryset.filter(**{f"{field}_id": value})
+    if errors:
+        raise exceptions.ValidationError(errors)
+    return queryset
+
+
+async def list_page(view):
+    queryset = await filter_queryset(view, view.get_queryset())
+    values_serializer = None
+    if isinstance(view, ValuesListMixin):
+        values_serializer = view.get_values_serializer()
+    if values_serializer is not None:
+        ordering = [field.lstrip("-") for field in view.ordering]
+        queryset = values_serializer.values(queryset, ordering)
+
+    paginator = view.paginator
+    page_queryset = paginator.get_page_queryset(queryset, view.request, view=view)
+    page = paginator.set_page([obj async for obj in page_queryset])
+    if values_serializer is not None:
+        data = values_serializer.to_representation(page)
+    else:
+        data = view.get_serializer(page, many=True).data
+    return paginator.get_paginated_response(data).data
+
+
+async def list_objects(view):
+    """``list`` behind the viewset's conditional GET and response cache mixins"""
+    headers = {}
+    if isinstance(view, ConditionalListMixin):
+        etag, response = await sync_to_async(view.check_list_etag)(view.request)
+        if response is not None:
+            response["ETag"] = etag
+            return response
+        headers["ETag"] = etag
+
+    if not isinstance(view, CachedListMixin):
+        return render(await list_page(view), headers=headers)
+    key, data = await sync_to_async(view.get_cached_list)(view.request)
+    if data is not None:
+        return render(data, headers={**headers, "X-Cache": "HIT"})
+    data = await list_page(view)
+    await cache.aset(key, data, settings.RESPONSE_CACHE_TTL)
+    return render(data, headers={**headers, "X-Cache": "MISS"})
+
+
+async def retrieve_object(view):
+    queryset = view.get_queryset()
+    lookup = view.kwargs[view.lookup_url_kwarg or view.lookup_field]
+    try:
+        instance = await queryset.aget(**{view.lookup_field: lookup})
+    except (queryset.model.DoesNotExist, ValueError):
+        raise exceptions.NotFound(
+            f"No {queryset.model._meta.object_name} matches the given query."
+        )
+    return render(view.get_serializer(instance).data)
+
+
+READ_ACTIONS = {"list": list_objects, "retrieve": retrieve_object}
+
+
+def async_read_view(callback):
+    """Wrap a router view so GET is served natively async"""
+    viewset = callback.cls
+    read_action = callback.actions.get("get")
+    sync_view = sync_to_async(callback)
+
+    async def view(request, *args, **kwargs):
+        if request.method != "GET":
+            return await sync_view(request, *args, **kwargs)
+
+        drf_request = Request(request)
+        instance = viewset(
+            request=drf_request,
+            args=args,
+            kwargs=kwargs,
+            format_kwarg=None,
+            action=read_action,
+            **callback.initkwargs,
+        )
+        try:
+            drf_request.user = await authenticate(request)
+            await sync_to_async(instance.check_throttles)(drf_request)
+            response = await READ_ACTIONS[read_action](instance)
+        except exceptions.APIException as exc:
+            headers = {}
+            if isinstance(
+                exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)
+            ):
+                headers["WWW-Authenticate"] = (
+                    StatelessJWTAuthentication().authenticate_header(request)
+                )
+            if isinstance(exc, exceptions.Throttled) and exc.wait:
+                headers["Retry-After"] = "%d" % exc.wait
+            detail = exc.detail
+            data = detail if isinstance(detail, (list, dict)) else {"detail": detail}
+            return render(data, exc.status_code, headers)
+        return response
+
+    view.csrf_exempt = True
+    # Keep the viewset introspectable for the router and the schema generator
+    view.cls = viewset
+    view.initkwargs = callback.initkwargs
+    view.actions = callback.actions
+    return view
+
+
+def async_read_urls(urls):
+    """Replace the router patterns in ``ASYNC_ROUTES`` with async views"""
+    return [
+        (
+            URLPattern(
+                pattern.pattern,
+                async_read_view(pattern.callback),
+                pattern.default_args,
+                pattern.name,
+            )
+            if pattern.name in ASYNC_ROUTES
+            and "format" not in pattern.pattern.regex.groupindex
+            else pattern
+        )
+        for pattern in urls
+    ]
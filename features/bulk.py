@@ -0,0 +1,103 @@
+"""Batch create endpoints with idempotency keys.
+
+A client may send an ``Idempotency-Key`` header with a batch. The response
+of the first request with that key is stored for ``IDEMPOTENCY_KEY_TTL``
+seconds and replayed for retries, so a retried batch is never created
+twice. Reusing a key with a different payload is rejected.
+"""
+
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+
+def bulk_create_schema(serializer_class):
+    return extend_schema(
+        request=serializer_class(many=True),
+        responses={201: serializer_class(many=True)},
+        parameters=[
+            OpenApiParameter(
+                name=IDEMPOTENCY_HEADER,
+                location=OpenApiParameter.HEADER,
+                description="Replays the stored response for retried batches",
+                required=False,
+                type=str,
+            ),
+        ],
+    )
+
+
+class BulkCreateMixin:
+    def perform_bulk_create(self, serializer):
+        raise NotImplementedError
+
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        """Create a batch of objects in a single request"""
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return self._bulk_create(request)
+
+        cache_key = "idempotency:{}:{}:{}".format(
+            self.basename,
+            request.user.pk,
+            hashlib.sha256(key.encode()).hexdigest(),
+        )
+        fingerprint = hashlib.sha256(
+            json.dumps(request.data, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+        stored = cache.get(cache_key)
+        if stored is None:
+            if not cache.add(f"{cache_key}:lock", 1, timeout=60):
+                return Response(
+                    {"detail": "A request with this idempotency key is in progress."},
+                    status=status.HTTP_409_CONFLICT,
+                )
+            try:
+                response = self._bulk_create(request)
+                stored = {
+                    "fingerprint": fingerprint,
+                    "status": response.status_code,
+                    "data": response.data,
+                }
+                cache.set(cache_key, stored, settings.IDEMPOTENCY_KEY_TTL)
+                return response
+            finally:
+                cache.delete(f"{cache_key}:lock")
+
+        if stored["fingerprint"] != fingerprint:
+            return Response(
+                {"detail": "Idempotency key was already used for another request."},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
+        return Response(
+            stored["data"],
+            status=stored["status"],
+            headers={"Idempotent-Replayed": "true"},
+        )
+
+    def _bulk_create(self, request):
+        serializer = self.get_serializer(
+            data=request.data,
+            many=True,
+            max_length=settings.BULK_CREATE_MAX_BATCH_SIZE,
+            allow_empty=False,
+        )
+        serializer.is_valid(raise_exception=True)
+        try:
+            with transaction.atomic():
+                self.perform_bulk_create(serializer)
+        except IntegrityError:
+            raise ValidationError("The batch conflicts with existing data.")
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
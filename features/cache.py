@@ -0,0 +1,156 @@
+"""Versioned response cache for the post and comment list endpoints.
+
+Every cached list depends on one or more namespaces such as ``posts`` or
+``comments:post:12``. Each namespace has a version number kept in the
+cache, and the versions are part of the response key, so bumping a version
+on write makes every page that depends on it unreachable at once.
+
+The same versions make up the lists' ETags, so a client polling a page
+that has not changed gets a 304 without the page being queried or
+serialized. Pages with ``?expand=author`` embed profile pictures and also
+depend on the ``profiles`` namespace, bumped when a picture changes.
+"""
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils.cache import get_conditional_response, quote_etag
+from rest_framework.response import Response
+
+from features.serializers import get_expanded_fields
+from social_media_api import metrics
+
+
+def _version_key(namespace):
+    return f"responses:version:{namespace}"
+
+
+def _new_version():
+    # Time based so a version evicted from the cache never comes back with
+    # a number that was already used for a cached page.
+    return time.time_ns()
+
+
+def get_versions(namespaces):
+    keys = [_version_key(namespace) for namespace in namespaces]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, _new_version(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def _bump(namespaces):
+    for namespace in namespaces:
+        key = _version_key(namespace)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _new_version(), timeout=None)
+
+
+def invalidate(*namespaces):
+    """Bump namespace versions now and again once the transaction commits.
+
+    The second bump drops pages that a concurrent reader cached from data
+    read before the write was committed.
+    """
+    _bump(namespaces)
+    transaction.on_commit(lambda: _bump(namespaces))
+
+
+def post_namespaces(author_id):
+    return ["posts", f"posts:author:{author_id}"]
+
+
+def comment_namespaces(author_id, post_id):
+    return ["comments", f"comments:author:{author_id}", f"comments:post:{post_id}"]
+
+
+def profile_namespaces():
+    return ["profiles"]
+
+
+# Serves ``list`` from the cache, keyed by url and namespace versions.
+class CachedListMixin:
+    cache_namespace = None
+    cache_filter_fields = ()
+
+    def get_filter_pk(self, field):
+        """The pk ``?<field>=`` filters on, None when it is empty or invalid"""
+        value = self.request.query_params.get(field)
+        if not value:
+            return None
+        related = self.queryset.model._meta.get_field(field).target_field
+        try:
+            return related.to_python(value)
+        except ValidationError:
+            return None
+
+    def get_cache_namespaces(self):
+        # The base namespace is bumped by every write, so pages stay fresh
+        # whatever spelling of a filter value they were requested with.
+        namespaces = [self.cache_namespace]
+        for field in self.cache_filter_fields:
+            pk = self.get_filter_pk(field)
+            if pk is not None:
+                namespaces.append(f"{self.cache_namespace}:{field}:{pk}")
+        if "author" in get_expanded_fields(self.request):
+            namespaces += profile_namespaces()
+        return namespaces
+
+    def get_cache_key(self, request):
+        versions = get_versions(self.get_cache_namespaces())
+        url = hashlib.sha1(request.build_absolute_uri().encode()).hexdigest()
+        return ":".join(["responses", self.cache_namespace, url, *map(str, versions)])
+
+    def get_cached_list(self, request):
+        """The page's cache key and its cached data, None on a miss"""
+        key = self.get_cache_key(request)
+        data = cache.get(key)
+        if data is None:
+            metrics.increment("response_cache_misses", view=self.cache_namespace)
+        else:
+            metrics.increment("response_cache_hits", view=self.cache_namespace)
+        return key, data
+
+    def list(self, request, *args, **kwargs):
+        key, data = self.get_cached_list(request)
+        if data is not None:
+            return Response(data, headers={"X-Cache": "HIT"})
+
+        response = super().list(request, *args, **kwargs)
+        cache.set(key, response.data, settings.RESPONSE_CACHE_TTL)
+        response["X-Cache"] = "MISS"
+        return response
+
+
+# Answers conditional GETs of ``list`` before the page is built. The ETag
+# covers the url, filters included, and the namespace versions, so it
+# changes with every write that could change the page, likes and deletes
+# included, and checking it takes no database query.
+class ConditionalListMixin:
+    def get_list_etag(self, request):
+        versions = get_versions(self.get_cache_namespaces())
+        key = "|".join([request.get_full_path(), *map(str, versions)])
+        return quote_etag(hashlib.sha1(key.encode()).hexdigest())
+
+    def check_list_etag(self, request):
+        """The page's ETag, and the 304 or 412 response it settles if any"""
+        etag = self.get_list_etag(request)
+        response = get_conditional_response(request, etag=etag)
+        if response is not None and response.status_code == 304:
+            metrics.increment("not_modified", view=self.cache_namespace)
+        return etag, response
+
+    def list(self, request, *args, **kwargs):
+        etag, response = self.check_list_etag(request)
+        if response is None:
+            response = super().list(request, *args, **kwargs)
+        response["ETag"] = etag
+        return response
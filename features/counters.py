@@ -0,0 +1,60 @@
+"""Denormalized like/comment/follow counters.
+
+Counters are changed with ``F()`` expressions so concurrent writers never
+overwrite each other; callers run them in the same transaction as the row
+being counted. The ``recompute_*`` helpers rebuild them from the source
+tables with a single UPDATE and are used to repair drift.
+"""
+
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from features.models import Post, Comment, Like, Follow
+from user.models import UserProfile
+
+
+def _count(model, field, outer="pk"):
+    counts = (
+        model.objects.filter(**{field: OuterRef(outer)})
+        .order_by()
+        .values(field)
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    return Coalesce(Subquery(counts), Value(0))
+
+
+def change_post_counter(post_id, field, delta):
+    Post.objects.filter(pk=post_id).update(**{field: F(field) + delta})
+
+
+def change_follow_counters(follower_id, followed_ids, delta):
+    """Count ``follower_id`` (un)following every user in ``followed_ids``"""
+    if not followed_ids:
+        return
+    UserProfile.objects.filter(user_id__in=followed_ids).update(
+        followers_count=F("followers_count") + delta, version=F("version") + 1
+    )
+    UserProfile.objects.filter(user_id=follower_id).update(
+        following_count=F("following_count") + delta * len(followed_ids),
+        version=F("version") + 1,
+    )
+
+
+def recompute_post_counters(queryset=None):
+    if queryset is None:
+        queryset = Post.objects.all()
+    return queryset.update(
+        likes_count=_count(Like, "post"),
+        comments_count=_count(Comment, "post"),
+    )
+
+
+def recompute_profile_counters(queryset=None):
+    if queryset is None:
+        queryset = UserProfile.objects.all()
+    return queryset.update(
+        followers_count=_count(Follow, "followed", outer="user"),
+        following_count=_count(Follow, "follower", outer="user"),
+        version=F("version") + 1,
+    )
@@ -0,0 +1,117 @@
+"""Streaming NDJSON export of a user's posts, comments and likes.
+
+Rows are read with ``.values().iterator()`` so the database driver fetches
+them in chunks of ``EXPORT_CHUNK_SIZE`` and nothing but the current chunk is
+held in memory. Every row becomes one JSON line tagged with its ``type``;
+lines are grouped into chunks of about ``EXPORT_BUFFER_SIZE`` bytes and can
+be compressed on the fly into a gzip stream. Under ASGI the chunks are
+produced one at a time in a worker thread by ``async_chunks``.
+"""
+
+import datetime
+import json
+import zlib
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+from features.models import Post, Comment, Like
+
+EXPORTS = (
+    (
+        "post",
+        Post.objects.order_by("-created_at", "-id"),
+        "author_id",
+        ("id", "content", "created_at", "likes_count", "comments_count"),
+    ),
+    (
+        "comment",
+        Comment.objects.order_by("-created_at", "-id"),
+        "author_id",
+        ("id", "post", "content", "created_at"),
+    ),
+    (
+        "like",
+        Like.objects.order_by("-id"),
+        "user_id",
+        ("id", "post"),
+    ),
+)
+
+
+class ExportEncoder(DjangoJSONEncoder):
+    """Formats datetimes like the API serializers, down to the microsecond"""
+
+    datetime_field = serializers.DateTimeField()
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return self.datetime_field.to_representation(o)
+        return super().default(o)
+
+
+def export_rows(user_id, chunk_size=None):
+    """Yield every exported row of the user as a dict"""
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    for type_, queryset, owner_field, fields in EXPORTS:
+        rows = (
+            queryset.filter(**{owner_field: user_id})
+            .values(*fields)
+            .iterator(chunk_size=chunk_size)
+        )
+        for row in rows:
+            yield {"type": type_, **row}
+
+
+def export_ndjson(user_id, chunk_size=None, buffer_size=None):
+    """Yield the export as NDJSON encoded chunks of bytes"""
+    buffer_size = buffer_size or settings.EXPORT_BUFFER_SIZE
+    encoder = ExportEncoder(ensure_ascii=False, separators=(",", ":"))
+    buffer = []
+    size = 0
+    for row in export_rows(user_id, chunk_size):
+        line = (encoder.encode(row) + "\n").encode()
+        buffer.append(line)
+        size += len(line)
+        if size >= buffer_size:
+            yield b"".join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def gzip_stream(chunks, level=6):
+    """Compress an iterable of bytes into a single gzip stream"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+async def async_chunks(chunks):
+    """Step a sync iterable of chunks in a worker thread, one per await.
+
+    ``StreamingHttpResponse`` would otherwise read a sync iterator to the
+    end before sending the first byte under ASGI.
+    """
+    chunks = iter(chunks)
+    done = object()
+    next_chunk = sync_to_async(next)
+    while (chunk := await next_chunk(chunks, done)) is not done:
+        yield chunk
+
+
+class NDJSONRenderer(JSONRenderer):
+    """Lets clients ask for ``application/x-ndjson``; errors stay one line"""
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return super().render(data, accepted_media_type, renderer_context) + b"\n"
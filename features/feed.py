@@ -0,0 +1,192 @@
+"""Home timeline built with fan-out-on-write.
+
+New posts are pushed into the timeline of every follower of the author.
+Authors with more than ``FEED_FANOUT_THRESHOLD`` followers are skipped on
+write and merged into the timeline on read instead, so a single post from
+a popular author never stalls the request that created it.
+
+A page is cut from a bounded candidate set: the next ``limit`` entries of
+the user's timeline after the cursor, read in index order, and the next
+``limit`` posts of each pulled author. Following pushes the author's
+newest posts into the timeline and unfollowing removes them, and timelines
+are trimmed to their newest ``FEED_MAX_LENGTH`` entries.
+"""
+
+from collections import defaultdict
+from datetime import datetime
+
+from django.conf import settings
+from django.db.models import F, Q, Window
+from django.db.models.functions import RowNumber
+from django.utils.module_loading import import_string
+
+from features.models import Post, Follow, TimelineEntry
+from social_media_api.redis_client import get_redis_client
+
+
+class DatabaseTimelineBackend:
+    """Timelines stored as rows of ``TimelineEntry``"""
+
+    def push(self, posts, follower_ids):
+        TimelineEntry.objects.bulk_create(
+            [
+                TimelineEntry(owner_id=owner_id, post=post, created_at=post.created_at)
+                for post in posts
+                for owner_id in follower_ids
+            ],
+            ignore_conflicts=True,
+        )
+
+    def remove(self, user_id, author_ids):
+        TimelineEntry.objects.filter(
+            owner_id=user_id, post__author_id__in=author_ids
+        ).delete()
+
+    def trim(self):
+        ranked = TimelineEntry.objects.alias(
+            rank=Window(
+                RowNumber(),
+                partition_by="owner_id",
+                order_by=[F("created_at").desc(), F("post_id").desc()],
+            )
+        ).filter(rank__gt=settings.FEED_MAX_LENGTH)
+        return TimelineEntry.objects.filter(id__in=ranked.values("id")).delete()[0]
+
+    def post_ids(self, user_id, position, limit):
+        return (
+            TimelineEntry.objects.filter(after(position, "post_id"), owner_id=user_id)
+            .order_by("-created_at", "-post_id")
+            .values("post_id")[:limit]
+        )
+
+
+class RedisTimelineBackend:
+    """Timelines stored as Redis sorted sets scored by post creation time"""
+
+    def __init__(self):
+        self.client = get_redis_client()
+
+    @staticmethod
+    def key(user_id):
+        return f"timeline:{user_id}"
+
+    def push(self, posts, follower_ids):
+        scores = {post.id: post.created_at.timestamp() for post in posts}
+        with self.client.pipeline(transaction=False) as pipe:
+            for owner_id in follower_ids:
+                key = self.key(owner_id)
+                pipe.zadd(key, scores)
+                pipe.zremrangebyrank(key, 0, -settings.FEED_MAX_LENGTH - 1)
+            pipe.execute()
+
+    def remove(self, user_id, author_ids):
+        key = self.key(user_id)
+        post_ids = Post.objects.filter(
+            id__in=[int(member) for member in self.client.zrange(key, 0, -1)],
+            author_id__in=author_ids,
+        ).values_list("id", flat=True)
+        if post_ids:
+            self.client.zrem(key, *post_ids)
+
+    def trim(self):
+        # Trimmed on every push
+        return 0
+
+    def post_ids(self, user_id, position, limit):
+        key = self.key(user_id)
+        if position is None:
+            members = self.client.zrevrange(key, 0, limit - 1)
+        else:
+            # Posts created at the cursor's time may already have been shown
+            score = datetime.fromisoformat(position[0]).timestamp()
+            members = self.client.zrevrangebyscore(
+                key, score, "-inf", 0, limit + self.client.zcount(key, score, score)
+            )
+        return [int(member) for member in members]
+
+
+def get_timeline_backend():
+    return import_string(settings.FEED_BACKEND)()
+
+
+def after(position, id_field="id"):
+    """Rows after a ``(created_at, post id)`` cursor in newest-first order"""
+    if position is None:
+        return Q()
+    created_at, post_id = position
+    return Q(created_at__lt=created_at) | Q(
+        created_at=created_at, **{f"{id_field}__lt": post_id}
+    )
+
+
+def fan_out_posts(posts):
+    """Push new posts into the timelines of their authors' followers"""
+    by_author = defaultdict(list)
+    for post in posts:
+        by_author[post.author_id].append(post)
+
+    backend = get_timeline_backend()
+    for author_id, author_posts in by_author.items():
+        follower_ids = list(
+            Follow.objects.filter(followed_id=author_id).values_list(
+                "follower_id", flat=True
+            )[: settings.FEED_FANOUT_THRESHOLD + 1]
+        )
+        if len(follower_ids) > settings.FEED_FANOUT_THRESHOLD:
+            continue
+        backend.push(author_posts, follower_ids)
+
+
+def fan_out_post(post):
+    fan_out_posts([post])
+
+
+def add_authors(user_id, author_ids):
+    """Push the newest posts of newly followed authors into the user's timeline"""
+    backend = get_timeline_backend()
+    for author_id in author_ids:
+        # Posts of authors above the threshold are merged on read instead
+        posts = list(
+            Post.objects.filter(
+                author_id=author_id,
+                author__userprofile__followers_count__lte=(
+                    settings.FEED_FANOUT_THRESHOLD
+                ),
+            )
+            .order_by("-created_at", "-id")
+            .only("id", "created_at")[: settings.FEED_MAX_LENGTH]
+        )
+        if posts:
+            backend.push(posts, [user_id])
+
+
+def remove_authors(user_id, author_ids):
+    """Drop the posts of unfollowed authors from the user's timeline"""
+    get_timeline_backend().remove(user_id, author_ids)
+
+
+def trim_timelines():
+    """Drop timeline entries beyond each user's newest ``FEED_MAX_LENGTH``"""
+    return get_timeline_backend().trim()
+
+
+def home_timeline(user, position=None, limit=None):
+    """Posts pushed to the user plus posts of followed high-follower authors.
+
+    Only the ``limit`` newest posts after ``position`` of each source are
+    candidates, so a page is never sorted from a whole timeline.
+    """
+    limit = limit or settings.FEED_MAX_LENGTH
+    pulled_authors = Follow.objects.filter(
+        follower=user,
+        followed__userprofile__followers_count__gt=settings.FEED_FANOUT_THRESHOLD,
+    ).values_list("followed_id", flat=True)
+
+    candidates = Q(id__in=get_timeline_backend().post_ids(user.id, position, limit))
+    for author_id in pulled_authors:
+        candidates |= Q(
+            id__in=Post.objects.filter(after(position), author_id=author_id)
+            .order_by("-created_at", "-id")
+            .values("id")[:limit]
+        )
+    return Post.objects.filter(candidates)
@@ -0,0 +1,106 @@
+"""Single-statement follow and unfollow.
+
+Following is one ``INSERT ... SELECT ... ON CONFLICT DO NOTHING RETURNING``
+over the user table, so unknown users, the follower themselves and
+existing follows are skipped by the database and the ``unique_follow``
+constraint instead of a check-then-insert. Unfollowing is one ``DELETE ... RETURNING`` scoped to
+the follower. Counters, the cached follow graph and the follower's home
+timeline are only touched for the rows the statement actually changed.
+"""
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+
+from features import graph
+from features.counters import change_follow_counters
+from features.feed import add_authors, remove_authors
+from features.models import Follow
+
+
+def _names():
+    quote = connection.ops.quote_name
+    user_model = get_user_model()
+    return {
+        "follow": quote(Follow._meta.db_table),
+        "user": quote(user_model._meta.db_table),
+        "pk": quote(user_model._meta.pk.column),
+        "follower_id": quote(Follow._meta.get_field("follower").column),
+        "followed_id": quote(Follow._meta.get_field("followed").column),
+    }
+
+
+def _execute(sql, params):
+    with connection.cursor() as cursor:
+        cursor.execute(sql.format(**_names()), params)
+        return cursor.fetchall()
+
+
+def _placeholders(values):
+    return ", ".join(["%s"] * len(values))
+
+
+def _changed(follower_id, followed_ids, delta):
+    if followed_ids:
+        change_follow_counters(follower_id, followed_ids, delta)
+        graph.invalidate_follows(
+            [(follower_id, followed_id) for followed_id in followed_ids]
+        )
+
+
+def follow_users(follower_id, user_ids):
+    """Follow every other existing user in ``user_ids``; return the new rows"""
+    user_ids = list(dict.fromkeys(user_ids))
+    if not user_ids:
+        return []
+    with transaction.atomic():
+        rows = _execute(
+            "INSERT INTO {follow} ({follower_id}, {followed_id}) "
+            f"SELECT %s, {{pk}} FROM {{user}} WHERE {{pk}} IN ({_placeholders(user_ids)}) "
+            "AND {pk} <> %s "
+            "ON CONFLICT ({follower_id}, {followed_id}) DO NOTHING "
+            "RETURNING id, {followed_id}",
+            [follower_id, *user_ids, follower_id],
+        )
+        follows = [
+            Follow(id=follow_id, follower_id=follower_id, followed_id=followed_id)
+            for follow_id, followed_id in rows
+        ]
+        followed_ids = [follow.followed_id for follow in follows]
+        _changed(follower_id, followed_ids, 1)
+        if followed_ids:
+            add_authors(follower_id, followed_ids)
+    return follows
+
+
+def unfollow_users(follower_id, user_ids):
+    """Stop following ``user_ids``; return the ids that were followed"""
+    user_ids = list(dict.fromkeys(user_ids))
+    if not user_ids:
+        return []
+    with transaction.atomic():
+        rows = _execute(
+            "DELETE FROM {follow} WHERE {follower_id} = %s "
+            f"AND {{followed_id}} IN ({_placeholders(user_ids)}) "
+            "RETURNING {followed_id}",
+            [follower_id, *user_ids],
+        )
+        unfollowed = [followed_id for (followed_id,) in rows]
+        _changed(follower_id, unfollowed, -1)
+        if unfollowed:
+            remove_authors(follower_id, unfollowed)
+    return unfollowed
+
+
+def delete_follow(follow_id, follower_id):
+    """Delete a follow row owned by ``follower_id``; return whether it existed"""
+    with transaction.atomic():
+        rows = _execute(
+            "DELETE FROM {follow} WHERE id = %s AND {follower_id} = %s "
+            "RETURNING {followed_id}",
+            [follow_id, follower_id],
+        )
+        unfollowed = [followed_id for (followed_id,) in rows]
+        _changed(follower_id, unfollowed, -1)
+        if unfollowed:
+            remove_authors(follower_id, unfollowed)
+    return bool(rows)
@@ -0,0 +1,139 @@
+"""Follow graph queries answered from cached adjacency sets.
+
+For every user the ids they follow and the ids following them are cached
+as sorted arrays of 64-bit integers (8 bytes per id) under
+``graph:following:<id>`` and ``graph:followers:<id>``. The cache is Redis
+when ``REDIS_URL`` is set and local memory otherwise. Writes to ``Follow``
+drop the two affected sets, which are rebuilt from the database on the next
+read.
+
+Membership checks are binary searches on the arrays. Mutuals and
+suggestions are built from set intersections in Python rather than
+self-joins on the follow table.
+"""
+
+import random
+from array import array
+from bisect import bisect_left
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from features.models import Follow
+
+FOLLOWING = "following"
+FOLLOWERS = "followers"
+
+# Column holding the user a set belongs to, and the column with its members
+DIRECTIONS = {
+    FOLLOWING: ("follower_id", "followed_id"),
+    FOLLOWERS: ("followed_id", "follower_id"),
+}
+
+
+def _key(direction, user_id):
+    return f"graph:{direction}:{user_id}"
+
+
+def pack(ids):
+    return array("q", sorted(ids)).tobytes()
+
+
+def unpack(data):
+    ids = array("q")
+    ids.frombytes(data)
+    return ids
+
+
+def get_sets(direction, user_ids):
+    """Map every user id to the sorted array of its adjacent user ids"""
+    user_ids = list(dict.fromkeys(user_ids))
+    keys = {_key(direction, user_id): user_id for user_id in user_ids}
+    cached = cache.get_many(list(keys))
+    sets = {keys[key]: unpack(data) for key, data in cached.items()}
+
+    missing = [user_id for user_id in user_ids if user_id not in sets]
+    if missing:
+        owner, member = DIRECTIONS[direction]
+        loaded = {user_id: [] for user_id in missing}
+        rows = Follow.objects.filter(**{f"{owner}__in": missing}).values_list(
+            owner, member
+        )
+        for owner_id, member_id in rows:
+            loaded[owner_id].append(member_id)
+        packed = {user_id: pack(ids) for user_id, ids in loaded.items()}
+        cache.set_many(
+            {_key(direction, user_id): data for user_id, data in packed.items()},
+            settings.FOLLOW_GRAPH_TTL,
+        )
+        sets.update((user_id, unpack(data)) for user_id, data in packed.items())
+    return sets
+
+
+def following_ids(user_id):
+    return get_sets(FOLLOWING, [user_id])[user_id]
+
+
+def follower_ids(user_id):
+    return get_sets(FOLLOWERS, [user_id])[user_id]
+
+
+def _contains(ids, value):
+    index = bisect_left(ids, value)
+    return index < len(ids) and ids[index] == value
+
+
+def is_following(user_id, other_id):
+    return _contains(following_ids(user_id), other_id)
+
+
+def are_following(user_id, other_ids):
+    following = following_ids(user_id)
+    return {other_id: _contains(following, other_id) for other_id in other_ids}
+
+
+def mutuals(user_id):
+    """Ids of the users that ``user_id`` follows and who follow back"""
+    return sorted(set(following_ids(user_id)) & set(follower_ids(user_id)))
+
+
+def suggestions(user_id, limit):
+    """Friend-of-friend suggestions as ``(user id, mutual count)`` pairs.
+
+    A candidate's mutual count is the size of the intersection between the
+    users ``user_id`` follows and the candidate's followers, i.e. how many of
+    the followed users' following sets contain the candidate. Only the
+    ``FOLLOW_SUGGESTION_SAMPLE`` randomly picked follows are expanded.
+    """
+    following = following_ids(user_id)
+    sample = following
+    if len(following) > settings.FOLLOW_SUGGESTION_SAMPLE:
+        sample = random.sample(following, settings.FOLLOW_SUGGESTION_SAMPLE)
+    excluded = set(following)
+    excluded.add(user_id)
+
+    counts = Counter()
+    for ids in get_sets(FOLLOWING, sample).values():
+        counts.update(set(ids) - excluded)
+    return sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:limit]
+
+
+def invalidate_follows(pairs):
+    """Drop the cached sets touched by ``(follower id, followed id)`` pairs.
+
+    As with the response cache, the sets are dropped again once the
+    transaction commits, in case a reader cached them in the meantime.
+    """
+    keys = set()
+    for follower_id, followed_id in pairs:
+        keys.add(_key(FOLLOWING, follower_id))
+        keys.add(_key(FOLLOWERS, followed_id))
+    keys = list(keys)
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def invalidate_follow(follower_id, followed_id):
+    invalidate_follows([(follower_id, followed_id)])
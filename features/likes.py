@@ -0,0 +1,74 @@
+"""Idempotent like/unlike of a post.
+
+Each toggle is a single ``INSERT ... ON CONFLICT DO NOTHING`` or ``DELETE``
+guarded by the ``unique_like`` constraint, with no read before the write.
+The statement's row count tells whether anything changed, and only then is
+the post's ``likes_count`` adjusted, in the same transaction, so repeated
+or concurrent toggles can neither duplicate a like nor skew the counter.
+"""
+
+from django.db import connection, transaction
+
+from features.cache import invalidate, post_namespaces
+from features import trending
+from features.counters import change_post_counter
+from features.models import Post, Like
+
+
+def _names():
+    quote = connection.ops.quote_name
+    return {
+        "like": quote(Like._meta.db_table),
+        "post": quote(Post._meta.db_table),
+        "user_id": quote(Like._meta.get_field("user").column),
+        "post_id": quote(Like._meta.get_field("post").column),
+        "pk": quote(Post._meta.pk.column),
+    }
+
+
+def _execute(sql, params):
+    with connection.cursor() as cursor:
+        cursor.execute(sql.format(**_names()), params)
+        return cursor.rowcount
+
+
+def _apply(sql, params, post_id, delta):
+    """Run the write and return ``(changed, likes_count)``, or None without post"""
+    with transaction.atomic():
+        changed = _execute(sql, params) == 1
+        if changed:
+            change_post_counter(post_id, "likes_count", delta)
+        post = (
+            Post.objects.filter(pk=post_id)
+            .values("likes_count", "author_id", "created_at")
+            .first()
+        )
+        if changed and post is not None:
+            trending.record_likes(post_id, post["created_at"], delta)
+    if post is None:
+        return None
+    if changed:
+        invalidate(*post_namespaces(post["author_id"]))
+    return changed, post["likes_count"]
+
+
+def like_post(user_id, post_id):
+    # Selecting the post id from the post table inserts nothing for a
+    # missing post instead of failing on the foreign key.
+    return _apply(
+        "INSERT INTO {like} ({user_id}, {post_id}) "
+        "SELECT %s, {pk} FROM {post} WHERE {pk} = %s "
+        "ON CONFLICT ({user_id}, {post_id}) DO NOTHING",
+        [user_id, post_id],
+        post_id,
+        1,
+    )
+
+
+def unlike_post(user_id, post_id):
+    return _apply(
+        "DELETE FROM {like} WHERE {user_id} = %s AND {post_id} = %s",
+        [user_id, post_id],
+        post_id,
+        -1,
+    )
@@ -0,0 +1,50 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from features.export import export_ndjson, gzip_stream
+
+
+class Command(BaseCommand):
+    help = "Stream a user's posts, comments and likes as NDJSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument("username")
+        parser.add_argument(
+            "-o",
+            "--output",
+            help="File to write to, defaults to stdout",
+        )
+        parser.add_argument(
+            "--gzip",
+            action="store_true",
+            help="Compress the output with gzip (requires --output)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=None,
+            help="Number of rows fetched per database round trip",
+        )
+
+    def handle(self, *args, **options):
+        user_model = get_user_model()
+        try:
+            user = user_model.objects.get(
+                **{user_model.USERNAME_FIELD: options["username"]}
+            )
+        except user_model.DoesNotExist:
+            raise CommandError(f"User \"{options['username']}\" does not exist")
+
+        chunks = export_ndjson(user.id, chunk_size=options["chunk_size"])
+        if options["output"] is None:
+            if options["gzip"]:
+                raise CommandError("--gzip requires --output")
+            for chunk in chunks:
+                self.stdout.write(chunk.decode(), ending="")
+            return
+
+        if options["gzip"]:
+            chunks = gzip_stream(chunks)
+        with open(options["output"], "wb") as output:
+            for chunk in chunks:
+                output.write(chunk)
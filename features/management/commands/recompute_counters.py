@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from features.counters import recompute_post_counters, recompute_profile_counters
+from features.models import Post
+from user.models import UserProfile
+
+
+class Command(BaseCommand):
+    help = "Recompute denormalized like, comment and follow counters"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10000,
+            help="Number of rows updated per statement",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        for model, recompute in (
+            (Post, recompute_post_counters),
+            (UserProfile, recompute_profile_counters),
+        ):
+            updated = 0
+            last_id = 0
+            while True:
+                ids = list(
+                    model.objects.filter(id__gt=last_id)
+                    .order_by("id")
+                    .values_list("id", flat=True)[:batch_size]
+                )
+                if not ids:
+                    break
+                with transaction.atomic():
+                    updated += recompute(
+                        model.objects.filter(id__gte=ids[0], id__lte=ids[-1])
+                    )
+                last_id = ids[-1]
+            self.stdout.write(f"{model._meta.verbose_name_plural}: {updated} updated")
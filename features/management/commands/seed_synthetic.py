@@ -0,0 +1,70 @@
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from features.synthetic import PASSWORD, SyntheticGraph
+
+
+class Command(BaseCommand):
+    help = "Fill the database with a synthetic power-law social graph"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10_000)
+        parser.add_argument("--posts", type=int, default=100_000)
+        parser.add_argument("--comments", type=int, default=200_000)
+        parser.add_argument("--likes", type=int, default=500_000)
+        parser.add_argument(
+            "--follows",
+            type=float,
+            default=20,
+            help="Average number of users followed per user",
+        )
+        parser.add_argument(
+            "--alpha",
+            type=float,
+            default=1.0,
+            help="Power-law exponent of user and post popularity",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Number of rows inserted per statement",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--prefix", default="synthetic", help="Username prefix of created users"
+        )
+
+    def handle(self, *args, **options):
+        graph = SyntheticGraph(
+            seed=options["seed"],
+            alpha=options["alpha"],
+            batch_size=options["batch_size"],
+        )
+        started = time.perf_counter()
+
+        def report(label, count):
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f"{label}: {count} created ({elapsed:.1f}s)")
+
+        with transaction.atomic():
+            user_ids = graph.users(options["users"], options["prefix"])
+        report("users", len(user_ids))
+        with transaction.atomic():
+            report("follows", graph.follows(user_ids, options["follows"]))
+        with transaction.atomic():
+            post_ids = graph.posts(user_ids, options["posts"])
+        report("posts", len(post_ids))
+        if post_ids:
+            with transaction.atomic():
+                report(
+                    "comments", graph.comments(user_ids, post_ids, options["comments"])
+                )
+            with transaction.atomic():
+                report("likes", graph.likes(user_ids, post_ids, options["likes"]))
+
+        call_command("recompute_counters", stdout=self.stdout)
+        self.stdout.write(f"Users log in with the password {PASSWORD!r}")
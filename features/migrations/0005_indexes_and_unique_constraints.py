@@ -0,0 +1,73 @@
+# Generated by Django 5.0.6 on 2026-10-18 18:54
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def remove_duplicates(apps, schema_editor):
+    """Keep the oldest row of every duplicated like and follow"""
+    for model_name, fields in (
+        ("Like", ("user", "post")),
+        ("Follow", ("follower", "followed")),
+    ):
+        model = apps.get_model("features", model_name)
+        kept = (
+            model.objects.values(*fields)
+            .annotate(kept_id=Min("id"))
+            .values_list("kept_id", flat=True)
+        )
+        model.objects.exclude(id__in=kept).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("features", "0004_timelineentry"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicates, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="comment_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["author", "-created_at", "-id"],
+                name="comment_author_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["post", "created_at"], name="comment_post_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(fields=["-created_at", "-id"], name="post_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                fields=["author", "-created_at", "-id"], name="post_author_created_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="follow",
+            constraint=models.UniqueConstraint(
+                fields=("follower", "followed"), name="unique_follow"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="like",
+            constraint=models.UniqueConstraint(
+                fields=("user", "post"), name="unique_like"
+            ),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.0.6 on 2026-10-18 18:55
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def populate_counters(apps, schema_editor):
+    Post = apps.get_model("features", "Post")
+    for field, model_name in (("likes_count", "Like"), ("comments_count", "Comment")):
+        model = apps.get_model("features", model_name)
+        counts = (
+            model.objects.filter(post=OuterRef("pk"))
+            .order_by()
+            .values("post")
+            .annotate(total=Count("id"))
+            .values("total")
+        )
+        Post.objects.update(**{field: Coalesce(Subquery(counts), Value(0))})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("features", "0005_indexes_and_unique_constraints"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="comments_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="likes_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
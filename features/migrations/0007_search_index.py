@@ -0,0 +1,78 @@
+# Generated by Django 5.0.6 on 2026-10-18 20:10
+
+from django.db import migrations
+
+TABLES = ("features_post", "features_comment")
+
+SQLITE_CREATE = (
+    """
+    CREATE VIRTUAL TABLE {table}_fts USING fts5(
+        content, content='{table}', content_rowid='id', tokenize='unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER {table}_fts_insert AFTER INSERT ON {table} BEGIN
+        INSERT INTO {table}_fts(rowid, content) VALUES (new.id, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER {table}_fts_delete AFTER DELETE ON {table} BEGIN
+        INSERT INTO {table}_fts({table}_fts, rowid, content)
+        VALUES ('delete', old.id, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER {table}_fts_update AFTER UPDATE OF content ON {table} BEGIN
+        INSERT INTO {table}_fts({table}_fts, rowid, content)
+        VALUES ('delete', old.id, old.content);
+        INSERT INTO {table}_fts(rowid, content) VALUES (new.id, new.content);
+    END
+    """,
+    "INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild')",
+)
+
+SQLITE_DROP = (
+    "DROP TRIGGER IF EXISTS {table}_fts_insert",
+    "DROP TRIGGER IF EXISTS {table}_fts_delete",
+    "DROP TRIGGER IF EXISTS {table}_fts_update",
+    "DROP TABLE IF EXISTS {table}_fts",
+)
+
+# The expression must match the one used by features.search
+POSTGRESQL_CREATE = (
+    """
+    CREATE INDEX IF NOT EXISTS {table}_search_idx ON {table}
+    USING GIN (to_tsvector('english', content))
+    """,
+)
+
+POSTGRESQL_DROP = ("DROP INDEX IF EXISTS {table}_search_idx",)
+
+
+def run_statements(schema_editor, statements):
+    for table in TABLES:
+        for statement in statements.get(schema_editor.connection.vendor, ()):
+            schema_editor.execute(statement.format(table=table))
+
+
+def create_search_index(apps, schema_editor):
+    run_statements(
+        schema_editor, {"sqlite": SQLITE_CREATE, "postgresql": POSTGRESQL_CREATE}
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    run_statements(
+        schema_editor, {"sqlite": SQLITE_DROP, "postgresql": POSTGRESQL_DROP}
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("features", "0006_post_counters"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.0.6 on 2026-10-18 20:17
+
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def populate_created_at(apps, schema_editor):
+    Post = apps.get_model("features", "Post")
+    TimelineEntry = apps.get_model("features", "TimelineEntry")
+    TimelineEntry.objects.update(
+        created_at=Subquery(
+            Post.objects.filter(pk=OuterRef("post_id")).values("created_at")
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("features", "0008_notification"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="timelineentry",
+            name="created_at",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(populate_created_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="timelineentry",
+            index=models.Index(
+                fields=["owner", "-created_at", "-post"],
+                name="timeline_owner_created_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.0.6 on 2026-10-18 20:22
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def record_latest_actors(apps, schema_editor):
+    Notification = apps.get_model("features", "Notification")
+    NotificationActor = apps.get_model("features", "NotificationActor")
+    NotificationActor.objects.bulk_create(
+        NotificationActor(notification_id=notification_id, actor_id=actor_id)
+        for notification_id, actor_id in Notification.objects.filter(
+            read=False
+        ).values_list("id", "actor_id")
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("features", "0009_timelineentry_created_at"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NotificationActor",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "actor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "notification",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="actors",
+                        to="features.notification",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="notificationactor",
+            constraint=models.UniqueConstraint(
+                fields=("notification", "actor"), name="unique_notification_actor"
+            ),
+        ),
+        migrations.RunPython(record_latest_actors, migrations.RunPython.noop),
+    ]
@@ -1,11 +1,22 @@
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.utils import timezone
 
 
 class Post(models.Model):
     author = models.ForeignKey(get_user_model(), on_delete=models.CASCADE)
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
+    likes_count = models.PositiveIntegerField(default=0)
+    comments_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="post_created_idx"),
+            models.Index(
+                fields=["author", "-created_at", "-id"], name="post_author_created_idx"
+            ),
+        ]
 
 
 class Comment(models.Model):
@@ -14,11 +25,28 @@ class Comment(models.Model):
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="comment_created_idx"),
+            models.Index(
+                fields=["author", "-created_at", "-id"],
+                name="comment_author_created_idx",
+            ),
+            models.Index(
+                fields=["post", "created_at"], name="comment_post_created_idx"
+            ),
+        ]
+
 
 class Like(models.Model):
     user = models.ForeignKey(get_user_model(), on_delete=models.CASCADE)
     post = models.ForeignKey(Post, on_delete=models.CASCADE)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "post"], name="unique_like"),
+        ]
+
 
 class Follow(models.Model):
     follower = models.ForeignKey(
@@ -27,3 +55,79 @@ class Follow(models.Model):
     followed = models.ForeignKey(
         get_user_model(), on_delete=models.CASCADE, related_name="followers"
     )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["follower", "followed"], name="unique_follow"
+            ),
+        ]
+
+
+class TimelineEntry(models.Model):
+    owner = models.ForeignKey(
+        get_user_model(), on_delete=models.CASCADE, related_name="timeline"
+    )
+    post = models.ForeignKey(Post, on_delete=models.CASCADE)
+    # Copied from the post so timelines are paged from the index alone
+    created_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["owner", "post"], name="unique_timeline_entry"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["owner", "-created_at", "-post"],
+                name="timeline_owner_created_idx",
+            ),
+        ]
+
+
+class Notification(models.Model):
+    class Verb(models.TextChoices):
+        LIKE = "like"
+        COMMENT = "comment"
+        FOLLOW = "follow"
+
+    recipient = models.ForeignKey(
+        get_user_model(), on_delete=models.CASCADE, related_name="notifications"
+    )
+    verb = models.CharField(max_length=16, choices=Verb.choices)
+    # The latest actor; actor_count includes the others coalesced into the
+    # same unread notification
+    actor = models.ForeignKey(
+        get_user_model(), on_delete=models.CASCADE, related_name="+"
+    )
+    actor_count = models.PositiveIntegerField(default=1)
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, null=True, blank=True)
+    updated_at = models.DateTimeField(default=timezone.now)
+    read = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["recipient", "read", "-updated_at", "-id"],
+                name="notification_unread_idx",
+            ),
+        ]
+
+
+# The distinct actors of an unread notification, so an actor repeating an
+# action (like, unlike, like) is not counted twice. Dropped once it is read.
+class NotificationActor(models.Model):
+    notification = models.ForeignKey(
+        Notification, on_delete=models.CASCADE, related_name="actors"
+    )
+    actor = models.ForeignKey(
+        get_user_model(), on_delete=models.CASCADE, related_name="+"
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["notification", "actor"], name="unique_notification_actor"
+            ),
+        ]
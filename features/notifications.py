@@ -0,0 +1,168 @@
+"""Like, comment and follow notifications, delivered in the background.
+
+Views only record events, ``(verb, actor_id, target_id)`` tuples where the
+target is the post for likes and comments and the followed user for
+follows, and hand them to the ``deliver_notifications`` task once the
+transaction commits. The task coalesces them per recipient, verb and post:
+events for the same key in one batch, and any later ones while the
+recipient has not read the notification yet, become a single row naming
+the latest actor and counting the others ("X and 12 others liked your
+post"). Each unread notification's actors are kept in
+``NotificationActor``, so an actor who repeats an action (like, unlike,
+like again) is only counted once. New rows are written with
+``bulk_create``, their actors with one ``INSERT ... ON CONFLICT DO NOTHING
+RETURNING`` and coalesced rows with ``bulk_update``.
+
+Each user's unread count is kept in the cache, counted from the table on a
+miss, incremented for new notifications and dropped when some are read.
+"""
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from features.models import Post, Notification, NotificationActor
+
+Verb = Notification.Verb
+
+POST_VERBS = (Verb.LIKE, Verb.COMMENT)
+
+
+def _unread_key(user_id):
+    return f"notifications:unread:{user_id}"
+
+
+def unread_count(user_id):
+    count = cache.get(_unread_key(user_id))
+    if count is None:
+        count = Notification.objects.filter(recipient_id=user_id, read=False).count()
+        cache.add(_unread_key(user_id), count, timeout=None)
+    return count
+
+
+def _add_unread(counts):
+    for user_id, delta in counts.items():
+        try:
+            cache.incr(_unread_key(user_id), delta)
+        except ValueError:
+            # Not cached; counted from the table on the next read
+            pass
+
+
+def mark_read(user_id, ids=None):
+    """Mark the user's unread notifications, or those in ``ids``, as read"""
+    notifications = Notification.objects.filter(recipient_id=user_id, read=False)
+    if ids is not None:
+        notifications = notifications.filter(id__in=ids)
+    with transaction.atomic():
+        NotificationActor.objects.filter(notification__in=notifications).delete()
+        updated = notifications.update(read=True)
+    if updated:
+        cache.delete(_unread_key(user_id))
+    return updated
+
+
+def _group(events):
+    """Actor ids in event order per ``(recipient_id, verb, post_id)``"""
+    post_ids = {target for verb, _, target in events if verb in POST_VERBS}
+    authors = dict(Post.objects.filter(id__in=post_ids).values_list("id", "author_id"))
+    groups = {}
+    for verb, actor_id, target_id in events:
+        if verb in POST_VERBS:
+            recipient_id, post_id = authors.get(target_id), target_id
+        else:
+            recipient_id, post_id = target_id, None
+        # Deleted posts, and nobody is told about their own actions
+        if recipient_id is None or recipient_id == actor_id:
+            continue
+        actors = groups.setdefault((recipient_id, verb, post_id), [])
+        if actor_id in actors:
+            actors.remove(actor_id)
+        actors.append(actor_id)
+    return groups
+
+
+def _add_actors(pairs):
+    """Record ``(notification_id, actor_id)`` pairs; return the new ones"""
+    if not pairs:
+        return set()
+    quote = connection.ops.quote_name
+    table = quote(NotificationActor._meta.db_table)
+    notification_id = quote(NotificationActor._meta.get_field("notification").column)
+    actor_id = quote(NotificationActor._meta.get_field("actor").column)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} ({notification_id}, {actor_id}) VALUES "
+            + ", ".join(["(%s, %s)"] * len(pairs))
+            + f" ON CONFLICT ({notification_id}, {actor_id}) DO NOTHING "
+            f"RETURNING {notification_id}, {actor_id}",
+            [value for pair in pairs for value in pair],
+        )
+        return set(cursor.fetchall())
+
+
+def deliver(events):
+    """Coalesce ``events`` into notifications; return the number touched"""
+    groups = _group(events)
+    if not groups:
+        return 0
+
+    now = timezone.now()
+    new_counts = {}
+    with transaction.atomic():
+        keys = Q()
+        for recipient_id, verb, post_id in groups:
+            keys |= Q(recipient_id=recipient_id, verb=verb, post_id=post_id)
+        existing = {
+            (notification.recipient_id, notification.verb, notification.post_id): (
+                notification
+            )
+            for notification in Notification.objects.select_for_update()
+            .filter(keys, read=False)
+            .order_by("updated_at")
+        }
+
+        created = {}
+        for key, actors in groups.items():
+            if key in existing:
+                continue
+            recipient_id, verb, post_id = key
+            created[key] = Notification(
+                recipient_id=recipient_id,
+                verb=verb,
+                post_id=post_id,
+                actor_id=actors[-1],
+                actor_count=len(actors),
+                updated_at=now,
+            )
+            new_counts[recipient_id] = new_counts.get(recipient_id, 0) + 1
+        Notification.objects.bulk_create(created.values())
+
+        notifications = {**existing, **created}
+        new_actors = _add_actors(
+            [
+                (notifications[key].id, actor_id)
+                for key, actors in groups.items()
+                for actor_id in actors
+            ]
+        )
+        updated = []
+        for key, notification in existing.items():
+            actors = [
+                actor_id
+                for actor_id in groups[key]
+                if (notification.id, actor_id) in new_actors
+            ]
+            if not actors:
+                # Only actors already counted, e.g. a like after an unlike
+                continue
+            notification.actor_id = actors[-1]
+            notification.actor_count += len(actors)
+            notification.updated_at = now
+            updated.append(notification)
+        Notification.objects.bulk_update(
+            updated, ["actor", "actor_count", "updated_at"]
+        )
+        transaction.on_commit(lambda: _add_unread(new_counts))
+    return len(created) + len(updated)
@@ -0,0 +1,194 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """Forward-only keyset pagination with opaque cursors.
+
+    Each page is fetched with a ``WHERE (a, b) < (cursor a, cursor b)``
+    style filter over the view's ``ordering`` instead of an OFFSET, so
+    latency does not grow with the depth of the page, and no COUNT query
+    is issued.
+    """
+
+    cursor_query_param = "cursor"
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("-id",)
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.set_page(list(self.get_page_queryset(queryset, request, view)))
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """The unevaluated query for the requested page plus one lookahead row"""
+        self.request = request
+        self.ordering = self.get_ordering(view)
+        self.page_size = self.get_page_size(request)
+
+        queryset = self.filter_queryset(queryset, self.decode_cursor(request))
+        return queryset[: self.page_size + 1]
+
+    def set_page(self, results):
+        self.page = results[: self.page_size]
+        self.has_next = len(results) > self.page_size
+        return self.page
+
+    def filter_queryset(self, queryset, position):
+        """Order the queryset and narrow it to rows after ``position``"""
+        queryset = queryset.order_by(*self.ordering)
+        if position is None:
+            return queryset
+
+        condition = Q()
+        for index, field in reversed(list(enumerate(self.ordering))):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            after = Q(**{f"{name}__{lookup}": position[index]})
+            if condition:
+                after |= Q(**{name: position[index]}) & condition
+            condition = after
+        try:
+            return queryset.filter(condition)
+        except (TypeError, ValueError, ValidationError):
+            # Cursor values the ordering fields cannot take
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_ordering(self, view):
+        return tuple(getattr(view, "ordering", None) or self.ordering)
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            page_size = self.page_size
+        if page_size <= 0:
+            page_size = self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_position(self, instance):
+        position = []
+        for field in self.ordering:
+            name = field.lstrip("-")
+            # Model instances, or rows of ``.values()``
+            value = (
+                instance[name]
+                if isinstance(instance, dict)
+                else getattr(instance, name)
+            )
+            position.append(value.isoformat() if hasattr(value, "isoformat") else value)
+        return position
+
+    def encode_cursor(self, position):
+        encoded = urlsafe_b64encode(json.dumps(position).encode()).decode()
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            position = json.loads(urlsafe_b64decode(encoded.encode()))
+        except (BinasciiError, UnicodeDecodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.get_position(self.page[-1]))
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {
+                    "type": "string",
+                    "nullable": True,
+                    "format": "uri",
+                    "example": f"http://api.example.org/accounts/?{self.cursor_query_param}=WzEyM10=",
+                },
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": f"Number of results to return per page (max {self.max_page_size}).",
+                "schema": {"type": "integer"},
+            },
+        ]
+
+
+class SearchPagination(KeysetPagination):
+    """Keyset pagination over ``(score, id)`` of a ``SearchResults``"""
+
+    ordering = ("score", "id")
+
+    def get_page_queryset(self, results, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        return results.page(self.decode_cursor(request), self.page_size + 1)
+
+    def decode_cursor(self, request):
+        position = super().decode_cursor(request)
+        if position is not None and not (
+            isinstance(position[0], (int, float)) and isinstance(position[1], int)
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+
+class TimelinePagination(KeysetPagination):
+    """Keyset pagination over ``(created_at, id)`` of a home timeline.
+
+    The view bounds the timeline query with ``get_window`` before the page
+    is cut from it.
+    """
+
+    def get_window(self, request, view=None):
+        """The cursor position and the number of rows the page is cut from"""
+        self.ordering = self.get_ordering(view)
+        return self.decode_cursor(request), self.get_page_size(request) + 1
+
+    def decode_cursor(self, request):
+        position = super().decode_cursor(request)
+        if position is None:
+            return None
+        try:
+            valid = isinstance(position[1], int) and bool(parse_datetime(position[0]))
+        except (TypeError, ValueError):
+            valid = False
+        if not valid:
+            raise NotFound(self.invalid_cursor_message)
+        return position
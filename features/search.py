@@ -0,0 +1,158 @@
+"""Ranked full-text search over post and comment content.
+
+SQLite uses the FTS5 external content tables and PostgreSQL the GIN
+``to_tsvector`` expression indexes created by migration 0007; both are kept
+in sync by the database itself, so every write path (including
+``bulk_create`` and cascading deletes) is covered.
+
+Only the ``SEARCH_MAX_CANDIDATES`` most recent matches are ranked: both
+indexes can walk a term's matches newest first and stop there, while
+scoring every match of a common term would take time proportional to its
+document frequency. Terms with fewer matches are ranked over all of them.
+
+Results are ordered by an ascending ``score`` (lower is better) and then
+``id``, so pages can be fetched with a keyset condition on ``(score, id)``.
+Snippets are only computed for the rows of the requested page.
+"""
+
+import html
+
+from django.conf import settings
+from django.db import connection
+
+SNIPPET_START = "\x02"
+SNIPPET_STOP = "\x03"
+SNIPPET_WORDS = 16
+
+# Must match the text search configuration of the indexes in migration 0007
+POSTGRESQL_CONFIG = "english"
+
+
+def keyset_page_sql(inner, position, limit):
+    """Wrap a query yielding ``(id, score)`` rows into a page after ``position``"""
+    params = []
+    sql = f"SELECT id, score FROM ({inner}) AS matches"
+    if position is not None:
+        sql += " WHERE score > %s OR (score = %s AND id > %s)"
+        params = [position[0], position[0], position[1]]
+    return f"{sql} ORDER BY score, id LIMIT %s", params + [limit]
+
+
+class SQLiteSearchBackend:
+    def table(self, model):
+        return connection.ops.quote_name(f"{model._meta.db_table}_fts")
+
+    def match(self, query):
+        # Quote every term so user input is never parsed as FTS5 syntax
+        return " ".join(
+            '"{}"'.format(term.replace('"', '""')) for term in query.split()
+        )
+
+    def page(self, model, query, position, limit):
+        table = self.table(model)
+        inner = (
+            f"SELECT rowid AS id, bm25({table}) AS score "
+            f"FROM {table} WHERE {table} MATCH %s ORDER BY rowid DESC LIMIT %s"
+        )
+        sql, params = keyset_page_sql(inner, position, limit)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                sql, [self.match(query), settings.SEARCH_MAX_CANDIDATES] + params
+            )
+            return cursor.fetchall()
+
+    def snippets(self, model, query, ids):
+        table = self.table(model)
+        placeholders = ", ".join(["%s"] * len(ids))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid, snippet({table}, 0, %s, %s, '…', %s) FROM {table} "
+                f"WHERE {table} MATCH %s AND rowid IN ({placeholders})",
+                [SNIPPET_START, SNIPPET_STOP, SNIPPET_WORDS, self.match(query)]
+                + list(ids),
+            )
+            return dict(cursor.fetchall())
+
+
+class PostgreSQLSearchBackend:
+    def vector(self):
+        return f"to_tsvector('{POSTGRESQL_CONFIG}', content)"
+
+    def page(self, model, query, position, limit):
+        inner = (
+            f"SELECT id, -ts_rank({self.vector()}, query) AS score "
+            f"FROM {connection.ops.quote_name(model._meta.db_table)}, "
+            f"websearch_to_tsquery('{POSTGRESQL_CONFIG}', %s) AS query "
+            f"WHERE {self.vector()} @@ query ORDER BY id DESC LIMIT %s"
+        )
+        sql, params = keyset_page_sql(inner, position, limit)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [query, settings.SEARCH_MAX_CANDIDATES] + params)
+            return cursor.fetchall()
+
+    def snippets(self, model, query, ids):
+        options = (
+            f"StartSel={SNIPPET_START}, StopSel={SNIPPET_STOP}, "
+            f"MaxWords={SNIPPET_WORDS}, MinWords={SNIPPET_WORDS // 2}"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT id, ts_headline('{POSTGRESQL_CONFIG}', content, "
+                f"websearch_to_tsquery('{POSTGRESQL_CONFIG}', %s), %s) "
+                f"FROM {connection.ops.quote_name(model._meta.db_table)} "
+                f"WHERE id = ANY(%s)",
+                [query, options, list(ids)],
+            )
+            return dict(cursor.fetchall())
+
+
+SEARCH_BACKENDS = {
+    "sqlite": SQLiteSearchBackend,
+    "postgresql": PostgreSQLSearchBackend,
+}
+
+
+def get_search_backend():
+    try:
+        return SEARCH_BACKENDS[connection.vendor]()
+    except KeyError:
+        raise NotImplementedError(
+            f"Full-text search is not supported on {connection.vendor}"
+        )
+
+
+def highlight(snippet):
+    """Escape a raw snippet and mark the matched terms with ``<mark>``"""
+    return (
+        html.escape(snippet)
+        .replace(SNIPPET_START, "<mark>")
+        .replace(SNIPPET_STOP, "</mark>")
+    )
+
+
+class SearchResults:
+    """Matches of ``query`` among the rows of ``queryset``, fetched page by page"""
+
+    def __init__(self, queryset, query):
+        self.queryset = queryset
+        self.model = queryset.model
+        self.query = query
+        self.backend = get_search_backend()
+
+    def page(self, position, limit):
+        rows = self.backend.page(self.model, self.query, position, limit)
+        if not rows:
+            return []
+
+        ids = [row_id for row_id, score in rows]
+        objects = self.queryset.in_bulk(ids)
+        snippets = self.backend.snippets(self.model, self.query, ids)
+        results = []
+        for row_id, score in rows:
+            obj = objects.get(row_id)
+            if obj is None:
+                continue
+            obj.score = score
+            obj.snippet = highlight(snippets.get(row_id, ""))
+            results.append(obj)
+        return results
@@ -1,31 +1,230 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
-from features.models import Post, Comment, Like, Follow
+from features.models import Post, Comment, Like, Follow, Notification
 
 
-class PostSerializer(serializers.ModelSerializer):
+def get_expanded_fields(request):
+    """Field names listed in ``?expand=``; only honoured on reads"""
+    if request is None or request.method not in ("GET", "HEAD"):
+        return set()
+    value = request.query_params.get("expand", "")
+    return {name.strip() for name in value.split(",") if name.strip()}
+
+
+def get_requested_fields(request):
+    """Field names listed in ``?fields=``, None for all; only honoured on reads"""
+    if request is None or request.method not in ("GET", "HEAD"):
+        return None
+    value = request.query_params.get("fields", "")
+    return {name.strip() for name in value.split(",") if name.strip()} or None
+
+
+class SparseFieldsMixin:
+    """Render only the fields listed in ``?fields=``; nested objects stay whole"""
+
+    def get_fields(self):
+        fields = super().get_fields()
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        requested = get_requested_fields(self.context.get("request"))
+        if requested is None or parent is not None:
+            return fields
+        return {name: field for name, field in fields.items() if name in requested}
+
+
+class ExpandableFieldsMixin:
+    """Replace foreign key ids with nested objects listed in ``?expand=``"""
+
+    expandable_fields = {}
+
+    def get_fields(self):
+        fields = super().get_fields()
+        expanded = get_expanded_fields(self.context.get("request"))
+        for name, serializer_class in self.expandable_fields.items():
+            if name in expanded:
+                fields[name] = serializer_class(read_only=True)
+        return fields
+
+
+class UserSummarySerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    profile_picture = serializers.ImageField(
+        source="userprofile.profile_picture", read_only=True
+    )
+
+    class Meta:
+        model = get_user_model()
+        fields = ["id", "username", "profile_picture"]
+
+
+class PostSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Post
+        fields = ["id", "author", "created_at"]
+
+
+class BulkCreateListSerializer(serializers.ListSerializer):
+    """Create every item of a batch with a single ``bulk_create``"""
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        return model.objects.bulk_create([model(**attrs) for attrs in validated_data])
+
+
+class BulkLikeListSerializer(BulkCreateListSerializer):
+    def validate(self, attrs):
+        posts = [item["post"] for item in attrs]
+        if len(set(posts)) != len(posts):
+            raise serializers.ValidationError("A post can only be liked once.")
+        return attrs
+
+
+class PostSerializer(
+    SparseFieldsMixin, ExpandableFieldsMixin, serializers.ModelSerializer
+):
+    expandable_fields = {"author": UserSummarySerializer}
+
     class Meta:
         model = Post
-        fields = ["id", "author", "content", "created_at"]
-        read_only_fields = ["id", "author", "created_at"]
+        fields = [
+            "id",
+            "author",
+            "content",
+            "created_at",
+            "likes_count",
+            "comments_count",
+        ]
+        read_only_fields = [
+            "id",
+            "author",
+            "created_at",
+            "likes_count",
+            "comments_count",
+        ]
+        list_serializer_class = BulkCreateListSerializer
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(
+    SparseFieldsMixin, ExpandableFieldsMixin, serializers.ModelSerializer
+):
+    expandable_fields = {
+        "author": UserSummarySerializer,
+        "post": PostSummarySerializer,
+    }
+
     class Meta:
         model = Comment
         fields = ["id", "author", "post", "content", "created_at"]
         read_only_fields = ["id", "author"]
+        list_serializer_class = BulkCreateListSerializer
+
+
+class PostSearchSerializer(PostSerializer):
+    score = serializers.FloatField(read_only=True)
+    snippet = serializers.CharField(read_only=True)
 
+    class Meta(PostSerializer.Meta):
+        fields = PostSerializer.Meta.fields + ["score", "snippet"]
 
-class LikeSerializer(serializers.ModelSerializer):
+
+class TrendingPostSerializer(PostSerializer):
+    trending_score = serializers.FloatField(read_only=True)
+
+    class Meta(PostSerializer.Meta):
+        fields = PostSerializer.Meta.fields + ["trending_score"]
+
+
+class CommentSearchSerializer(CommentSerializer):
+    score = serializers.FloatField(read_only=True)
+    snippet = serializers.CharField(read_only=True)
+
+    class Meta(CommentSerializer.Meta):
+        fields = CommentSerializer.Meta.fields + ["score", "snippet"]
+
+
+class LikeStateSerializer(serializers.Serializer):
+    liked = serializers.BooleanField()
+    likes_count = serializers.IntegerField()
+
+
+class LikeSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Like
         fields = ["id", "user", "post"]
         read_only_fields = ["id", "user"]
+        extra_kwargs = {"user": {"default": serializers.CurrentUserDefault()}}
+        list_serializer_class = BulkLikeListSerializer
 
 
-class FollowSerializer(serializers.ModelSerializer):
+class FollowSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Follow
         fields = ["id", "follower", "followed"]
         read_only_fields = ["id"]
+
+
+class FollowUsersSerializer(serializers.Serializer):
+    users = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False
+    )
+
+    def validate_users(self, value):
+        max_length = settings.BULK_CREATE_MAX_BATCH_SIZE
+        if len(value) > max_length:
+            raise serializers.ValidationError(
+                f"Ensure this field has no more than {max_length} elements."
+            )
+        return value
+
+
+class FollowedUsersSerializer(serializers.Serializer):
+    users = serializers.ListField(
+        child=serializers.IntegerField(),
+        help_text="Ids whose follow state changed",
+    )
+
+
+class FollowStatusSerializer(serializers.Serializer):
+    user = serializers.IntegerField()
+    following = serializers.BooleanField()
+
+
+class FollowSuggestionSerializer(UserSummarySerializer):
+    mutual_count = serializers.IntegerField(read_only=True)
+
+    class Meta(UserSummarySerializer.Meta):
+        fields = UserSummarySerializer.Meta.fields + ["mutual_count"]
+
+
+class NotificationSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    actor = UserSummarySerializer(read_only=True)
+    message = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Notification
+        fields = ["id", "verb", "actor", "actor_count", "post", "message", "updated_at"]
+        read_only_fields = fields
+
+    def get_message(self, obj) -> str:
+        actors = obj.actor.username
+        others = obj.actor_count - 1
+        if others:
+            actors += f" and {others} {'other' if others == 1 else 'others'}"
+        if obj.verb == Notification.Verb.FOLLOW:
+            return f"{actors} followed you"
+        action = "liked" if obj.verb == Notification.Verb.LIKE else "commented on"
+        return f"{actors} {action} your post"
+
+
+class UnreadCountSerializer(serializers.Serializer):
+    unread = serializers.IntegerField()
+
+
+class MarkReadSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        required=False,
+        help_text="Notifications to mark as read; all of them when omitted",
+    )
@@ -0,0 +1,43 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from features import trending
+from features.cache import invalidate, post_namespaces, comment_namespaces
+from features.models import Post, Comment, Like
+
+
+def _post_author_id(instance):
+    """Author of the post a comment or like belongs to, if it still exists"""
+    if type(instance).post.is_cached(instance):
+        return instance.post.author_id
+    return (
+        Post.objects.filter(pk=instance.post_id)
+        .values_list("author_id", flat=True)
+        .first()
+    )
+
+
+@receiver([post_save, post_delete], sender=Post)
+def invalidate_post_lists(sender, instance, **kwargs):
+    invalidate(*post_namespaces(instance.author_id))
+
+
+@receiver(post_delete, sender=Post)
+def discard_trending_post(sender, instance, **kwargs):
+    trending.discard(instance.id)
+
+
+@receiver([post_save, post_delete], sender=Comment)
+def invalidate_comment_lists(sender, instance, **kwargs):
+    namespaces = comment_namespaces(instance.author_id, instance.post_id)
+    post_author_id = _post_author_id(instance)
+    if post_author_id is not None:
+        namespaces += post_namespaces(post_author_id)
+    invalidate(*namespaces)
+
+
+@receiver([post_save, post_delete], sender=Like)
+def invalidate_liked_post_lists(sender, instance, **kwargs):
+    post_author_id = _post_author_id(instance)
+    if post_author_id is not None:
+        invalidate(*post_namespaces(post_author_id))
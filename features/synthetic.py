@@ -0,0 +1,149 @@
+"""Synthetic social graph for load tests and benchmarks.
+
+Popularity follows a power law: a few users gather most followers and a
+few posts most comments and likes, while activity (posts written, users
+followed) is skewed the same way. Ranks are drawn from a continuous power
+law by inverse transform, so sampling needs no per-row weight tables and
+stays O(1) in memory however many rows are generated. Rows are written
+with ``bulk_create`` in batches; denormalized counters are left to
+``recompute_counters``.
+"""
+
+import random
+from array import array
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+
+from features.models import Post, Comment, Like, Follow
+from user.models import UserProfile
+
+PASSWORD = "synthetic"
+
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+
+# Multiplier scattering popular ranks over the id range
+SCATTER = 2654435761
+
+
+def vocabulary(size, rng):
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(LETTERS) for _ in range(rng.randint(4, 9))))
+    return sorted(words)
+
+
+def power_law_rank(rng, n, alpha):
+    """A rank in ``[0, n)`` with probability roughly proportional to rank^-alpha"""
+    u = rng.random()
+    if alpha == 1:
+        x = (n + 1) ** u
+    else:
+        x = (((n + 1) ** (1 - alpha) - 1) * u + 1) ** (1 / (1 - alpha))
+    return min(int(x) - 1, n - 1)
+
+
+class SyntheticGraph:
+    def __init__(self, seed=0, alpha=1.0, batch_size=5000, vocabulary_size=20_000):
+        self.rng = random.Random(seed)
+        self.alpha = alpha
+        self.batch_size = batch_size
+        self.words = vocabulary(vocabulary_size, self.rng)
+
+    def pick(self, ids):
+        """An element of ``ids``, popular ones scattered over the sequence"""
+        rank = power_law_rank(self.rng, len(ids), self.alpha)
+        return ids[rank * SCATTER % len(ids)]
+
+    def text(self, low, high):
+        return " ".join(
+            self.pick(self.words) for _ in range(self.rng.randint(low, high))
+        )
+
+    def batches(self, total):
+        for offset in range(0, total, self.batch_size):
+            yield min(self.batch_size, total - offset)
+
+    def users(self, count, prefix="synthetic"):
+        """Create ``count`` users sharing the password ``PASSWORD``"""
+        password = make_password(PASSWORD)
+        start = get_user_model().objects.count()
+        ids = array("q")
+        for offset, size in enumerate(self.batches(count)):
+            first = start + offset * self.batch_size
+            users = get_user_model().objects.bulk_create(
+                get_user_model()(
+                    username=f"{prefix}{first + i}",
+                    email=f"{prefix}{first + i}@example.com",
+                    password=password,
+                )
+                for i in range(size)
+            )
+            UserProfile.objects.bulk_create(
+                UserProfile(user_id=user.pk) for user in users
+            )
+            ids.extend(user.pk for user in users)
+        return ids
+
+    def follows(self, user_ids, average):
+        """Each user follows a power-law distributed number of popular users"""
+        # The mean of paretovariate(1.5) is 3
+        scale = average / 3
+        limit = len(user_ids) - 1
+        created = 0
+        pending = []
+        for follower_id in user_ids:
+            degree = min(limit, int(scale * self.rng.paretovariate(1.5)))
+            followed = set()
+            # Bounded so degrees near the user count cannot stall the loop
+            for _ in range(degree * 4):
+                if len(followed) == degree:
+                    break
+                followed_id = self.pick(user_ids)
+                if followed_id != follower_id:
+                    followed.add(followed_id)
+            pending.extend(
+                Follow(follower_id=follower_id, followed_id=followed_id)
+                for followed_id in followed
+            )
+            if len(pending) >= self.batch_size:
+                Follow.objects.bulk_create(pending)
+                created += len(pending)
+                pending = []
+        Follow.objects.bulk_create(pending)
+        return created + len(pending)
+
+    def posts(self, user_ids, count):
+        ids = array("q")
+        for size in self.batches(count):
+            posts = Post.objects.bulk_create(
+                Post(author_id=self.pick(user_ids), content=self.text(8, 40))
+                for _ in range(size)
+            )
+            ids.extend(post.pk for post in posts)
+        return ids
+
+    def comments(self, user_ids, post_ids, count):
+        for size in self.batches(count):
+            Comment.objects.bulk_create(
+                Comment(
+                    author_id=self.pick(user_ids),
+                    post_id=self.pick(post_ids),
+                    content=self.text(3, 20),
+                )
+                for _ in range(size)
+            )
+        return count
+
+    def likes(self, user_ids, post_ids, count):
+        """Up to ``count`` likes; repeated user/post pairs are skipped"""
+        before = Like.objects.count()
+        for size in self.batches(count):
+            Like.objects.bulk_create(
+                (
+                    Like(user_id=self.pick(user_ids), post_id=self.pick(post_ids))
+                    for _ in range(size)
+                ),
+                ignore_conflicts=True,
+            )
+        return Like.objects.count() - before
@@ -0,0 +1,29 @@
+from celery import shared_task
+from django.db import transaction
+
+from features import feed, notifications, trending
+
+
+@shared_task
+def rebuild_trending():
+    """Recompute the trending ranking and move its epoch forward"""
+    return trending.rebuild()
+
+
+@shared_task
+def trim_timelines():
+    """Trim every home timeline to its newest ``FEED_MAX_LENGTH`` entries"""
+    return feed.trim_timelines()
+
+
+@shared_task
+def deliver_notifications(events):
+    """Coalesce and store ``(verb, actor_id, target_id)`` events"""
+    return notifications.deliver([tuple(event) for event in events])
+
+
+def notify(events):
+    """Queue notification events once the current transaction commits"""
+    events = [list(event) for event in events]
+    if events:
+        transaction.on_commit(lambda: deliver_notifications.delay(events))
@@ -0,0 +1,160 @@
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import AsyncRequestFactory, TestCase
+from django.urls import resolve, reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from features.async_views import async_read_view
+from features.models import Post, Comment, Follow
+from features.values import PostValuesSerializer
+from user.authentication import revoke_tokens
+from user.serializers import LoginSerializer
+
+POST_URL = reverse("features:post-list")
+COMMENT_URL = reverse("features:comment-list")
+FOLLOW_URL = reverse("features:follow-list")
+
+
+def detail_url(name, pk):
+    return reverse(f"features:{name}-detail", args=[pk])
+
+
+class AsyncReadPathTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = AsyncRequestFactory()
+        self.user = get_user_model().objects.create_user("reader", "testpass")
+        self.other = get_user_model().objects.create_user("other", "testpass")
+        self.token = str(AccessToken.for_user(self.user))
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+
+        self.post = Post.objects.create(author=self.user, content="Post")
+        Post.objects.create(author=self.other, content="Other post")
+        Comment.objects.create(author=self.user, post=self.post, content="Comment")
+        self.follow = Follow.objects.create(follower=self.user, followed=self.other)
+
+    async def async_get(self, url, data=None, authenticated=True):
+        match = resolve(url)
+        headers = {"Authorization": f"Bearer {self.token}"} if authenticated else {}
+        request = self.factory.get(url, data, headers=headers)
+        return await async_read_view(match.func)(request, **match.kwargs)
+
+    async def test_list_matches_sync_response(self):
+        for url, params in (
+            (POST_URL, {}),
+            (POST_URL, {"author": self.user.id, "expand": "author"}),
+            (COMMENT_URL, {"post": self.post.id}),
+            (FOLLOW_URL, {"follower": self.user.id}),
+        ):
+            with self.subTest(url=url, params=params):
+                res = await self.async_get(url, params)
+                expected = await self.sync_get(url, params)
+
+                self.assertEqual(res.status_code, status.HTTP_200_OK)
+                self.assertEqual(res.content, expected.content)
+
+    async def test_retrieve_matches_sync_response(self):
+        for url in (
+            detail_url("post", self.post.id),
+            detail_url("follow", self.follow.id),
+        ):
+            with self.subTest(url=url):
+                res = await self.async_get(url)
+                expected = await self.sync_get(url)
+
+                self.assertEqual(res.status_code, status.HTTP_200_OK)
+                self.assertEqual(res.content, expected.content)
+
+    async def test_list_conditional_get(self):
+        res = await self.async_get(POST_URL)
+        etag = res["ETag"]
+
+        match = resolve(POST_URL)
+        request = self.factory.get(
+            POST_URL,
+            headers={"Authorization": f"Bearer {self.token}", "If-None-Match": etag},
+        )
+        res = await async_read_view(match.func)(request)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res["ETag"], etag)
+
+        await Post.objects.acreate(author=self.user, content="New post")
+        res = await async_read_view(match.func)(request)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res["ETag"], etag)
+
+    async def test_list_uses_response_cache(self):
+        res = await self.async_get(COMMENT_URL, {"post": self.post.id})
+        self.assertEqual(res["X-Cache"], "MISS")
+
+        res = await self.async_get(COMMENT_URL, {"post": self.post.id})
+        self.assertEqual(res["X-Cache"], "HIT")
+        self.assertEqual(
+            res.content,
+            (await self.sync_get(COMMENT_URL, {"post": self.post.id})).content,
+        )
+
+    async def test_list_uses_values_serializer(self):
+        with mock.patch.object(
+            PostValuesSerializer,
+            "to_representation",
+            autospec=True,
+            side_effect=PostValuesSerializer.to_representation,
+        ) as to_representation:
+            res = await self.async_get(POST_URL, {"fields": "id,author"})
+            expected = await self.sync_get(POST_URL, {"fields": "id,author"})
+
+        self.assertEqual(to_representation.call_count, 2)
+        self.assertEqual(res.content, expected.content)
+
+    async def test_retrieve_missing(self):
+        res = await self.async_get(detail_url("post", 0))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_invalid_filter(self):
+        res = await self.async_get(POST_URL, {"author": 0})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    async def test_auth_required(self):
+        res = await self.async_get(POST_URL, authenticated=False)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn("WWW-Authenticate", res)
+
+    async def test_token_with_user_claims(self):
+        token = await sync_to_async(LoginSerializer.get_token)(self.user)
+        self.token = str(token.access_token)
+
+        res = await self.async_get(POST_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        await sync_to_async(revoke_tokens)(self.user.id)
+        res = await self.async_get(POST_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_writes_use_sync_viewset(self):
+        match = resolve(POST_URL)
+        request = self.factory.post(
+            POST_URL,
+            {"content": "New post"},
+            headers={"Authorization": f"Bearer {self.token}"},
+        )
+
+        res = await async_read_view(match.func)(request)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(await Post.objects.filter(content="New post").aexists())
+
+    async def sync_get(self, url, params=None):
+        await cache.aclear()
+        return await sync_to_async(self.client.get)(
+            url, params, HTTP_ACCEPT="application/json"
+        )
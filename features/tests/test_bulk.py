@@ -0,0 +1,113 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from features.models import Post, Comment, Like, Follow, TimelineEntry
+
+POST_BULK_URL = reverse("features:post-bulk")
+COMMENT_BULK_URL = reverse("features:comment-bulk")
+LIKE_BULK_URL = reverse("features:like-bulk")
+
+
+class BulkCreateTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("writer", "testpass")
+        self.follower = get_user_model().objects.create_user("reader", "testpass")
+        Follow.objects.create(follower=self.follower, followed=self.user)
+        self.client.force_authenticate(self.user)
+
+    def test_bulk_create_posts_with_single_insert(self):
+        payload = [{"content": f"Post {i}"} for i in range(3)]
+
+        with self.assertNumQueries(5):
+            res = self.client.post(POST_BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data), 3)
+        self.assertEqual(Post.objects.filter(author=self.user).count(), 3)
+        self.assertEqual(TimelineEntry.objects.filter(owner=self.follower).count(), 3)
+
+    def test_bulk_create_comments_updates_counters(self):
+        post = Post.objects.create(author=self.user, content="Post")
+        payload = [{"post": post.id, "content": f"Comment {i}"} for i in range(2)]
+
+        res = self.client.post(COMMENT_BULK_URL, payload, format="json")
+
+        post.refresh_from_db()
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Comment.objects.count(), 2)
+        self.assertEqual(post.comments_count, 2)
+
+    def test_bulk_create_likes(self):
+        posts = [
+            Post.objects.create(author=self.user, content="Post") for _ in range(2)
+        ]
+
+        res = self.client.post(
+            LIKE_BULK_URL, [{"post": post.id} for post in posts], format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Like.objects.filter(user=self.user).count(), 2)
+        self.assertEqual(
+            list(Post.objects.values_list("likes_count", flat=True)), [1, 1]
+        )
+
+    def test_duplicate_likes_in_batch_rejected(self):
+        post = Post.objects.create(author=self.user, content="Post")
+
+        res = self.client.post(
+            LIKE_BULK_URL, [{"post": post.id}, {"post": post.id}], format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Like.objects.exists())
+
+    def test_per_item_errors(self):
+        payload = [{"content": "Valid"}, {}]
+
+        res = self.client.post(POST_BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data[0], {})
+        self.assertIn("content", res.data[1])
+        self.assertFalse(Post.objects.exists())
+
+    @override_settings(BULK_CREATE_MAX_BATCH_SIZE=2)
+    def test_max_batch_size(self):
+        payload = [{"content": f"Post {i}"} for i in range(3)]
+
+        res = self.client.post(POST_BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Post.objects.exists())
+
+    def test_idempotency_key_replays_response(self):
+        payload = [{"content": "Post"}]
+        headers = {"Idempotency-Key": "batch-1"}
+
+        res = self.client.post(POST_BULK_URL, payload, format="json", headers=headers)
+        retry = self.client.post(POST_BULK_URL, payload, format="json", headers=headers)
+
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.data, res.data)
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(Post.objects.count(), 1)
+
+    def test_idempotency_key_reused_with_other_payload(self):
+        headers = {"Idempotency-Key": "batch-1"}
+        self.client.post(
+            POST_BULK_URL, [{"content": "Post"}], format="json", headers=headers
+        )
+
+        res = self.client.post(
+            POST_BULK_URL, [{"content": "Other"}], format="json", headers=headers
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(Post.objects.count(), 1)
@@ -0,0 +1,94 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from features.models import Post, Comment, Like
+
+POST_URL = reverse("features:post-list")
+COMMENT_URL = reverse("features:comment-list")
+
+
+def post_like_url(post_id):
+    return reverse("features:post-like", args=[post_id])
+
+
+class ConditionalListTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("reader", "testpass")
+        self.other = get_user_model().objects.create_user("other", "testpass")
+        self.client.force_authenticate(self.user)
+        self.post = Post.objects.create(author=self.other, content="Post")
+
+    def poll(self, url, etag, params=None):
+        return self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+
+    def test_unchanged_list_is_not_modified(self):
+        first = self.client.get(POST_URL)
+        self.assertIn("ETag", first)
+
+        with self.assertNumQueries(0):
+            res = self.poll(POST_URL, first["ETag"])
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res["ETag"], first["ETag"])
+        self.assertEqual(res.content, b"")
+
+    def test_etag_depends_on_the_query(self):
+        etag = self.client.get(POST_URL)["ETag"]
+
+        res = self.poll(POST_URL, etag, {"author": self.other.id})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res["ETag"], etag)
+
+    def test_writes_change_the_etag(self):
+        writes = [
+            lambda: Post.objects.create(author=self.other, content="New"),
+            lambda: self.client.put(post_like_url(self.post.id)),
+            lambda: Comment.objects.create(
+                author=self.user, post=self.post, content="Reply"
+            ),
+            lambda: Post.objects.filter(pk=self.post.pk).first().delete(),
+        ]
+        for write in writes:
+            etag = self.client.get(POST_URL)["ETag"]
+            write()
+
+            res = self.poll(POST_URL, etag)
+
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertNotEqual(res["ETag"], etag)
+
+    def test_filter_spellings_change_the_etag(self):
+        for params in [{"author": ""}, {"author": f"0{self.other.id}"}]:
+            etag = self.client.get(POST_URL, params)["ETag"]
+            Post.objects.create(author=self.other, content="New")
+
+            res = self.poll(POST_URL, etag, params)
+
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertNotEqual(res["ETag"], etag)
+
+    def test_comment_list_filtered_by_post(self):
+        url_params = {"post": self.post.id}
+        etag = self.client.get(COMMENT_URL, url_params)["ETag"]
+        self.assertEqual(
+            self.poll(COMMENT_URL, etag, url_params).status_code,
+            status.HTTP_304_NOT_MODIFIED,
+        )
+
+        Like.objects.create(user=self.user, post=self.post)
+        self.assertEqual(
+            self.poll(COMMENT_URL, etag, url_params).status_code,
+            status.HTTP_304_NOT_MODIFIED,
+        )
+
+        Comment.objects.create(author=self.other, post=self.post, content="Reply")
+        self.assertEqual(
+            self.poll(COMMENT_URL, etag, url_params).status_code, status.HTTP_200_OK
+        )
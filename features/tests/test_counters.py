@@ -0,0 +1,80 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from features.models import Post, Comment, Like, Follow
+from user.models import UserProfile
+
+COMMENT_URL = reverse("features:comment-list")
+LIKE_URL = reverse("features:like-list")
+FOLLOW_URL = reverse("features:follow-list")
+PROFILE_URL = reverse("user:profile")
+
+
+def follow_detail_url(follow_id):
+    return reverse("features:follow-detail", args=[follow_id])
+
+
+class CounterTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("reader", "testpass")
+        self.other = get_user_model().objects.create_user("other", "testpass")
+        self.post = Post.objects.create(author=self.other, content="Post")
+        self.client.force_authenticate(self.user)
+
+    def test_like_increments_post_counter(self):
+        self.client.post(LIKE_URL, {"post": self.post.id})
+
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 1)
+
+    def test_duplicate_like_rejected(self):
+        self.client.post(LIKE_URL, {"post": self.post.id})
+        res = self.client.post(LIKE_URL, {"post": self.post.id})
+
+        self.post.refresh_from_db()
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(self.post.likes_count, 1)
+
+    def test_comment_increments_post_counter(self):
+        self.client.post(COMMENT_URL, {"post": self.post.id, "content": "Comment"})
+
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comments_count, 1)
+
+    def test_follow_and_unfollow_update_profile_counters(self):
+        res = self.client.post(FOLLOW_URL, {"follower": self.other.id})
+
+        self.assertEqual(UserProfile.objects.get(user=self.user).following_count, 1)
+        self.assertEqual(UserProfile.objects.get(user=self.other).followers_count, 1)
+
+        self.client.delete(follow_detail_url(res.data["id"]))
+
+        self.assertEqual(UserProfile.objects.get(user=self.user).following_count, 0)
+        self.assertEqual(UserProfile.objects.get(user=self.other).followers_count, 0)
+
+    def test_profile_exposes_counters(self):
+        Follow.objects.create(follower=self.other, followed=self.user)
+        call_command("recompute_counters", stdout=StringIO())
+
+        res = self.client.get(PROFILE_URL)
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data["followers_count"], 1)
+        self.assertEqual(res.data["following_count"], 0)
+
+    def test_recompute_counters_repairs_drift(self):
+        Like.objects.create(user=self.user, post=self.post)
+        Comment.objects.create(author=self.user, post=self.post, content="Comment")
+        Post.objects.filter(pk=self.post.pk).update(likes_count=7, comments_count=7)
+
+        call_command("recompute_counters", batch_size=1, stdout=StringIO())
+
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 1)
+        self.assertEqual(self.post.comments_count, 1)
@@ -0,0 +1,94 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from features.models import Post, Comment
+
+POST_URL = reverse("features:post-list")
+COMMENT_URL = reverse("features:comment-list")
+
+
+class ExpandTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("reader", "testpass")
+        self.client.force_authenticate(self.user)
+
+    def create_rows(self, count):
+        authors = [
+            get_user_model().objects.create_user(f"author{count}-{i}", "testpass")
+            for i in range(count)
+        ]
+        posts = Post.objects.bulk_create(
+            [Post(author=author, content="Post") for author in authors]
+        )
+        Comment.objects.bulk_create(
+            [
+                Comment(author=author, post=post, content="Comment")
+                for author, post in zip(authors, posts)
+            ]
+        )
+
+    def test_expand_author(self):
+        post = Post.objects.create(author=self.user, content="Post")
+
+        res = self.client.get(POST_URL, {"expand": "author"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data["results"][0]["author"],
+            {"id": self.user.id, "username": "reader", "profile_picture": None},
+        )
+        self.assertEqual(res.data["results"][0]["id"], post.id)
+
+    def test_expand_comment_post(self):
+        post = Post.objects.create(author=self.user, content="Post")
+        Comment.objects.create(author=self.user, post=post, content="Comment")
+
+        res = self.client.get(COMMENT_URL, {"expand": "author,post"})
+
+        comment = res.data["results"][0]
+        self.assertEqual(comment["author"]["username"], "reader")
+        self.assertEqual(comment["post"]["id"], post.id)
+        self.assertEqual(comment["post"]["author"], self.user.id)
+
+    def test_without_expand_ids_are_returned(self):
+        Post.objects.create(author=self.user, content="Post")
+
+        res = self.client.get(POST_URL)
+
+        self.assertEqual(res.data["results"][0]["author"], self.user.id)
+
+    def test_expand_is_ignored_on_create(self):
+        post = Post.objects.create(author=self.user, content="Post")
+
+        res = self.client.post(
+            f"{COMMENT_URL}?expand=post", {"post": post.id, "content": "Comment"}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data["post"], post.id)
+
+    def test_query_count_is_constant(self):
+        for page_size in (1, 100):
+            with self.subTest(page_size=page_size):
+                cache.clear()
+                Post.objects.all().delete()
+                self.create_rows(page_size)
+
+                with self.assertNumQueries(1):
+                    res = self.client.get(
+                        POST_URL, {"expand": "author", "page_size": page_size}
+                    )
+                self.assertEqual(len(res.data["results"]), page_size)
+
+                with self.assertNumQueries(1):
+                    res = self.client.get(
+                        COMMENT_URL,
+                        {"expand": "author,post", "page_size": page_size},
+                    )
+                self.assertEqual(len(res.data["results"]), page_size)
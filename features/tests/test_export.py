@@ -0,0 +1,141 @@
+import gzip
+import json
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import AsyncClient, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from features.export import export_ndjson
+from features.models import Post, Comment, Like
+
+EXPORT_URL = reverse("features:export")
+
+
+def parse(content):
+    return [json.loads(line) for line in content.decode().splitlines()]
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("reader", "testpass")
+        self.other = get_user_model().objects.create_user("other", "testpass")
+        self.client.force_authenticate(self.user)
+
+        self.post = Post.objects.create(author=self.user, content="Mine")
+        other_post = Post.objects.create(author=self.other, content="Theirs")
+        self.comment = Comment.objects.create(
+            author=self.user, post=other_post, content="Nice"
+        )
+        Comment.objects.create(author=self.other, post=self.post, content="Thanks")
+        self.like = Like.objects.create(user=self.user, post=other_post)
+        Like.objects.create(user=self.other, post=self.post)
+
+    def test_export_streams_own_rows(self):
+        res = self.client.get(EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.streaming)
+        self.assertEqual(res["Content-Type"], "application/x-ndjson")
+        rows = parse(b"".join(res.streaming_content))
+        self.assertEqual(
+            [(row["type"], row["id"]) for row in rows],
+            [
+                ("post", self.post.id),
+                ("comment", self.comment.id),
+                ("like", self.like.id),
+            ],
+        )
+        self.assertEqual(rows[1]["post"], self.comment.post_id)
+        self.assertEqual(rows[0]["content"], "Mine")
+
+    def test_export_dates_match_the_api(self):
+        rows = parse(b"".join(export_ndjson(self.user.id)))
+
+        post = self.client.get(reverse("features:post-detail", args=[self.post.id]))
+        self.assertEqual(rows[0]["created_at"], post.data["created_at"])
+        self.assertEqual(
+            rows[0]["created_at"],
+            self.post.created_at.isoformat().replace("+00:00", "Z"),
+        )
+
+    def test_export_gzip(self):
+        res = self.client.get(EXPORT_URL, HTTP_ACCEPT_ENCODING="gzip, deflate")
+
+        self.assertEqual(res["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", res["Vary"])
+        rows = parse(gzip.decompress(b"".join(res.streaming_content)))
+        self.assertEqual(len(rows), 3)
+
+    @override_settings(EXPORT_BUFFER_SIZE=1)
+    async def test_export_streams_under_asgi(self):
+        produced = []
+
+        def counted_export(user_id):
+            for chunk in export_ndjson(user_id):
+                produced.append(chunk)
+                yield chunk
+
+        token = AccessToken.for_user(self.user)
+        with mock.patch("features.views.export_ndjson", counted_export):
+            res = await AsyncClient().get(
+                EXPORT_URL, headers={"Authorization": f"Bearer {token}"}
+            )
+            self.assertTrue(res.is_async)
+            chunks = aiter(res.streaming_content)
+            first = await anext(chunks)
+            self.assertEqual(len(produced), 1)
+            rest = [chunk async for chunk in chunks]
+
+        self.assertEqual(parse(first)[0]["id"], self.post.id)
+        self.assertEqual(len(rest), 2)
+
+    def test_export_other_user_staff_only(self):
+        res = self.client.get(EXPORT_URL, {"user": self.other.id})
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.user.is_staff = True
+        self.user.save()
+        res = self.client.get(EXPORT_URL, {"user": self.other.id})
+        rows = parse(b"".join(res.streaming_content))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]["content"], "Theirs")
+
+        res = self.client.get(EXPORT_URL, {"user": "nobody"})
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_export_reads_in_chunks(self):
+        Post.objects.bulk_create(
+            [Post(author=self.user, content=f"Post {i}") for i in range(9)]
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            chunks = list(export_ndjson(self.user.id, chunk_size=4, buffer_size=1))
+
+        # One line per chunk with a one byte buffer
+        self.assertEqual(len(chunks), 12)
+        self.assertEqual(len(queries), 3)
+
+    def test_command_writes_ndjson(self):
+        out = StringIO()
+        call_command("export_user_data", "reader", stdout=out)
+
+        self.assertEqual(len(parse(out.getvalue().encode())), 3)
+
+    def test_command_writes_gzip_file(self):
+        with TemporaryDirectory() as directory:
+            path = Path(directory) / "export.ndjson.gz"
+            call_command("export_user_data", "reader", output=str(path), gzip=True)
+
+            rows = parse(gzip.decompress(path.read_bytes()))
+        self.assertEqual(len(rows), 3)
@@ -89,11 +89,11 @@ class AuthenticatedApiTests(TestCase):
 
         res = self.client.get(POST_URL)
 
-        posts = Post.objects.order_by("id")
+        posts = Post.objects.order_by("-created_at", "-id")
         serializer = PostSerializer(posts, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data["results"], serializer.data)
 
     def test_filter_posts_by_author(self):
         another_user = get_user_model().objects.create_user(
@@ -107,8 +107,8 @@ class AuthenticatedApiTests(TestCase):
         serializer1 = PostSerializer(post1)
         serializer2 = PostSerializer(post2)
 
-        self.assertIn(serializer1.data, res.data)
-        self.assertNotIn(serializer2.data, res.data)
+        self.assertIn(serializer1.data, res.data["results"])
+        self.assertNotIn(serializer2.data, res.data["results"])
 
     def test_create_comment(self):
         post = sample_post(author=self.user)
@@ -130,11 +130,11 @@ class AuthenticatedApiTests(TestCase):
 
         res = self.client.get(COMMENT_URL)
 
-        comments = Comment.objects.order_by("id")
+        comments = Comment.objects.order_by("-created_at", "-id")
         serializer = CommentSerializer(comments, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data["results"], serializer.data)
 
     def test_filter_comments_by_author(self):
         post = sample_post(author=self.user)
@@ -149,8 +149,8 @@ class AuthenticatedApiTests(TestCase):
         serializer1 = CommentSerializer(comment1)
         serializer2 = CommentSerializer(comment2)
 
-        self.assertIn(serializer1.data, res.data)
-        self.assertNotIn(serializer2.data, res.data)
+        self.assertIn(serializer1.data, res.data["results"])
+        self.assertNotIn(serializer2.data, res.data["results"])
 
     def test_create_like(self):
         post = sample_post(author=self.user)
@@ -170,11 +170,11 @@ class AuthenticatedApiTests(TestCase):
 
         res = self.client.get(LIKE_URL)
 
-        likes = Like.objects.order_by("id")
+        likes = Like.objects.order_by("-id")
         serializer = LikeSerializer(likes, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data["results"], serializer.data)
 
     def test_filter_likes_by_user(self):
         post = sample_post(author=self.user)
@@ -189,8 +189,8 @@ class AuthenticatedApiTests(TestCase):
         serializer1 = LikeSerializer(like1)
         serializer2 = LikeSerializer(like2)
 
-        self.assertIn(serializer1.data, res.data)
-        self.assertNotIn(serializer2.data, res.data)
+        self.assertIn(serializer1.data, res.data["results"])
+        self.assertNotIn(serializer2.data, res.data["results"])
 
     def test_create_follow(self):
         another_user = get_user_model().objects.create_user(
@@ -226,11 +226,11 @@ class AuthenticatedApiTests(TestCase):
 
         res = self.client.get(FOLLOW_URL)
 
-        follows = Follow.objects.order_by("id")
+        follows = Follow.objects.order_by("-id")
         serializer = FollowSerializer(follows, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data["results"], serializer.data)
 
     def test_filter_follows_by_follower(self):
         another_user = get_user_model().objects.create_user(
@@ -244,5 +244,5 @@ class AuthenticatedApiTests(TestCase):
         serializer1 = FollowSerializer(follow1)
         serializer2 = FollowSerializer(follow2)
 
-        self.assertIn(serializer1.data, res.data)
-        self.assertNotIn(serializer2.data, res.data)
+        self.assertIn(serializer1.data, res.data["results"])
+        self.assertNotIn(serializer2.data, res.data["results"])
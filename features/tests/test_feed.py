@@ -0,0 +1,148 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from features.counters import recompute_profile_counters
+from features.feed import trim_timelines
+from features.follows import follow_users, unfollow_users
+from features.models import Post, Follow, TimelineEntry
+from features.serializers import PostSerializer
+
+POST_URL = reverse("features:post-list")
+FEED_URL = reverse("features:feed-list")
+FOLLOW_URL = reverse("features:follow-list")
+
+
+class FeedApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("reader", "testpass")
+        self.author = get_user_model().objects.create_user("author", "testpass")
+        self.stranger = get_user_model().objects.create_user("stranger", "testpass")
+        Follow.objects.create(follower=self.user, followed=self.author)
+        recompute_profile_counters()
+
+    def create_post(self, author, content="Post"):
+        self.client.force_authenticate(author)
+        res = self.client.post(POST_URL, {"content": content})
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        return Post.objects.get(id=res.data["id"])
+
+    def test_auth_required(self):
+        res = self.client.get(FEED_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_create_post_fans_out_to_followers(self):
+        post = self.create_post(self.author)
+
+        self.assertTrue(
+            TimelineEntry.objects.filter(owner=self.user, post=post).exists()
+        )
+        self.assertFalse(TimelineEntry.objects.filter(owner=self.stranger).exists())
+
+    def test_feed_lists_followed_posts_newest_first(self):
+        post1 = self.create_post(self.author, "Post 1")
+        post2 = self.create_post(self.author, "Post 2")
+        self.create_post(self.stranger, "Not followed")
+
+        self.client.force_authenticate(self.user)
+        res = self.client.get(FEED_URL)
+
+        serializer = PostSerializer([post2, post1], many=True)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["results"], serializer.data)
+
+    @override_settings(FEED_FANOUT_THRESHOLD=0)
+    def test_high_follower_author_merged_on_read(self):
+        post = self.create_post(self.author)
+
+        self.assertFalse(TimelineEntry.objects.exists())
+
+        self.client.force_authenticate(self.user)
+        res = self.client.get(FEED_URL)
+
+        self.assertEqual(res.data["results"], PostSerializer([post], many=True).data)
+
+    @override_settings(FEED_FANOUT_THRESHOLD=1)
+    def test_pages_merge_pushed_and_pulled_posts(self):
+        popular = get_user_model().objects.create_user("popular", "testpass")
+        follow_users(self.user.id, [popular.id])
+        follow_users(self.stranger.id, [popular.id])
+        posts = [
+            self.create_post(author, f"Post {i}")
+            for i in range(5)
+            for author in (self.author, popular)
+        ]
+        self.assertEqual(TimelineEntry.objects.filter(owner=self.user).count(), 5)
+
+        self.client.force_authenticate(self.user)
+        ids = []
+        res = self.client.get(FEED_URL, {"page_size": 3})
+        while True:
+            ids.extend(item["id"] for item in res.data["results"])
+            if res.data["next"] is None:
+                break
+            res = self.client.get(res.data["next"])
+
+        self.assertEqual(ids, [post.id for post in reversed(posts)])
+
+    def test_invalid_cursor(self):
+        self.client.force_authenticate(self.user)
+        for cursor in ("WyJ4IiwgMV0=", "WzEsIDJd", "WyIyMDI0LTAxLTAxIiwgIngiXQ=="):
+            with self.subTest(cursor=cursor):
+                res = self.client.get(FEED_URL, {"cursor": cursor})
+                self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_unfollow_removes_author_posts(self):
+        self.create_post(self.author)
+        self.create_post(self.stranger)
+        follow_users(self.user.id, [self.stranger.id])
+        self.create_post(self.stranger)
+        follow = Follow.objects.get(follower=self.user, followed=self.author)
+
+        self.client.force_authenticate(self.user)
+        res = self.client.delete(reverse("features:follow-detail", args=[follow.id]))
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(len(self.client.get(FEED_URL).data["results"]), 2)
+
+        unfollow_users(self.user.id, [self.stranger.id])
+        self.assertEqual(self.client.get(FEED_URL).data["results"], [])
+        self.assertFalse(TimelineEntry.objects.exists())
+
+    @override_settings(FEED_MAX_LENGTH=2)
+    def test_follow_pushes_existing_posts(self):
+        posts = [self.create_post(self.stranger, f"Post {i}") for i in range(3)]
+
+        self.client.force_authenticate(self.user)
+        res = self.client.post(FOLLOW_URL, {"follower": self.stranger.id})
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        res = self.client.get(FEED_URL)
+        self.assertEqual(
+            [item["id"] for item in res.data["results"]],
+            [posts[2].id, posts[1].id],
+        )
+
+        unfollow_users(self.user.id, [self.stranger.id])
+        follow_users(self.user.id, [self.stranger.id])
+        self.assertEqual(len(self.client.get(FEED_URL).data["results"]), 2)
+
+    @override_settings(FEED_MAX_LENGTH=2)
+    def test_trim_keeps_newest_entries(self):
+        posts = [self.create_post(self.author, f"Post {i}") for i in range(4)]
+        Follow.objects.create(follower=self.stranger, followed=self.author)
+        self.create_post(self.author, "Latest")
+
+        self.assertEqual(trim_timelines(), 3)
+        self.assertEqual(
+            list(
+                TimelineEntry.objects.filter(owner=self.user)
+                .order_by("-created_at")
+                .values_list("post__content", flat=True)
+            ),
+            ["Latest", "Post 3"],
+        )
+        self.assertEqual(TimelineEntry.objects.filter(owner=self.stranger).count(), 1)
+        self.assertEqual(Post.objects.count(), len(posts) + 1)
@@ -0,0 +1,161 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from features import graph
+from features.follows import follow_users
+from features.models import Follow
+from user.models import UserProfile
+
+FOLLOW_URL = reverse("features:follow-list")
+BULK_FOLLOW_URL = reverse("features:follow-bulk")
+BULK_UNFOLLOW_URL = reverse("features:follow-bulk-unfollow")
+
+
+def follow_detail_url(follow_id):
+    return reverse("features:follow-detail", args=[follow_id])
+
+
+class FollowWriteTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.users = [
+            get_user_model().objects.create_user(f"user{i}", "testpass")
+            for i in range(4)
+        ]
+        self.me = self.users[0]
+        self.client.force_authenticate(self.me)
+
+    def counts(self, user):
+        profile = UserProfile.objects.get(user=user)
+        return profile.followers_count, profile.following_count
+
+    def test_follow_is_a_single_statement(self):
+        # SAVEPOINT, INSERT ... RETURNING, two counter UPDATEs, the followed
+        # user's posts for the timeline, RELEASE
+        with self.assertNumQueries(6):
+            res = self.client.post(FOLLOW_URL, {"follower": self.users[1].id})
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            res.data,
+            {
+                "id": Follow.objects.get().id,
+                "follower": self.me.id,
+                "followed": self.users[1].id,
+            },
+        )
+
+    def test_follow_unknown_user(self):
+        res = self.client.post(FOLLOW_URL, {"follower": 999})
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+        res = self.client.post(FOLLOW_URL, {"follower": "abc"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_follow_yourself(self):
+        res = self.client.post(FOLLOW_URL, {"follower": self.me.id})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        res = self.client.post(
+            BULK_FOLLOW_URL, {"users": [self.me.id, self.users[1].id]}, format="json"
+        )
+        self.assertEqual(res.data["users"], [self.users[1].id])
+        self.assertEqual(follow_users(self.me.id, [self.me.id]), [])
+
+        self.assertFalse(Follow.objects.filter(followed=self.me).exists())
+        self.assertEqual(self.counts(self.me), (0, 1))
+        self.assertEqual(graph.mutuals(self.me.id), [])
+
+    def test_unfollow_is_scoped_to_follower(self):
+        theirs = Follow.objects.create(follower=self.users[1], followed=self.me)
+
+        res = self.client.delete(follow_detail_url(theirs.id))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertTrue(Follow.objects.filter(id=theirs.id).exists())
+
+        mine = self.client.post(FOLLOW_URL, {"follower": self.users[1].id}).data
+        res = self.client.delete(follow_detail_url(mine["id"]))
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.counts(self.users[1])[0], 0)
+        self.assertEqual(self.counts(self.me)[1], 0)
+
+    def test_follows_cannot_be_edited(self):
+        mine = self.client.post(FOLLOW_URL, {"follower": self.users[1].id}).data
+
+        for method in (self.client.patch, self.client.put):
+            res = method(
+                follow_detail_url(mine["id"]),
+                {"follower": self.users[2].id, "followed": self.users[1].id},
+            )
+            self.assertEqual(res.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+        self.assertTrue(Follow.objects.filter(id=mine["id"], follower=self.me).exists())
+
+    def test_bulk_follow_and_unfollow(self):
+        Follow.objects.create(follower=self.me, followed=self.users[1])
+        graph.following_ids(self.me.id)
+        ids = [user.id for user in self.users[1:]] + [999]
+
+        res = self.client.post(BULK_FOLLOW_URL, {"users": ids}, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(sorted(res.data["users"]), ids[1:3])
+        self.assertEqual(Follow.objects.filter(follower=self.me).count(), 3)
+        self.assertEqual(self.counts(self.me), (0, 2))
+        self.assertEqual(self.counts(self.users[2]), (1, 0))
+        self.assertTrue(graph.is_following(self.me.id, self.users[3].id))
+
+        res = self.client.post(
+            BULK_UNFOLLOW_URL, {"users": ids[1:] + [ids[1]]}, format="json"
+        )
+
+        self.assertEqual(sorted(res.data["users"]), ids[1:3])
+        self.assertEqual(self.counts(self.me), (0, 0))
+        self.assertFalse(graph.is_following(self.me.id, self.users[3].id))
+
+    @override_settings(BULK_CREATE_MAX_BATCH_SIZE=2)
+    def test_bulk_follow_validation(self):
+        for users in ([], [1, 2, 3], ["x"]):
+            res = self.client.post(BULK_FOLLOW_URL, {"users": users}, format="json")
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ConcurrentFollowTests(TransactionTestCase):
+    def setUp(self):
+        self.users = [
+            get_user_model().objects.create_user(f"user{i}", "testpass")
+            for i in range(5)
+        ]
+
+    def follow(self, index):
+        # Exceptions raised in one thread's request leak into every test
+        # client through the got_request_exception signal, so look at status
+        # codes only.
+        client = APIClient(raise_request_exception=False)
+        client.force_authenticate(self.users[index % 2])
+        try:
+            # SQLite locks the whole database for writers, retry like a client
+            for attempt in range(100):
+                res = client.post(FOLLOW_URL, {"follower": self.users[4].id})
+                if res.status_code != status.HTTP_500_INTERNAL_SERVER_ERROR:
+                    return res
+                time.sleep(0.001 * attempt)
+            raise AssertionError("Follow kept failing")
+        finally:
+            connection.close()
+
+    def test_parallel_follows_create_no_duplicates(self):
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            responses = list(executor.map(self.follow, range(50)))
+
+        created = [res for res in responses if res.status_code == 201]
+        self.assertEqual(len(created), 2)
+        self.assertTrue(all(res.status_code in (201, 400) for res in responses))
+        self.assertEqual(Follow.objects.count(), 2)
+        self.assertEqual(UserProfile.objects.get(user=self.users[4]).followers_count, 2)
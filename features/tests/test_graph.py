@@ -0,0 +1,121 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from features import graph
+from features.models import Follow
+
+FOLLOW_URL = reverse("features:follow-list")
+IS_FOLLOWING_URL = reverse("features:follow-is-following")
+ARE_FOLLOWING_URL = reverse("features:follow-are-following")
+MUTUALS_URL = reverse("features:follow-mutuals")
+SUGGESTIONS_URL = reverse("features:follow-suggestions")
+
+
+def follow_detail_url(follow_id):
+    return reverse("features:follow-detail", args=[follow_id])
+
+
+class FollowGraphTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.users = [
+            get_user_model().objects.create_user(f"user{i}", "testpass")
+            for i in range(6)
+        ]
+        self.me = self.users[0]
+        self.client.force_authenticate(self.me)
+
+    def follow(self, follower, followed):
+        return Follow.objects.create(follower=follower, followed=followed)
+
+    def test_sets_are_cached(self):
+        self.follow(self.me, self.users[1])
+        self.follow(self.me, self.users[2])
+
+        self.assertEqual(
+            list(graph.following_ids(self.me.id)), [self.users[1].id, self.users[2].id]
+        )
+        with CaptureQueriesContext(connection) as queries:
+            self.assertTrue(graph.is_following(self.me.id, self.users[1].id))
+            self.assertFalse(graph.is_following(self.me.id, self.users[3].id))
+        self.assertEqual(len(queries), 0)
+
+    def test_follow_and_unfollow_invalidate(self):
+        res = self.client.get(IS_FOLLOWING_URL, {"user": self.users[1].id})
+        self.assertFalse(res.data["following"])
+
+        res = self.client.post(FOLLOW_URL, {"follower": self.users[1].id})
+        follow_id = res.data["id"]
+        res = self.client.get(IS_FOLLOWING_URL, {"user": self.users[1].id})
+        self.assertTrue(res.data["following"])
+        self.assertEqual(list(graph.follower_ids(self.users[1].id)), [self.me.id])
+
+        self.client.delete(follow_detail_url(follow_id))
+        res = self.client.get(IS_FOLLOWING_URL, {"user": self.users[1].id})
+        self.assertFalse(res.data["following"])
+        self.assertEqual(list(graph.follower_ids(self.users[1].id)), [])
+
+    def test_are_following(self):
+        self.follow(self.me, self.users[2])
+        ids = [self.users[1].id, self.users[2].id]
+
+        res = self.client.get(ARE_FOLLOWING_URL, {"ids": ",".join(map(str, ids))})
+
+        self.assertEqual(
+            res.data,
+            [
+                {"user": self.users[1].id, "following": False},
+                {"user": self.users[2].id, "following": True},
+            ],
+        )
+
+    def test_are_following_validates_ids(self):
+        for ids in ("", "1,x", ",".join(str(i) for i in range(101))):
+            res = self.client.get(ARE_FOLLOWING_URL, {"ids": ids})
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_mutuals(self):
+        self.follow(self.me, self.users[1])
+        self.follow(self.users[1], self.me)
+        self.follow(self.me, self.users[2])
+        self.follow(self.users[3], self.me)
+
+        res = self.client.get(MUTUALS_URL)
+
+        self.assertEqual([user["id"] for user in res.data], [self.users[1].id])
+        self.assertEqual(res.data[0]["username"], "user1")
+
+    def test_suggestions_rank_by_shared_follows(self):
+        me, a, b, c, d, e = self.users
+        self.follow(me, a)
+        self.follow(me, b)
+        self.follow(a, c)
+        self.follow(b, c)
+        self.follow(a, d)
+        self.follow(a, b)
+        self.follow(b, me)
+        self.follow(e, me)
+
+        res = self.client.get(SUGGESTIONS_URL)
+
+        self.assertEqual(
+            [(user["id"], user["mutual_count"]) for user in res.data],
+            [(c.id, 2), (d.id, 1)],
+        )
+
+    def test_suggestions_do_not_join_follow_table(self):
+        me, a, b, c, *_ = self.users
+        self.follow(me, a)
+        self.follow(a, b)
+        graph.suggestions(me.id, 10)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(graph.suggestions(me.id, 10), [(b.id, 1)])
+        self.assertEqual(len(queries), 0)
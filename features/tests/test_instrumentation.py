@@ -0,0 +1,117 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from features.models import Post
+from social_media_api import metrics
+from social_media_api.instrumentation import recorder
+
+POST_URL = reverse("features:post-list")
+METRICS_URL = reverse("metrics")
+
+
+def server_timing_queries(response):
+    return int(re.search(r'desc="(\d+) queries"', response["Server-Timing"])[1])
+
+
+@override_settings(METRICS_FLUSH_INTERVAL=0, METRICS_TOKEN=None, METRICS_PUBLIC=True)
+class InstrumentationTests(TestCase):
+    def setUp(self):
+        recorder.flush()
+        cache.clear()
+        self.user = get_user_model().objects.create_user("reader", "testpass")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        Post.objects.create(author=self.user, content="Post")
+
+    def test_server_timing_header(self):
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(POST_URL)
+
+        self.assertRegex(res["Server-Timing"], r"^app;dur=[\d.]+, db;dur=[\d.]+;")
+        self.assertEqual(server_timing_queries(res), len(queries))
+
+    async def test_async_requests_count_worker_thread_queries(self):
+        headers = {"Authorization": f"Bearer {AccessToken.for_user(self.user)}"}
+        sync = await sync_to_async(Client().get)(POST_URL, headers=headers)
+        await cache.aclear()
+
+        res = await self.async_client.get(POST_URL, headers=headers)
+
+        self.assertEqual(res["X-Cache"], "MISS")
+        self.assertGreater(server_timing_queries(res), 0)
+        self.assertEqual(server_timing_queries(res), server_timing_queries(sync))
+
+    def test_metrics_endpoint(self):
+        self.client.get(POST_URL)
+        res = self.client.get(POST_URL)
+
+        metrics = self.client.get(METRICS_URL).content.decode()
+
+        self.assertIn(
+            'http_request_duration_seconds_count{view="features:post-list"} 2', metrics
+        )
+        self.assertIn(
+            'http_request_duration_seconds_bucket{view="features:post-list",le="+Inf"} 2',
+            metrics,
+        )
+        self.assertIn(
+            f'response_bytes_total{{view="features:post-list"}} {2 * len(res.content)}',
+            metrics,
+        )
+        self.assertRegex(metrics, r'db_queries_total\{view="features:post-list"\} \d+')
+
+    @override_settings(QUERY_COUNT_THRESHOLD=0)
+    def test_query_threshold(self):
+        with self.assertLogs("social_media_api.instrumentation", "WARNING") as logs:
+            self.client.get(POST_URL)
+
+        self.assertIn(f"GET {POST_URL} ran", logs.output[0])
+        self.assertIn(
+            'query_threshold_exceeded_total{view="features:post-list"} 1',
+            self.client.get(METRICS_URL).content.decode(),
+        )
+
+    @override_settings(METRICS_TOKEN="secret")
+    def test_metrics_token(self):
+        self.assertEqual(self.client.get(METRICS_URL).status_code, 403)
+        res = self.client.get(METRICS_URL, HTTP_AUTHORIZATION="Bearer wrong")
+        self.assertEqual(res.status_code, 403)
+        res = self.client.get(METRICS_URL, HTTP_AUTHORIZATION="Bearer secret")
+        self.assertEqual(res.status_code, 200)
+
+    @override_settings(METRICS_PUBLIC=False)
+    def test_metrics_closed_without_token(self):
+        self.assertEqual(self.client.get(METRICS_URL).status_code, 403)
+        res = self.client.get(METRICS_URL, HTTP_AUTHORIZATION="Bearer None")
+        self.assertEqual(res.status_code, 403)
+
+
+class MetricsTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_concurrently_created_counters_are_all_listed(self):
+        with ThreadPoolExecutor(8) as executor:
+            list(executor.map(lambda i: metrics.increment("c", view=i), range(50)))
+
+        self.assertEqual(
+            metrics.snapshot(),
+            {("c", (("view", str(i)),)): 1 for i in range(50)},
+        )
+
+    def test_evicted_counter_is_listed_once(self):
+        metrics.increment("c")
+        cache.delete("metrics:c|")
+        metrics.increment("c", 2)
+
+        self.assertEqual(metrics.snapshot(), {("c", ()): 2})
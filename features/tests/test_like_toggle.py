@@ -0,0 +1,101 @@
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.db import connection, OperationalError
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from features.likes import like_post, unlike_post
+from features.models import Post, Like
+
+POST_URL = reverse("features:post-list")
+
+
+def like_url(post_id):
+    return reverse("features:post-like", args=[post_id])
+
+
+class LikeToggleTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("reader", "testpass")
+        self.post = Post.objects.create(author=self.user, content="Post")
+        self.client.force_authenticate(self.user)
+
+    def test_like_is_idempotent(self):
+        for _ in range(2):
+            res = self.client.put(like_url(self.post.id))
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertEqual(res.data, {"liked": True, "likes_count": 1})
+
+        self.assertEqual(Like.objects.filter(post=self.post).count(), 1)
+
+    def test_unlike_is_idempotent(self):
+        self.client.put(like_url(self.post.id))
+
+        for _ in range(2):
+            res = self.client.delete(like_url(self.post.id))
+            self.assertEqual(res.data, {"liked": False, "likes_count": 0})
+
+        self.assertFalse(Like.objects.exists())
+
+    def test_toggle_invalidates_cached_post_list(self):
+        self.client.get(POST_URL)
+
+        self.client.put(like_url(self.post.id))
+        res = self.client.get(POST_URL)
+
+        self.assertEqual(res["X-Cache"], "MISS")
+        self.assertEqual(res.data["results"][0]["likes_count"], 1)
+
+    def test_missing_post(self):
+        res = self.client.put(like_url(self.post.id + 1))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(Like.objects.exists())
+
+    def test_no_read_before_write(self):
+        # SAVEPOINT, INSERT, UPDATE counter, SELECT state, RELEASE
+        with self.assertNumQueries(5):
+            like_post(self.user.id, self.post.id)
+        # Nothing changed: no counter update
+        with self.assertNumQueries(4):
+            like_post(self.user.id, self.post.id)
+
+
+class ConcurrentLikeToggleTests(TransactionTestCase):
+    def setUp(self):
+        self.users = [
+            get_user_model().objects.create_user(f"user{i}", "testpass")
+            for i in range(5)
+        ]
+        self.post = Post.objects.create(author=self.users[0], content="Post")
+
+    def toggle(self, seed):
+        rng = random.Random(seed)
+        user = rng.choice(self.users)
+        toggle = rng.choice([like_post, unlike_post])
+        try:
+            # SQLite locks the whole database for writers, retry like a client
+            for attempt in range(100):
+                try:
+                    return toggle(user.id, self.post.id)
+                except OperationalError:
+                    time.sleep(0.001 * attempt)
+            raise AssertionError("Toggle kept failing")
+        finally:
+            connection.close()
+
+    def test_parallel_toggles_stay_consistent(self):
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            results = list(executor.map(self.toggle, range(100)))
+
+        self.assertTrue(all(result is not None for result in results))
+        likes = Like.objects.filter(post=self.post)
+        self.assertEqual(likes.count(), likes.values("user").distinct().count())
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, likes.count())
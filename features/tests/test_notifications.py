@@ -0,0 +1,251 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from features import notifications
+from features.models import Post, Notification, NotificationActor
+from features.tasks import deliver_notifications
+from social_media_api.celery import app as celery_app
+
+NOTIFICATION_URL = reverse("features:notification-list")
+UNREAD_URL = reverse("features:notification-unread")
+READ_URL = reverse("features:notification-read")
+LIKE_URL = reverse("features:like-list")
+LIKE_BULK_URL = reverse("features:like-bulk")
+COMMENT_BULK_URL = reverse("features:comment-bulk")
+FOLLOW_URL = reverse("features:follow-list")
+BULK_FOLLOW_URL = reverse("features:follow-bulk")
+
+Verb = Notification.Verb
+
+
+def post_like_url(post_id):
+    return reverse("features:post-like", args=[post_id])
+
+
+class NotificationTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.celery_config = {
+            "CELERY_TASK_ALWAYS_EAGER": celery_app.conf.task_always_eager,
+            "CELERY_BROKER_URL": celery_app.conf.broker_url,
+        }
+        celery_app.conf.update(
+            CELERY_TASK_ALWAYS_EAGER=True, CELERY_BROKER_URL="memory://"
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        celery_app.conf.update(cls.celery_config)
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        self.author = get_user_model().objects.create_user("author", "testpass")
+        self.users = [
+            get_user_model().objects.create_user(f"fan{i}", "testpass")
+            for i in range(4)
+        ]
+        self.post = Post.objects.create(author=self.author, content="Post")
+        self.client = APIClient()
+
+    def act_as(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def test_likes_are_coalesced(self):
+        for user in self.users:
+            with self.captureOnCommitCallbacks(execute=True):
+                res = self.act_as(user).post(LIKE_URL, {"post": self.post.id})
+            self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        self.client.force_authenticate(self.author)
+        res = self.client.get(NOTIFICATION_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data["results"]), 1)
+        notification = res.data["results"][0]
+        self.assertEqual(notification["verb"], Verb.LIKE)
+        self.assertEqual(notification["actor"]["id"], self.users[-1].id)
+        self.assertEqual(notification["actor_count"], 4)
+        self.assertEqual(notification["post"], self.post.id)
+        self.assertEqual(notification["message"], "fan3 and 3 others liked your post")
+
+    def test_batch_is_written_once(self):
+        other = Post.objects.create(author=self.users[0], content="Other")
+        events = [
+            (Verb.LIKE, self.users[1].id, self.post.id),
+            (Verb.LIKE, self.users[2].id, self.post.id),
+            (Verb.LIKE, self.users[1].id, self.post.id),
+            (Verb.COMMENT, self.users[1].id, self.post.id),
+            (Verb.LIKE, self.users[1].id, other.id),
+        ]
+
+        with self.assertNumQueries(6):
+            # Post authors, savepoint, existing rows, insert, actors, release
+            touched = notifications.deliver(events)
+
+        self.assertEqual(touched, 3)
+        like = Notification.objects.get(recipient=self.author, verb=Verb.LIKE)
+        self.assertEqual((like.actor_id, like.actor_count), (self.users[1].id, 2))
+        self.assertTrue(
+            Notification.objects.filter(recipient=self.users[0], post=other).exists()
+        )
+
+    def test_repeated_actions_are_counted_once(self):
+        client = self.act_as(self.users[0])
+        with self.captureOnCommitCallbacks(execute=True):
+            client.put(post_like_url(self.post.id))
+        with self.captureOnCommitCallbacks(execute=True):
+            client.delete(post_like_url(self.post.id))
+        with self.captureOnCommitCallbacks(execute=True):
+            client.put(post_like_url(self.post.id))
+        notification = Notification.objects.get()
+        self.assertEqual(notification.actor_count, 1)
+
+        notifications.deliver(
+            [
+                (Verb.LIKE, self.users[1].id, self.post.id),
+                (Verb.LIKE, self.users[0].id, self.post.id),
+            ]
+        )
+        notification.refresh_from_db()
+        self.assertEqual(
+            (notification.actor_id, notification.actor_count), (self.users[1].id, 2)
+        )
+
+    def test_no_notification_for_own_actions(self):
+        client = self.act_as(self.author)
+        with self.captureOnCommitCallbacks(execute=True):
+            client.put(post_like_url(self.post.id))
+
+        self.assertFalse(Notification.objects.exists())
+
+    def test_like_toggle_and_bulk_writes_notify(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.act_as(self.users[0]).put(post_like_url(self.post.id))
+            self.act_as(self.users[1]).post(
+                LIKE_BULK_URL, [{"post": self.post.id}], format="json"
+            )
+            self.act_as(self.users[2]).post(
+                COMMENT_BULK_URL,
+                [{"post": self.post.id, "content": "Nice"}],
+                format="json",
+            )
+
+        self.assertEqual(
+            dict(
+                Notification.objects.filter(recipient=self.author).values_list(
+                    "verb", "actor_count"
+                )
+            ),
+            {Verb.LIKE: 2, Verb.COMMENT: 1},
+        )
+
+    def test_unlike_does_not_notify(self):
+        client = self.act_as(self.users[0])
+        client.put(post_like_url(self.post.id))
+        Notification.objects.all().delete()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            client.put(post_like_url(self.post.id))
+            client.delete(post_like_url(self.post.id))
+
+        self.assertFalse(Notification.objects.exists())
+
+    def test_follows_notify(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.act_as(self.users[0]).post(FOLLOW_URL, {"follower": self.author.id})
+            self.act_as(self.users[1]).post(
+                BULK_FOLLOW_URL,
+                {"users": [self.author.id, self.users[2].id]},
+                format="json",
+            )
+
+        self.client.force_authenticate(self.author)
+        res = self.client.get(NOTIFICATION_URL)
+
+        self.assertEqual(
+            [item["message"] for item in res.data["results"]],
+            ["fan1 and 1 other followed you"],
+        )
+        self.assertIsNone(res.data["results"][0]["post"])
+        self.assertTrue(
+            Notification.objects.filter(
+                recipient=self.users[2], verb=Verb.FOLLOW
+            ).exists()
+        )
+
+    def test_unread_count_is_cached(self):
+        deliver_notifications.delay([(Verb.LIKE, self.users[0].id, self.post.id)])
+        self.client.force_authenticate(self.author)
+
+        res = self.client.get(UNREAD_URL)
+        self.assertEqual(res.data, {"unread": 1})
+        with self.assertNumQueries(0):
+            notifications.unread_count(self.author.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            deliver_notifications.delay(
+                [
+                    (Verb.LIKE, self.users[1].id, self.post.id),
+                    (Verb.FOLLOW, self.users[1].id, self.author.id),
+                ]
+            )
+
+        with self.assertNumQueries(0):
+            self.assertEqual(notifications.unread_count(self.author.id), 2)
+
+    def test_mark_read(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            deliver_notifications.delay(
+                [
+                    (Verb.LIKE, self.users[0].id, self.post.id),
+                    (Verb.FOLLOW, self.users[0].id, self.author.id),
+                ]
+            )
+        self.client.force_authenticate(self.author)
+        follow = Notification.objects.get(verb=Verb.FOLLOW)
+
+        res = self.client.post(READ_URL, {"ids": [follow.id]}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, {"unread": 1})
+
+        res = self.client.post(READ_URL, {}, format="json")
+        self.assertEqual(res.data, {"unread": 0})
+        self.assertEqual(self.client.get(NOTIFICATION_URL).data["results"], [])
+
+    def test_read_notifications_are_not_extended(self):
+        notifications.deliver([(Verb.LIKE, self.users[0].id, self.post.id)])
+        notifications.mark_read(self.author.id)
+        self.assertFalse(NotificationActor.objects.exists())
+
+        notifications.deliver([(Verb.LIKE, self.users[0].id, self.post.id)])
+
+        self.assertEqual(
+            list(
+                Notification.objects.order_by("id").values_list("read", "actor_count")
+            ),
+            [(True, 1), (False, 1)],
+        )
+
+    def test_list_is_private_and_paginated(self):
+        for user in self.users:
+            notifications.deliver([(Verb.FOLLOW, self.author.id, user.id)])
+        self.client.force_authenticate(self.users[0])
+
+        res = self.client.get(NOTIFICATION_URL, {"page_size": 1})
+
+        self.assertEqual(len(res.data["results"]), 1)
+        self.assertIsNone(res.data["next"])
+        self.assertEqual(res.data["results"][0]["message"], "author followed you")
+
+    def test_requires_authentication(self):
+        res = self.client.get(NOTIFICATION_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
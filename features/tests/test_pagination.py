@@ -0,0 +1,91 @@
+import json
+from base64 import urlsafe_b64encode
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from features.models import Post, Like
+
+POST_URL = reverse("features:post-list")
+LIKE_URL = reverse("features:like-list")
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("reader", "testpass")
+        self.client.force_authenticate(self.user)
+
+    def collect_pages(self, url, params):
+        ids = []
+        res = self.client.get(url, params)
+        while True:
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            ids.extend(item["id"] for item in res.data["results"])
+            if res.data["next"] is None:
+                return ids
+            res = self.client.get(res.data["next"])
+
+    def test_pages_walk_posts_newest_first(self):
+        posts = Post.objects.bulk_create(
+            [Post(author=self.user, content=f"Post {i}") for i in range(7)]
+        )
+        expected = list(
+            Post.objects.order_by("-created_at", "-id").values_list("id", flat=True)
+        )
+
+        ids = self.collect_pages(POST_URL, {"page_size": 3})
+
+        self.assertEqual(ids, expected)
+        self.assertEqual(len(ids), len(posts))
+
+    def test_pages_walk_likes_by_id(self):
+        for i in range(5):
+            post = Post.objects.create(author=self.user, content=f"Post {i}")
+            Like.objects.create(user=self.user, post=post)
+
+        ids = self.collect_pages(LIKE_URL, {"page_size": 2})
+
+        self.assertEqual(
+            ids, list(Like.objects.order_by("-id").values_list("id", flat=True))
+        )
+
+    def test_page_size_is_capped(self):
+        Post.objects.bulk_create(
+            [Post(author=self.user, content=f"Post {i}") for i in range(105)]
+        )
+
+        res = self.client.get(POST_URL, {"page_size": 1000})
+
+        self.assertEqual(len(res.data["results"]), 100)
+        self.assertIsNotNone(res.data["next"])
+
+    def test_no_count_query(self):
+        Post.objects.create(author=self.user, content="Post")
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(POST_URL)
+
+        self.assertFalse(any("COUNT(" in q["sql"].upper() for q in queries))
+
+    def test_invalid_cursor(self):
+        res = self.client.get(POST_URL, {"cursor": "not-a-cursor"})
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_values_of_the_wrong_type(self):
+        for url, position in (
+            (LIKE_URL, ["x"]),
+            (LIKE_URL, [[1]]),
+            (POST_URL, ["abc", "x"]),
+            (POST_URL, ["2024-05-01T12:00:00Z", {"id": 1}]),
+        ):
+            with self.subTest(url=url, position=position):
+                cursor = urlsafe_b64encode(json.dumps(position).encode()).decode()
+                res = self.client.get(url, {"cursor": cursor})
+                self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,74 @@
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+
+from features.models import Post, Comment, Like, Follow
+
+
+class QueryPlanMixin:
+    """Assert that the hot list/filter queries are answered from an index"""
+
+    def assertUsesIndex(self, queryset):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("reader", "testpass")
+        self.other = get_user_model().objects.create_user("other", "testpass")
+        self.post = Post.objects.create(author=self.user, content="Post")
+
+    def test_posts_by_author(self):
+        self.assertUsesIndex(
+            Post.objects.filter(author=self.user).order_by("-created_at", "-id")[:20]
+        )
+
+    def test_posts_latest(self):
+        self.assertUsesIndex(Post.objects.order_by("-created_at", "-id")[:20])
+
+    def test_comments_by_author(self):
+        self.assertUsesIndex(
+            Comment.objects.filter(author=self.user).order_by("-created_at", "-id")[:20]
+        )
+
+    def test_comments_by_post(self):
+        self.assertUsesIndex(
+            Comment.objects.filter(post=self.post).order_by("created_at")[:20]
+        )
+
+    def test_likes_by_user(self):
+        self.assertUsesIndex(Like.objects.filter(user=self.user).order_by("-id")[:20])
+
+    def test_like_exists(self):
+        self.assertUsesIndex(Like.objects.filter(user=self.user, post=self.post))
+
+    def test_follows_by_follower(self):
+        self.assertUsesIndex(
+            Follow.objects.filter(follower=self.user).order_by("-id")[:20]
+        )
+
+    def test_follow_exists(self):
+        self.assertUsesIndex(
+            Follow.objects.filter(follower=self.user, followed=self.other)
+        )
+
+
+@skipUnless(connection.vendor == "sqlite", "SQLite query plans")
+class SQLiteQueryPlanTests(QueryPlanMixin, TestCase):
+    def assertUsesIndex(self, queryset):
+        plan = queryset.explain()
+        table = queryset.model._meta.db_table
+        for line in plan.splitlines():
+            if table in line and ("SCAN" in line or "SEARCH" in line):
+                self.assertIn("USING", line, plan)
+        self.assertNotIn("USE TEMP B-TREE", plan)
+
+
+@skipUnless(connection.vendor == "postgresql", "PostgreSQL query plans")
+class PostgreSQLQueryPlanTests(QueryPlanMixin, TestCase):
+    def assertUsesIndex(self, queryset):
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = queryset.explain()
+        self.assertNotIn("Seq Scan", plan)
+        self.assertRegex(plan, r"Index (Only )?Scan|Bitmap Index Scan")
@@ -0,0 +1,86 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from features.models import Post, Comment
+from social_media_api import metrics
+
+POST_URL = reverse("features:post-list")
+COMMENT_URL = reverse("features:comment-list")
+LIKE_URL = reverse("features:like-list")
+
+
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("reader", "testpass")
+        self.other = get_user_model().objects.create_user("other", "testpass")
+        self.client.force_authenticate(self.user)
+
+    def test_second_read_is_served_from_cache(self):
+        Post.objects.create(author=self.user, content="Post")
+
+        first = self.client.get(POST_URL)
+        with self.assertNumQueries(0):
+            second = self.client.get(POST_URL)
+
+        self.assertEqual(first["X-Cache"], "MISS")
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(first.data, second.data)
+
+    def test_create_post_invalidates_lists(self):
+        self.client.get(POST_URL)
+        self.client.get(POST_URL, {"author": self.user.id})
+
+        self.client.post(POST_URL, {"content": "New post"})
+
+        res = self.client.get(POST_URL)
+        res_author = self.client.get(POST_URL, {"author": self.user.id})
+        self.assertEqual(res["X-Cache"], "MISS")
+        self.assertEqual(len(res.data["results"]), 1)
+        self.assertEqual(len(res_author.data["results"]), 1)
+
+    def test_filter_spellings_are_invalidated(self):
+        params = [{"author": ""}, {"author": f"0{self.user.id}"}]
+        for param in params:
+            self.client.get(POST_URL, param)
+
+        self.client.post(POST_URL, {"content": "New post"})
+
+        for param in params:
+            res = self.client.get(POST_URL, param)
+            self.assertEqual(res["X-Cache"], "MISS")
+            self.assertEqual(len(res.data["results"]), 1)
+
+    def test_like_invalidates_post_counters(self):
+        post = Post.objects.create(author=self.other, content="Post")
+        self.client.get(POST_URL)
+
+        self.client.post(LIKE_URL, {"post": post.id})
+
+        res = self.client.get(POST_URL)
+        self.assertEqual(res.data["results"][0]["likes_count"], 1)
+
+    def test_comment_invalidates_post_namespace(self):
+        post = Post.objects.create(author=self.other, content="Post")
+        self.client.get(COMMENT_URL, {"post": post.id})
+
+        self.client.post(COMMENT_URL, {"post": post.id, "content": "Comment"})
+
+        res = self.client.get(COMMENT_URL, {"post": post.id})
+        self.assertEqual(res["X-Cache"], "MISS")
+        self.assertEqual(
+            [item["id"] for item in res.data["results"]],
+            list(Comment.objects.values_list("id", flat=True)),
+        )
+
+    def test_hits_and_misses_are_counted(self):
+        self.client.get(POST_URL)
+        self.client.get(POST_URL)
+
+        counters = metrics.snapshot()
+        self.assertEqual(counters[("response_cache_hits", (("view", "posts"),))], 1)
+        self.assertEqual(counters[("response_cache_misses", (("view", "posts"),))], 1)
@@ -0,0 +1,94 @@
+import datetime
+import decimal
+import gzip
+import json
+import uuid
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from features.models import Post
+from social_media_api.renderers import ORJSONRenderer
+
+POST_URL = reverse("features:post-list")
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    def assertSameBytes(self, data, accepted_media_type=None, fallback=False):
+        expected = JSONRenderer().render(data, accepted_media_type)
+        with mock.patch.object(
+            JSONRenderer, "render", autospec=True, side_effect=JSONRenderer.render
+        ) as json_render:
+            rendered = ORJSONRenderer().render(data, accepted_media_type)
+        self.assertEqual(rendered, expected)
+        # Whether the document was handed to DRF's renderer instead of orjson
+        self.assertEqual(json_render.called, fallback)
+
+    def test_matches_the_json_renderer(self):
+        self.assertSameBytes(
+            {
+                "text": 'h\u00e9llo \u2028\u2029 "quoted" </script>',
+                "created_at": datetime.datetime(
+                    2024, 5, 1, 12, 30, 1, 123456, tzinfo=datetime.timezone.utc
+                ),
+                "date": datetime.date(2024, 5, 1),
+                "amount": decimal.Decimal("1.50"),
+                "id": uuid.UUID(int=1),
+                "lazy": gettext_lazy("Not found."),
+                "numbers": [1, -2, 0.1, 2.5, True, None],
+                1: "non string key",
+            }
+        )
+        self.assertSameBytes(None)
+        self.assertSameBytes([])
+
+    def test_integers_beyond_64_bits(self):
+        self.assertSameBytes({"big": 2**70, "small": -(2**70)}, fallback=True)
+
+    def test_floats_parse_to_the_same_values(self):
+        data = {"score": -3.2e-05, "trending_score": 1e20, "tiny": 1e-7}
+
+        rendered = ORJSONRenderer().render(data)
+
+        self.assertEqual(
+            rendered, b'{"score":-0.000032,"trending_score":1e20,"tiny":1e-7}'
+        )
+        self.assertEqual(json.loads(rendered), json.loads(JSONRenderer().render(data)))
+
+    def test_indented_output(self):
+        self.assertSameBytes({"a": [1, 2]}, "application/json; indent=4", fallback=True)
+
+
+class GZipTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("reader", "testpass")
+        self.client.force_authenticate(self.user)
+        Post.objects.bulk_create(
+            Post(author=self.user, content=f"Post {i} " * 20) for i in range(20)
+        )
+
+    def test_responses_are_compressed_when_accepted(self):
+        plain = self.client.get(POST_URL)
+        compressed = self.client.get(POST_URL, HTTP_ACCEPT_ENCODING="gzip")
+
+        self.assertNotIn("Content-Encoding", plain)
+        self.assertEqual(compressed["Content-Encoding"], "gzip")
+        self.assertLess(len(compressed.content), len(plain.content) / 4)
+        self.assertEqual(gzip.decompress(compressed.content), plain.content)
+
+    def test_conditional_gets_accept_the_weak_etag(self):
+        etag = self.client.get(POST_URL, HTTP_ACCEPT_ENCODING="gzip")["ETag"]
+        self.assertTrue(etag.startswith("W/"))
+
+        res = self.client.get(
+            POST_URL, HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(res.status_code, 304)
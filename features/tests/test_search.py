@@ -0,0 +1,123 @@
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from features.models import Post, Comment
+
+SEARCH_URL = reverse("features:search-list")
+
+
+@skipUnless(connection.vendor in ("sqlite", "postgresql"), "Full-text search")
+class SearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("reader", "testpass")
+        self.client.force_authenticate(self.user)
+
+    def search(self, q, **params):
+        return self.client.get(SEARCH_URL, {"q": q, **params})
+
+    def result_ids(self, res):
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [item["id"] for item in res.data["results"]]
+
+    def test_search_ranks_better_matches_first(self):
+        once = Post.objects.create(author=self.user, content="A quiet garden")
+        twice = Post.objects.create(
+            author=self.user, content="Garden tips for a garden party"
+        )
+        Post.objects.create(author=self.user, content="Nothing relevant")
+
+        res = self.search("garden")
+
+        self.assertEqual(self.result_ids(res), [twice.id, once.id])
+        self.assertLess(
+            res.data["results"][0]["score"], res.data["results"][1]["score"]
+        )
+
+    def test_index_follows_updates_and_deletes(self):
+        post = Post.objects.create(author=self.user, content="Old words")
+        bulk = Post.objects.bulk_create([Post(author=self.user, content="Bulk words")])
+
+        self.assertEqual(
+            sorted(self.result_ids(self.search("words"))), [post.id, bulk[0].id]
+        )
+
+        post.content = "Fresh text"
+        post.save()
+        bulk[0].delete()
+
+        self.assertEqual(self.result_ids(self.search("words")), [])
+        self.assertEqual(self.result_ids(self.search("fresh")), [post.id])
+
+    def test_search_comments(self):
+        post = Post.objects.create(author=self.user, content="Weather")
+        comment = Comment.objects.create(
+            author=self.user, post=post, content="Sunny weather today"
+        )
+
+        res = self.search("sunny", type="comment")
+
+        self.assertEqual(self.result_ids(res), [comment.id])
+        self.assertEqual(res.data["results"][0]["post"], post.id)
+
+    def test_snippet_marks_terms_and_escapes_content(self):
+        Post.objects.create(author=self.user, content="<b>Hello</b> world")
+
+        res = self.search("hello")
+
+        self.assertEqual(
+            res.data["results"][0]["snippet"],
+            "&lt;b&gt;<mark>Hello</mark>&lt;/b&gt; world",
+        )
+
+    def test_cursor_walks_all_matches(self):
+        posts = Post.objects.bulk_create(
+            [
+                Post(author=self.user, content="match " * (i % 3 + 1) + f"filler {i}")
+                for i in range(7)
+            ]
+        )
+
+        ids = []
+        res = self.search("match", page_size=3)
+        while True:
+            ids.extend(self.result_ids(res))
+            if res.data["next"] is None:
+                break
+            res = self.client.get(res.data["next"])
+
+        self.assertEqual(sorted(ids), sorted(post.id for post in posts))
+        self.assertEqual(len(ids), len(set(ids)))
+
+    @override_settings(SEARCH_MAX_CANDIDATES=2)
+    def test_only_recent_matches_are_ranked(self):
+        Post.objects.create(author=self.user, content="Garden garden garden")
+        older = Post.objects.create(author=self.user, content="A quiet garden")
+        newest = Post.objects.create(author=self.user, content="Garden tips garden")
+
+        res = self.search("garden")
+
+        self.assertEqual(self.result_ids(res), [newest.id, older.id])
+
+    def test_query_syntax_is_not_interpreted(self):
+        Post.objects.create(author=self.user, content="Cats AND dogs")
+
+        res = self.search('cats" OR NEAR(')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_invalid_requests(self):
+        self.assertEqual(self.search("").status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            self.search("x", type="like").status_code, status.HTTP_400_BAD_REQUEST
+        )
+        self.assertEqual(
+            self.search("x", cursor="WyJhIiwgMV0=").status_code,
+            status.HTTP_404_NOT_FOUND,
+        )
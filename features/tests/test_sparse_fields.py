@@ -0,0 +1,98 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from features.models import Post, Comment, Like, Follow
+
+POST_URL = reverse("features:post-list")
+COMMENT_URL = reverse("features:comment-list")
+LIKE_URL = reverse("features:like-list")
+FOLLOW_URL = reverse("features:follow-list")
+MUTUALS_URL = reverse("features:follow-mutuals")
+
+
+def post_detail_url(post_id):
+    return reverse("features:post-detail", args=[post_id])
+
+
+class SparseFieldsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("reader", "testpass")
+        self.other = get_user_model().objects.create_user("other", "testpass")
+        self.client.force_authenticate(self.user)
+        self.posts = [
+            Post.objects.create(author=self.other, content="x" * 1000) for _ in range(3)
+        ]
+
+    def get(self, url, params):
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(url, params)
+        return res, " ".join(query["sql"] for query in queries)
+
+    def test_only_the_requested_fields_are_rendered_and_selected(self):
+        res, sql = self.get(POST_URL, {"fields": "id,created_at"})
+
+        self.assertEqual(
+            [set(post) for post in res.data["results"]], [{"id", "created_at"}] * 3
+        )
+        self.assertNotIn('"content"', sql)
+        self.assertNotIn('"likes_count"', sql)
+
+    def test_pagination_keeps_working(self):
+        res, _ = self.get(POST_URL, {"fields": "content", "page_size": 2})
+        self.assertEqual(list(res.data["results"][0]), ["content"])
+
+        res = self.client.get(res.data["next"])
+        self.assertEqual(res.data["results"], [{"content": "x" * 1000}])
+
+    def test_expanded_relations_stay_whole(self):
+        res, _ = self.get(POST_URL, {"fields": "id", "expand": "author"})
+        self.assertEqual(list(res.data["results"][0]), ["id"])
+
+        res, sql = self.get(POST_URL, {"fields": "author", "expand": "author"})
+        self.assertEqual(
+            res.data["results"][0],
+            {
+                "author": {
+                    "id": self.other.id,
+                    "username": "other",
+                    "profile_picture": None,
+                }
+            },
+        )
+        self.assertNotIn('"content"', sql)
+
+    def test_unknown_fields_are_ignored(self):
+        res = self.client.get(post_detail_url(self.posts[0].id), {"fields": "id,nope"})
+        self.assertEqual(res.data, {"id": self.posts[0].id})
+
+    def test_other_serializers(self):
+        Comment.objects.create(author=self.user, post=self.posts[0], content="Reply")
+        like = Like.objects.create(user=self.user, post=self.posts[0])
+        Follow.objects.create(follower=self.user, followed=self.other)
+        Follow.objects.create(follower=self.other, followed=self.user)
+
+        cases = [
+            (COMMENT_URL, "post", {"post": self.posts[0].id}),
+            (LIKE_URL, "id", {"id": like.id}),
+            (FOLLOW_URL, "followed", {"followed": self.user.id}),
+        ]
+        for url, fields, expected in cases:
+            res = self.client.get(url, {"fields": fields})
+            self.assertEqual(res.data["results"][0], expected)
+
+        res = self.client.get(MUTUALS_URL, {"fields": "username"})
+        self.assertEqual(res.data, [{"username": "other"}])
+
+    def test_writes_render_every_field(self):
+        res = self.client.post(
+            f"{POST_URL}?fields=id", {"content": "New"}, format="json"
+        )
+        self.assertEqual(res.data["content"], "New")
+        self.assertIn("likes_count", res.data)
@@ -0,0 +1,76 @@
+import random
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db.models import Count, F
+from django.test import TestCase
+
+from features.models import Post, Comment, Like, Follow
+from features.synthetic import PASSWORD, power_law_rank
+from user.models import UserProfile
+
+
+class SeedSyntheticTests(TestCase):
+    def seed(self, **options):
+        options = {
+            "users": 200,
+            "posts": 500,
+            "comments": 300,
+            "likes": 1000,
+            "follows": 10,
+            "batch_size": 100,
+            **options,
+        }
+        call_command("seed_synthetic", stdout=StringIO(), **options)
+
+    def test_creates_rows_in_batches(self):
+        self.seed()
+
+        self.assertEqual(get_user_model().objects.count(), 200)
+        self.assertEqual(UserProfile.objects.count(), 200)
+        self.assertEqual(Post.objects.count(), 500)
+        self.assertEqual(Comment.objects.count(), 300)
+        self.assertGreater(Like.objects.count(), 0)
+        self.assertFalse(Follow.objects.filter(follower=F("followed")).exists())
+        self.assertTrue(
+            get_user_model().objects.first().check_password(PASSWORD),
+        )
+
+    def test_counters_match_rows(self):
+        self.seed()
+
+        post = Post.objects.annotate(likes=Count("like")).order_by("-likes").first()
+        self.assertEqual(post.likes_count, post.likes)
+        profile = UserProfile.objects.order_by("-followers_count").first()
+        self.assertEqual(
+            profile.followers_count,
+            Follow.objects.filter(followed_id=profile.user_id).count(),
+        )
+
+    def test_follower_counts_are_skewed(self):
+        self.seed()
+
+        counts = sorted(
+            UserProfile.objects.values_list("followers_count", flat=True),
+            reverse=True,
+        )
+        self.assertGreater(counts[0], 10 * counts[len(counts) // 2])
+
+    def test_seed_is_reproducible(self):
+        self.seed(seed=7, prefix="first")
+        first = list(Post.objects.order_by("id").values_list("content", flat=True))
+        Post.objects.all().delete()
+
+        self.seed(seed=7, prefix="second")
+        second = list(Post.objects.order_by("id").values_list("content", flat=True))
+
+        self.assertEqual(first, second)
+
+    def test_power_law_rank(self):
+        rng = random.Random(0)
+        for alpha in (0.8, 1.0, 1.5):
+            ranks = [power_law_rank(rng, 100, alpha) for _ in range(10_000)]
+            self.assertEqual(min(ranks), 0)
+            self.assertLessEqual(max(ranks), 99)
+            self.assertGreater(ranks.count(0), ranks.count(50) * 5)
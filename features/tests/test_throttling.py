@@ -0,0 +1,137 @@
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import AsyncRequestFactory, TestCase, override_settings
+from django.urls import resolve, reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from features.async_views import async_read_view
+from social_media_api import metrics
+from social_media_api.throttling import (
+    LocalTokenBucketStore,
+    RedisTokenBucketStore,
+)
+
+POST_URL = reverse("features:post-list")
+REGISTER_URL = reverse("user:create")
+
+RATES = {"read": "3/min", "write": "2/min", "auth": "2/min"}
+
+
+class TokenBucketStoreMixin:
+    def get_store(self):
+        raise NotImplementedError
+
+    def test_bucket(self):
+        store = self.get_store()
+        key = "throttle:test:bucket"
+
+        self.assertEqual([store.consume(key, 2, 1 / 30) for _ in range(2)], [0, 0])
+        self.assertAlmostEqual(store.consume(key, 2, 1 / 30), 30, delta=1)
+        self.assertEqual(store.consume("throttle:test:other", 2, 1 / 30), 0)
+
+
+class LocalTokenBucketStoreTests(TokenBucketStoreMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def get_store(self):
+        return LocalTokenBucketStore()
+
+    def test_refill(self):
+        store = self.get_store()
+        with mock.patch("time.time", return_value=1000.0):
+            store.consume("key", 2, 1)
+            store.consume("key", 2, 1)
+            self.assertEqual(store.consume("key", 2, 1), 1)
+        with mock.patch("time.time", return_value=1001.5):
+            self.assertEqual(store.consume("key", 2, 1), 0)
+
+
+@skipUnless(settings.REDIS_URL, "Redis token buckets")
+class RedisTokenBucketStoreTests(TokenBucketStoreMixin, TestCase):
+    def get_store(self):
+        store = RedisTokenBucketStore()
+        store.script.registered_client.delete(
+            "throttle:test:bucket", "throttle:test:other"
+        )
+        return store
+
+
+@override_settings(THROTTLE_RATES=RATES)
+class ThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user("writer", "testpass")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_post(self, client=None):
+        return (client or self.client).post(POST_URL, {"content": "Post"})
+
+    def test_write_scope_is_limited_per_user(self):
+        self.create_post()
+        self.create_post()
+        res = self.create_post()
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(res["Retry-After"], "30")
+
+        other = APIClient()
+        other.force_authenticate(get_user_model().objects.create_user("other", "x"))
+        self.assertEqual(self.create_post(other).status_code, status.HTTP_201_CREATED)
+
+    def test_read_scope_is_separate(self):
+        for _ in range(3):
+            self.create_post()
+
+        self.assertEqual(self.client.get(POST_URL).status_code, status.HTTP_200_OK)
+
+    def test_rejections_are_counted(self):
+        for _ in range(4):
+            self.create_post()
+
+        counters = metrics.snapshot()
+        self.assertEqual(counters[("throttle_rejected", (("scope", "write"),))], 2)
+
+    def test_anonymous_clients_are_limited_by_ip(self):
+        def register(username, ip):
+            return APIClient().post(
+                REGISTER_URL,
+                {"username": username, "password": "testpass123"},
+                REMOTE_ADDR=ip,
+            )
+
+        register("first", "10.0.0.1")
+        register("second", "10.0.0.1")
+
+        self.assertEqual(
+            register("third", "10.0.0.1").status_code,
+            status.HTTP_429_TOO_MANY_REQUESTS,
+        )
+        self.assertEqual(
+            register("fourth", "10.0.0.2").status_code, status.HTTP_201_CREATED
+        )
+
+    @override_settings(THROTTLE_RATES={**RATES, "write": ""})
+    def test_empty_rate_disables_scope(self):
+        for _ in range(3):
+            self.assertEqual(self.create_post().status_code, status.HTTP_201_CREATED)
+
+    async def test_async_read_path(self):
+        token = str(AccessToken.for_user(self.user))
+        request = AsyncRequestFactory().get(
+            POST_URL, headers={"Authorization": f"Bearer {token}"}
+        )
+        view = async_read_view(resolve(POST_URL).func)
+
+        statuses = [(await view(request)).status_code for _ in range(3)]
+        res = await view(request)
+
+        self.assertEqual(statuses, [status.HTTP_200_OK] * 3)
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(res["Retry-After"], "20")
@@ -0,0 +1,204 @@
+from datetime import timedelta
+from unittest import skipUnless
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from features import trending
+from features.models import Post, Comment, Like
+from features.tasks import rebuild_trending
+
+TRENDING_URL = reverse("features:trending-list")
+LIKE_URL = reverse("features:like-list")
+COMMENT_URL = reverse("features:comment-list")
+HOUR = 60 * 60
+
+
+def post_like_url(post_id):
+    return reverse("features:post-like", args=[post_id])
+
+
+class TrendingBackendMixin:
+    def get_backend(self):
+        raise NotImplementedError
+
+    def test_ranking(self):
+        backend = self.get_backend()
+        backend.replace(1000, {1: 4.0, 2: 1.0})
+        backend.add(2, 1000, 2)
+        backend.add(3, 1000 + HOUR, 1)
+        backend.discard(1)
+
+        self.assertEqual(backend.top(0, 10), (1000, [(2, 3.0), (3, 2.0)]))
+        self.assertEqual(backend.top(1, 1), (1000, [(3, 2.0)]))
+
+    def test_replace_moves_the_epoch(self):
+        backend = self.get_backend()
+        backend.replace(1000, {1: 1.0})
+        backend.replace(1000 + HOUR, {2: 1.0})
+        backend.add(3, 1000 + HOUR, 2)
+
+        self.assertEqual(backend.top(0, 10), (1000 + HOUR, [(3, 2.0), (2, 1.0)]))
+
+
+@override_settings(TRENDING_HALF_LIFE=HOUR)
+class LocalTrendingBackendTests(TrendingBackendMixin, TestCase):
+    def get_backend(self):
+        return trending.LocalTrendingBackend()
+
+
+@skipUnless(settings.REDIS_URL, "Redis trending backend")
+@override_settings(TRENDING_HALF_LIFE=HOUR)
+class RedisTrendingBackendTests(TrendingBackendMixin, TestCase):
+    def get_backend(self):
+        backend = trending.RedisTrendingBackend()
+        keys = list(backend.client.scan_iter("trending:*"))
+        if keys:
+            backend.client.delete(*keys)
+        return backend
+
+
+@override_settings(
+    TRENDING_BACKEND="features.trending.LocalTrendingBackend",
+    TRENDING_HALF_LIFE=HOUR,
+    TRENDING_WINDOW=24 * HOUR,
+    TRENDING_COMMENT_WEIGHT=2,
+)
+class TrendingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        trending.get_trending_backend().clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("user", "testpass")
+        self.client.force_authenticate(self.user)
+        self.others = [
+            get_user_model().objects.create_user(f"other{i}", "testpass")
+            for i in range(3)
+        ]
+        self.posts = [
+            Post.objects.create(author=self.user, content=f"Post {i}") for i in range(3)
+        ]
+
+    def age(self, post, hours):
+        post.created_at = timezone.now() - timedelta(hours=hours)
+        Post.objects.filter(pk=post.pk).update(created_at=post.created_at)
+
+    def engage(self, post, likes=0, comments=0):
+        """Likes and comments on ``post`` with its counters kept in step"""
+        for user in self.others[:likes]:
+            Like.objects.create(user=user, post=post)
+        for _ in range(comments):
+            Comment.objects.create(author=self.user, post=post, content="Reply")
+        Post.objects.filter(pk=post.pk).update(
+            likes_count=likes, comments_count=comments
+        )
+
+    def ranking(self):
+        return [post_id for post_id, _ in trending.trending(limit=100)]
+
+    def test_likes_and_comments_update_the_ranking(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                f"{LIKE_URL}bulk/",
+                [{"post": self.posts[0].id}, {"post": self.posts[2].id}],
+                format="json",
+            )
+            self.client.post(COMMENT_URL, {"post": self.posts[1].id, "content": "Hi"})
+            self.client.force_authenticate(self.others[0])
+            self.client.post(LIKE_URL, {"post": self.posts[0].id})
+            self.client.post(LIKE_URL, {"post": self.posts[1].id})
+
+        scores = trending.trending()
+        self.assertEqual(
+            [post_id for post_id, _ in scores],
+            [self.posts[1].id, self.posts[0].id, self.posts[2].id],
+        )
+        for (_, score), expected in zip(scores, [3, 2, 1]):
+            self.assertAlmostEqual(score, expected, places=2)
+
+    def test_toggling_a_like(self):
+        post = self.posts[0]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.put(post_like_url(post.id))
+            self.client.put(post_like_url(post.id))
+        self.assertAlmostEqual(dict(trending.trending())[post.id], 1, places=2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(post_like_url(post.id))
+        self.assertAlmostEqual(dict(trending.trending())[post.id], 0, places=6)
+
+    def test_scores_halve_every_half_life(self):
+        old, new, _ = self.posts
+        self.age(old, 2)
+        self.engage(old, likes=3)
+        self.engage(new, likes=1)
+
+        self.assertEqual(rebuild_trending(), 2)
+
+        scores = dict(trending.trending())
+        self.assertEqual(list(scores), [new.id, old.id])
+        self.assertAlmostEqual(scores[new.id], 1, places=2)
+        self.assertAlmostEqual(scores[old.id], 3 / 4, places=2)
+
+    def test_increments_after_a_rebuild(self):
+        old, new, _ = self.posts
+        self.age(old, 1)
+        self.engage(old, likes=2)
+        rebuild_trending()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.put(post_like_url(old.id))
+            self.client.put(post_like_url(new.id))
+
+        scores = dict(trending.trending())
+        self.assertAlmostEqual(scores[old.id], 3 / 2, places=2)
+        self.assertAlmostEqual(scores[new.id], 1, places=2)
+
+    @override_settings(TRENDING_MAX_SIZE=1)
+    def test_rebuild_keeps_the_window_and_the_top(self):
+        expired, low, high = self.posts
+        self.age(expired, 25)
+        self.engage(expired, likes=3)
+        self.engage(low, likes=1)
+        self.engage(high, comments=1)
+
+        self.assertEqual(rebuild_trending(), 1)
+        self.assertEqual(self.ranking(), [high.id])
+
+    def test_deleted_posts_are_discarded(self):
+        self.engage(self.posts[0], likes=1)
+        self.engage(self.posts[1], likes=2)
+        rebuild_trending()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.posts[1].delete()
+        self.assertEqual(self.ranking(), [self.posts[0].id])
+
+    def test_list(self):
+        for likes, post in enumerate(self.posts, start=1):
+            self.engage(post, likes=likes)
+        rebuild_trending()
+
+        res = self.client.get(TRENDING_URL, {"limit": 2, "expand": "author"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [post["id"] for post in res.data], [self.posts[2].id, self.posts[1].id]
+        )
+        self.assertAlmostEqual(res.data[0]["trending_score"], 3, places=2)
+        self.assertEqual(res.data[0]["author"]["username"], "user")
+
+    def test_list_is_empty_before_any_engagement(self):
+        res = self.client.get(TRENDING_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, [])
+
+    def test_list_requires_authentication(self):
+        res = APIClient().get(TRENDING_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
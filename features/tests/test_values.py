@@ -0,0 +1,83 @@
+from datetime import datetime, timezone
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from features.models import Post, Comment, Like, Follow
+from features.serializers import PostSerializer
+from features.values import ValuesListMixin, PostValuesSerializer
+
+POST_URL = reverse("features:post-list")
+FEED_URL = reverse("features:feed-list")
+COMMENT_URL = reverse("features:comment-list")
+LIKE_URL = reverse("features:like-list")
+FOLLOW_URL = reverse("features:follow-list")
+
+
+@override_settings(RESPONSE_CACHE_TTL=0)
+class ValuesSerializerTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("reader", "testpass")
+        self.other = get_user_model().objects.create_user("other", "testpass")
+        self.client.force_authenticate(self.user)
+        Follow.objects.create(follower=self.user, followed=self.other)
+        Follow.objects.create(follower=self.other, followed=self.user)
+        for i in range(5):
+            post = Post.objects.create(
+                author=self.other, content=f"Post {i} \u2028 \u00e9", likes_count=i
+            )
+            Comment.objects.create(author=self.user, post=post, content=f"Reply {i}")
+            Like.objects.create(user=self.user, post=post)
+        # Whole seconds render without a fraction
+        Post.objects.filter(pk=post.pk).update(
+            created_at=datetime(2024, 5, 1, 12, tzinfo=timezone.utc)
+        )
+
+    def assertSameOutput(self, url, params=None):
+        fast = self.client.get(url, params)
+        with mock.patch.object(
+            ValuesListMixin, "get_values_serializer", return_value=None
+        ):
+            slow = self.client.get(url, params)
+        self.assertEqual(fast.status_code, 200)
+        self.assertEqual(fast.content, slow.content)
+        return fast
+
+    def test_lists_render_the_same_bytes(self):
+        for url in (POST_URL, FEED_URL, COMMENT_URL, LIKE_URL, FOLLOW_URL):
+            self.assertSameOutput(url)
+
+    def test_filters_fields_and_pages(self):
+        self.assertSameOutput(POST_URL, {"author": self.other.id})
+        self.assertSameOutput(COMMENT_URL, {"fields": "content,post"})
+        self.assertSameOutput(FOLLOW_URL, {"fields": "id,nope"})
+
+        first = self.assertSameOutput(POST_URL, {"page_size": 2})
+        res = self.assertSameOutput(first.data["next"])
+        self.assertEqual(len(res.data["results"]), 2)
+
+    @override_settings(TIME_ZONE="America/New_York")
+    def test_current_timezone(self):
+        res = self.assertSameOutput(POST_URL)
+        self.assertEqual(
+            res.data["results"][-1]["created_at"], "2024-05-01T08:00:00-04:00"
+        )
+
+    def test_expanded_pages_use_the_model_serializer(self):
+        res = self.client.get(POST_URL, {"expand": "author"})
+        self.assertEqual(res.data["results"][0]["author"]["username"], "other")
+
+    def test_matches_the_model_serializer(self):
+        posts = Post.objects.order_by("-created_at", "-id")
+        serializer = PostValuesSerializer()
+
+        self.assertEqual(
+            serializer.to_representation(serializer.values(posts)),
+            PostSerializer(posts, many=True).data,
+        )
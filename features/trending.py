@@ -0,0 +1,203 @@
+"""Trending posts ranked by time-decayed engagement.
+
+A post's score is its engagement, ``likes + TRENDING_COMMENT_WEIGHT *
+comments``, halved for every ``TRENDING_HALF_LIFE`` seconds of age since
+``created_at``. Multiplying every score by the same factor keeps the
+order, so the ranking stores ``engagement * 2 ** ((created_at - epoch) /
+half_life)``. The stored value never has to be decayed again: a like or
+comment adds its weight times the post's factor to the score, and reads
+are a range over scores kept sorted.
+
+The factor grows with time since ``epoch``. ``rebuild()``, run
+periodically by Celery beat, recomputes the ranking from the posts'
+counters with the epoch moved to the start of ``TRENDING_WINDOW``. It
+also drops posts older than the window and keeps at most
+``TRENDING_MAX_SIZE`` posts.
+"""
+
+import bisect
+import threading
+import time
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from features.models import Post
+from social_media_api.redis_client import get_redis_client
+
+INCREMENT_SCRIPT = """
+local epoch = redis.call('GET', KEYS[1])
+if not epoch then
+    epoch = ARGV[4]
+    redis.call('SET', KEYS[1], epoch)
+end
+local factor = math.pow(2, (tonumber(ARGV[2]) - tonumber(epoch)) / tonumber(ARGV[5]))
+redis.call('ZINCRBY', 'trending:' .. epoch, tonumber(ARGV[3]) * factor, ARGV[1])
+"""
+
+
+def _factor(created_at, epoch):
+    return 2 ** ((created_at - epoch) / settings.TRENDING_HALF_LIFE)
+
+
+class RedisTrendingBackend:
+    """Scores in a sorted set named after their epoch"""
+
+    epoch_key = "trending:epoch"
+
+    def __init__(self):
+        self.client = get_redis_client()
+        self.increment = self.client.register_script(INCREMENT_SCRIPT)
+
+    def add(self, post_id, created_at, weight):
+        self.increment(
+            keys=[self.epoch_key],
+            args=[
+                post_id,
+                created_at,
+                weight,
+                int(time.time() - settings.TRENDING_WINDOW),
+                settings.TRENDING_HALF_LIFE,
+            ],
+        )
+
+    def top(self, offset, limit):
+        epoch = self.client.get(self.epoch_key)
+        if epoch is None:
+            return None, []
+        members = self.client.zrevrange(
+            f"trending:{int(epoch)}", offset, offset + limit - 1, withscores=True
+        )
+        return int(epoch), [(int(member), score) for member, score in members]
+
+    def discard(self, post_id):
+        epoch = self.client.get(self.epoch_key)
+        if epoch is not None:
+            self.client.zrem(f"trending:{int(epoch)}", post_id)
+
+    def replace(self, epoch, scores):
+        key = f"trending:{epoch}"
+        previous = self.client.get(self.epoch_key)
+        with self.client.pipeline() as pipe:
+            pipe.delete(key)
+            if scores:
+                pipe.zadd(key, scores)
+            pipe.set(self.epoch_key, epoch)
+            if previous is not None and int(previous) != epoch:
+                pipe.delete(f"trending:{int(previous)}")
+            pipe.execute()
+
+
+class LocalTrendingBackend:
+    """In-process scores with a sorted list for tests and development"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        self.epoch = None
+        self.scores = {}
+        # (-score, post_id), so the highest score comes first
+        self.ranking = []
+
+    def _set(self, post_id, score):
+        old = self.scores.pop(post_id, None)
+        if old is not None:
+            del self.ranking[bisect.bisect_left(self.ranking, (-old, post_id))]
+        if score is not None:
+            self.scores[post_id] = score
+            bisect.insort(self.ranking, (-score, post_id))
+
+    def add(self, post_id, created_at, weight):
+        with self.lock:
+            if self.epoch is None:
+                self.epoch = int(time.time() - settings.TRENDING_WINDOW)
+            increment = weight * _factor(created_at, self.epoch)
+            self._set(post_id, self.scores.get(post_id, 0) + increment)
+
+    def top(self, offset, limit):
+        with self.lock:
+            return self.epoch, [
+                (post_id, -score)
+                for score, post_id in self.ranking[offset : offset + limit]
+            ]
+
+    def discard(self, post_id):
+        with self.lock:
+            self._set(post_id, None)
+
+    def replace(self, epoch, scores):
+        with self.lock:
+            self.epoch = epoch
+            self.scores = dict(scores)
+            self.ranking = sorted(
+                (-score, post_id) for post_id, score in scores.items()
+            )
+
+
+@lru_cache(maxsize=None)
+def _backend(path):
+    return import_string(path)()
+
+
+def get_trending_backend():
+    return _backend(settings.TRENDING_BACKEND)
+
+
+def record_engagement(post_id, created_at, weight):
+    """Add ``weight`` to a post's score once the transaction commits"""
+    created_at = created_at.timestamp()
+    transaction.on_commit(
+        lambda: get_trending_backend().add(post_id, created_at, weight)
+    )
+
+
+def record_likes(post_id, created_at, count=1):
+    record_engagement(post_id, created_at, count)
+
+
+def record_comments(post_id, created_at, count=1):
+    record_engagement(post_id, created_at, count * settings.TRENDING_COMMENT_WEIGHT)
+
+
+def discard(post_id):
+    transaction.on_commit(lambda: get_trending_backend().discard(post_id))
+
+
+def trending(offset=0, limit=20):
+    """``[(post_id, score)]`` ranked by the score decayed to now"""
+    epoch, ranked = get_trending_backend().top(offset, limit)
+    if epoch is None:
+        return []
+    decay = _factor(epoch, time.time())
+    return [(post_id, score * decay) for post_id, score in ranked]
+
+
+def rebuild():
+    """Recompute the ranking from the posts' like and comment counters"""
+    now = time.time()
+    epoch = int(now - settings.TRENDING_WINDOW)
+    posts = (
+        Post.objects.filter(
+            created_at__gte=timezone.now()
+            - timezone.timedelta(seconds=settings.TRENDING_WINDOW)
+        )
+        .values_list("id", "created_at", "likes_count", "comments_count")
+        .iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+    )
+    scores = {}
+    for post_id, created_at, likes, comments in posts:
+        engagement = likes + comments * settings.TRENDING_COMMENT_WEIGHT
+        if engagement > 0:
+            scores[post_id] = engagement * _factor(created_at.timestamp(), epoch)
+    if len(scores) > settings.TRENDING_MAX_SIZE:
+        kept = sorted(scores, key=scores.get, reverse=True)
+        scores = {
+            post_id: scores[post_id] for post_id in kept[: settings.TRENDING_MAX_SIZE]
+        }
+    get_trending_backend().replace(epoch, scores)
+    return len(scores)
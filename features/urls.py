@@ -1,7 +1,19 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework import routers
 
-from features.views import PostViewSet, CommentViewSet, LikeViewSet, FollowViewSet
+from features.async_views import async_read_urls
+from features.views import (
+    PostViewSet,
+    CommentViewSet,
+    LikeViewSet,
+    FollowViewSet,
+    FeedViewSet,
+    SearchViewSet,
+    TrendingViewSet,
+    NotificationViewSet,
+    ExportView,
+)
 
 router = routers.DefaultRouter()
 
@@ -9,8 +21,19 @@ router.register("post", PostViewSet)
 router.register("comment", CommentViewSet)
 router.register("like", LikeViewSet)
 router.register("follow", FollowViewSet)
+router.register("feed", FeedViewSet, basename="feed")
+router.register("search", SearchViewSet, basename="search")
+router.register("trending", TrendingViewSet, basename="trending")
+router.register("notification", NotificationViewSet, basename="notification")
 
 
-urlpatterns = [path("", include(router.urls))]
+router_urls = router.urls
+if settings.ASYNC_READ_PATH:
+    router_urls = async_read_urls(router_urls)
+
+urlpatterns = [
+    path("export/", ExportView.as_view(), name="export"),
+    path("", include(router_urls)),
+]
 
 app_name = "features"
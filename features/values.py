@@ -0,0 +1,119 @@
+"""Read-only serializers over ``.values()`` rows for the list endpoints.
+
+Rendering a page through ``ModelSerializer`` costs a model instance per
+row and a field object call per value, which dominates ``list`` once the
+query itself is fast. The ``*ValuesSerializer`` classes build the same
+dicts straight from ``.values()`` rows: the columns are named after the
+serializer's fields (foreign keys give their ids, as the
+``PrimaryKeyRelatedField`` would), so only datetimes need converting. The
+output is identical to the DRF serializer they stand in for, including
+``?fields=``, and the views keep that serializer as ``serializer_class``
+so the schema does not change. Pages with ``?expand=`` go through the DRF
+serializer.
+"""
+
+from django.conf import settings
+from rest_framework import ISO_8601, serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from features.serializers import (
+    get_expanded_fields,
+    get_requested_fields,
+    PostSerializer,
+    CommentSerializer,
+    LikeSerializer,
+    FollowSerializer,
+)
+
+
+def datetime_formatter():
+    """``DateTimeField.to_representation`` with the setting lookups hoisted"""
+    field = serializers.DateTimeField()
+    if not settings.USE_TZ or api_settings.DATETIME_FORMAT.lower() != ISO_8601:
+        return field.to_representation
+    tz = field.default_timezone()
+
+    def format_datetime(value):
+        if value is None or value.tzinfo is None:
+            return field.to_representation(value)
+        value = value.astimezone(tz).isoformat()
+        if value.endswith("+00:00"):
+            value = value[:-6] + "Z"
+        return value
+
+    return format_datetime
+
+
+class ValuesSerializer:
+    serializer_class = None
+    datetime_fields = ("created_at",)
+
+    def __init__(self, request=None):
+        names = self.serializer_class.Meta.fields
+        requested = get_requested_fields(request)
+        if requested is not None:
+            names = [name for name in names if name in requested]
+        self.fields = names
+
+    def values(self, queryset, extra=()):
+        """``queryset`` as rows of the serialized fields plus ``extra``"""
+        return queryset.values(*dict.fromkeys([*self.fields, *extra]))
+
+    def to_representation(self, rows):
+        names = self.fields
+        converted = [name for name in names if name in self.datetime_fields]
+        if not converted:
+            return [{name: row[name] for name in names} for row in rows]
+
+        format_datetime = datetime_formatter()
+        data = []
+        for row in rows:
+            item = {name: row[name] for name in names}
+            for name in converted:
+                item[name] = format_datetime(item[name])
+            data.append(item)
+        return data
+
+
+class PostValuesSerializer(ValuesSerializer):
+    serializer_class = PostSerializer
+
+
+class CommentValuesSerializer(ValuesSerializer):
+    serializer_class = CommentSerializer
+
+
+class LikeValuesSerializer(ValuesSerializer):
+    serializer_class = LikeSerializer
+    datetime_fields = ()
+
+
+class FollowValuesSerializer(ValuesSerializer):
+    serializer_class = FollowSerializer
+    datetime_fields = ()
+
+
+# Serves ``list`` through ``values_serializer_class`` unless relations are
+# expanded. Runs inside the response cache and conditional GET mixins.
+class ValuesListMixin:
+    values_serializer_class = None
+
+    def get_values_serializer(self):
+        expandable = getattr(self.get_serializer_class(), "expandable_fields", {})
+        if expandable.keys() & get_expanded_fields(self.request):
+            return None
+        return self.values_serializer_class(self.request)
+
+    def list(self, request, *args, **kwargs):
+        serializer = self.get_values_serializer()
+        if serializer is None:
+            return super().list(request, *args, **kwargs)
+
+        ordering = [field.lstrip("-") for field in self.ordering]
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = serializer.values(queryset, ordering)
+        page = self.paginate_queryset(rows)
+        if page is None:
+            return Response(serializer.to_representation(rows))
+        return self.get_paginated_response(serializer.to_representation(page))
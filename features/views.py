@@ -1,30 +1,160 @@
+from collections import Counter
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from drf_spectacular.utils import extend_schema, OpenApiParameter
+from django.db import transaction
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter
 from rest_framework import mixins, viewsets, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
+from rest_framework.views import APIView
 
-from features.models import Post, Comment, Like, Follow
+from features.bulk import BulkCreateMixin, bulk_create_schema
+from features.cache import (
+    CachedListMixin,
+    ConditionalListMixin,
+    invalidate,
+    post_namespaces,
+    comment_namespaces,
+)
+from features.counters import change_post_counter, recompute_post_counters
+from features.export import (
+    NDJSONRenderer,
+    async_chunks,
+    export_ndjson,
+    gzip_stream,
+)
+from features.feed import fan_out_post, fan_out_posts, home_timeline
+from features.follows import delete_follow, follow_users, unfollow_users
+from features import graph
+from features.likes import like_post, unlike_post
+from features.models import Post, Comment, Like, Follow, Notification
+from features.notifications import mark_read, unread_count
+from features.pagination import SearchPagination, TimelinePagination
+from features.search import SearchResults
+from features import trending
+from features.tasks import notify
 from features.serializers import (
+    get_expanded_fields,
+    get_requested_fields,
     PostSerializer,
     CommentSerializer,
+    PostSearchSerializer,
+    CommentSearchSerializer,
+    UserSummarySerializer,
+    LikeStateSerializer,
+    FollowStatusSerializer,
+    FollowSuggestionSerializer,
+    FollowUsersSerializer,
+    FollowedUsersSerializer,
     LikeSerializer,
     FollowSerializer,
+    TrendingPostSerializer,
+    NotificationSerializer,
+    UnreadCountSerializer,
+    MarkReadSerializer,
 )
+from features.values import (
+    ValuesListMixin,
+    PostValuesSerializer,
+    CommentValuesSerializer,
+    LikeValuesSerializer,
+    FollowValuesSerializer,
+)
+
+
+def select_expanded(queryset, request, related):
+    """Join the relations behind the fields listed in ``?expand=``"""
+    expanded = get_expanded_fields(request)
+    paths = [path for name, path in related.items() if name in expanded]
+    return queryset.select_related(*paths) if paths else queryset
+
+
+def select_fields(queryset, request, ordering=()):
+    """Load only the columns behind the fields listed in ``?fields=``"""
+    requested = get_requested_fields(request)
+    if requested is None:
+        return queryset
+    names = requested & {field.name for field in queryset.model._meta.concrete_fields}
+    # Relations joined for ``?expand=`` and the pagination keys stay loaded
+    if isinstance(queryset.query.select_related, dict):
+        names.update(queryset.query.select_related)
+    names.update(field.lstrip("-") for field in ordering)
+    return queryset.only("pk", *names)
+
+
+EXPAND_PARAMETER = OpenApiParameter(
+    name="expand",
+    description="Comma separated relations to embed (author, post)",
+    required=False,
+    type=str,
+)
+
+FIELDS_PARAMETER = OpenApiParameter(
+    name="fields",
+    description="Comma separated fields to include, all by default",
+    required=False,
+    type=str,
+)
+
+LIMIT_PARAMETER = OpenApiParameter(
+    name="limit",
+    description="Number of users to return (default 20, max 100)",
+    required=False,
+    type=int,
+)
+
+
+def get_limit(request):
+    """``?limit=`` clamped to 1-100, 20 when missing or not a number"""
+    try:
+        limit = int(request.query_params["limit"])
+    except (KeyError, ValueError):
+        return 20
+    return min(max(limit, 1), 100)
 
 
+@extend_schema_view(bulk=bulk_create_schema(PostSerializer))
 class PostViewSet(
+    BulkCreateMixin,
+    ConditionalListMixin,
+    CachedListMixin,
+    ValuesListMixin,
     mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
     mixins.CreateModelMixin,
     viewsets.GenericViewSet,
 ):
     queryset = Post.objects.all()
     serializer_class = PostSerializer
+    values_serializer_class = PostValuesSerializer
     permission_classes = [IsAuthenticated]
+    ordering = ["-created_at", "-id"]
     filterset_fields = ["author"]
+    cache_namespace = "posts"
+    cache_filter_fields = ["author"]
+
+    def get_queryset(self):
+        queryset = select_expanded(
+            super().get_queryset(), self.request, {"author": "author__userprofile"}
+        )
+        return select_fields(queryset, self.request, self.ordering)
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user)
+        post = serializer.save(author=self.request.user)
+        fan_out_post(post)
+
+    def perform_bulk_create(self, serializer):
+        posts = serializer.save(author=self.request.user)
+        fan_out_posts(posts)
+        invalidate(*post_namespaces(self.request.user.id))
 
     @extend_schema(
         parameters=[
@@ -34,25 +164,115 @@ class PostViewSet(
                 required=False,
                 type=str,
             ),
+            EXPAND_PARAMETER,
+            FIELDS_PARAMETER,
         ]
     )
     def list(self, request):
         """List posts with filter by author"""
         return super().list(request)
 
+    @extend_schema(
+        methods=["PUT"],
+        request=None,
+        responses=LikeStateSerializer,
+        description="Like a post; liking it again changes nothing",
+    )
+    @extend_schema(
+        methods=["DELETE"],
+        request=None,
+        responses=LikeStateSerializer,
+        description="Remove your like from a post, if any",
+    )
+    @action(detail=True, methods=["put", "delete"])
+    def like(self, request, pk=None):
+        if not str(pk).isdigit():
+            raise NotFound()
+        toggle = like_post if request.method == "PUT" else unlike_post
+        result = toggle(request.user.id, int(pk))
+        if result is None:
+            raise NotFound()
+        if request.method == "PUT" and result[0]:
+            notify([(Notification.Verb.LIKE, request.user.id, int(pk))])
+        return Response({"liked": request.method == "PUT", "likes_count": result[1]})
+
+
+class FeedViewSet(ValuesListMixin, mixins.ListModelMixin, viewsets.GenericViewSet):
+    serializer_class = PostSerializer
+    values_serializer_class = PostValuesSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = TimelinePagination
+    ordering = ["-created_at", "-id"]
+
+    def get_queryset(self):
+        if getattr(self, "swagger_fake_view", False):
+            return Post.objects.none()
+        position, limit = self.paginator.get_window(self.request, self)
+        queryset = select_expanded(
+            home_timeline(self.request.user, position, limit),
+            self.request,
+            {"author": "author__userprofile"},
+        )
+        return select_fields(queryset, self.request, self.ordering)
+
+    @extend_schema(parameters=[EXPAND_PARAMETER, FIELDS_PARAMETER])
+    def list(self, request):
+        """List posts of followed authors, newest first"""
+        return super().list(request)
+
 
+@extend_schema_view(bulk=bulk_create_schema(CommentSerializer))
 class CommentViewSet(
+    BulkCreateMixin,
+    ConditionalListMixin,
+    CachedListMixin,
+    ValuesListMixin,
     mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
     mixins.CreateModelMixin,
     viewsets.GenericViewSet,
 ):
     queryset = Comment.objects.all()
     serializer_class = CommentSerializer
+    values_serializer_class = CommentValuesSerializer
     permission_classes = [IsAuthenticated]
-    filterset_fields = ["author"]
+    ordering = ["-created_at", "-id"]
+    filterset_fields = ["author", "post"]
+    cache_namespace = "comments"
+    cache_filter_fields = ["author", "post"]
 
+    def get_queryset(self):
+        queryset = select_expanded(
+            super().get_queryset(),
+            self.request,
+            {"author": "author__userprofile", "post": "post"},
+        )
+        return select_fields(queryset, self.request, self.ordering)
+
+    @transaction.atomic
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user)
+        comment = serializer.save(author=self.request.user)
+        change_post_counter(comment.post_id, "comments_count", 1)
+        trending.record_comments(comment.post_id, comment.post.created_at)
+        notify([(Notification.Verb.COMMENT, comment.author_id, comment.post_id)])
+
+    def perform_bulk_create(self, serializer):
+        comments = serializer.save(author=self.request.user)
+        posts = {comment.post for comment in comments}
+        recompute_post_counters(Post.objects.filter(id__in=[p.id for p in posts]))
+        for post, count in Counter(comment.post for comment in comments).items():
+            trending.record_comments(post.id, post.created_at, count)
+        notify(
+            (Notification.Verb.COMMENT, comment.author_id, comment.post_id)
+            for comment in comments
+        )
+
+        namespaces = set()
+        for comment in comments:
+            namespaces.update(comment_namespaces(comment.author_id, comment.post_id))
+        for post in posts:
+            namespaces.update(post_namespaces(post.author_id))
+        invalidate(*namespaces)
 
     @extend_schema(
         parameters=[
@@ -62,31 +282,66 @@ class CommentViewSet(
                 required=False,
                 type=str,
             ),
+            OpenApiParameter(
+                name="post",
+                description="Filter by post id",
+                required=False,
+                type=str,
+            ),
+            EXPAND_PARAMETER,
+            FIELDS_PARAMETER,
         ]
     )
     def list(self, request):
-        """List comments with filter by author"""
+        """List comments with filter by author or post"""
         return super().list(request)
 
 
+@extend_schema_view(bulk=bulk_create_schema(LikeSerializer))
 class LikeViewSet(
+    BulkCreateMixin,
+    ValuesListMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     viewsets.GenericViewSet,
 ):
     queryset = Like.objects.all()
     serializer_class = LikeSerializer
+    values_serializer_class = LikeValuesSerializer
     permission_classes = [IsAuthenticated]
+    ordering = ["-id"]
     filterset_fields = ["user"]
 
+    def get_queryset(self):
+        return select_fields(super().get_queryset(), self.request, self.ordering)
+
+    @transaction.atomic
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        like = serializer.save(user=self.request.user)
+        change_post_counter(like.post_id, "likes_count", 1)
+        trending.record_likes(like.post_id, like.post.created_at)
+        notify([(Notification.Verb.LIKE, like.user_id, like.post_id)])
+
+    def perform_bulk_create(self, serializer):
+        likes = serializer.save(user=self.request.user)
+        posts = {like.post for like in likes}
+        recompute_post_counters(Post.objects.filter(id__in=[p.id for p in posts]))
+        # A post can only be liked once per request
+        for post in posts:
+            trending.record_likes(post.id, post.created_at)
+        notify((Notification.Verb.LIKE, like.user_id, like.post_id) for like in likes)
+
+        namespaces = set()
+        for post in posts:
+            namespaces.update(post_namespaces(post.author_id))
+        invalidate(*namespaces)
 
     @extend_schema(
         parameters=[
             OpenApiParameter(
                 name="user", description="Filter by user id", required=False, type=str
             ),
+            FIELDS_PARAMETER,
         ]
     )
     def list(self, request):
@@ -94,23 +349,76 @@ class LikeViewSet(
         return super().list(request)
 
 
-class FollowViewSet(viewsets.ModelViewSet):
+class FollowViewSet(
+    ValuesListMixin,
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.CreateModelMixin,
+    mixins.DestroyModelMixin,
+    viewsets.GenericViewSet,
+):
     queryset = Follow.objects.all()
     serializer_class = FollowSerializer
+    values_serializer_class = FollowValuesSerializer
     permission_classes = [IsAuthenticated]
+    ordering = ["-id"]
     filterset_fields = ["follower"]
 
+    def get_queryset(self):
+        return select_fields(super().get_queryset(), self.request, self.ordering)
+
+    def get_followed_id(self):
+        value = self.request.data.get("follower")
+        if not str(value).isdigit():
+            raise ValidationError({"follower": ["A valid user id is required."]})
+        if int(value) == self.request.user.id:
+            raise ValidationError({"follower": ["You cannot follow yourself."]})
+        return int(value)
+
     def create(self, request, *args, **kwargs):
-        following = request.user
-        followers = get_user_model().objects.get(id=request.data["follower"])
-        if Follow.objects.filter(follower=following, followed=followers).exists():
-            return Response(
-                {"detail": "Already following"}, status=status.HTTP_400_BAD_REQUEST
-            )
-        follow = Follow.objects.create(follower=following, followed=followers)
-        serializer = self.get_serializer(follow)
+        followed_id = self.get_followed_id()
+        follows = follow_users(request.user.id, [followed_id])
+        if not follows:
+            if get_user_model().objects.filter(id=followed_id).exists():
+                return Response(
+                    {"detail": "Already following"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            raise NotFound("User not found.")
+        notify([(Notification.Verb.FOLLOW, request.user.id, followed_id)])
+        serializer = self.get_serializer(follows[0])
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
+    def destroy(self, request, *args, **kwargs):
+        if not (
+            str(kwargs["pk"]).isdigit()
+            and delete_follow(int(kwargs["pk"]), request.user.id)
+        ):
+            raise NotFound()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @extend_schema(request=FollowUsersSerializer, responses=FollowedUsersSerializer)
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        """Follow a batch of users; already followed and unknown ids are skipped"""
+        serializer = FollowUsersSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        follows = follow_users(request.user.id, serializer.validated_data["users"])
+        notify(
+            (Notification.Verb.FOLLOW, request.user.id, follow.followed_id)
+            for follow in follows
+        )
+        return Response({"users": [follow.followed_id for follow in follows]})
+
+    @extend_schema(request=FollowUsersSerializer, responses=FollowedUsersSerializer)
+    @action(detail=False, methods=["post"], url_path="bulk-unfollow")
+    def bulk_unfollow(self, request):
+        """Unfollow a batch of users; ids you do not follow are skipped"""
+        serializer = FollowUsersSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        users = unfollow_users(request.user.id, serializer.validated_data["users"])
+        return Response({"users": users})
+
     @extend_schema(
         parameters=[
             OpenApiParameter(
@@ -119,8 +427,256 @@ class FollowViewSet(viewsets.ModelViewSet):
                 required=False,
                 type=str,
             ),
+            FIELDS_PARAMETER,
         ]
     )
     def list(self, request):
         """List followed with filter by follower"""
         return super().list(request)
+
+    def get_user_ids(self, name, max_length=1):
+        value = self.request.query_params.get(name, "")
+        ids = [item.strip() for item in value.split(",") if item.strip()]
+        if not ids or not all(item.isdigit() for item in ids):
+            raise ValidationError({name: ["A comma separated list of user ids."]})
+        if len(ids) > max_length:
+            raise ValidationError(
+                {name: [f"Ensure this list has no more than {max_length} ids."]}
+            )
+        return [int(item) for item in ids]
+
+    def get_users(self, ids):
+        users = get_user_model().objects.select_related("userprofile").in_bulk(ids)
+        return [users[user_id] for user_id in ids if user_id in users]
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="user", description="User id", required=True, type=int
+            ),
+        ],
+        responses=FollowStatusSerializer,
+    )
+    @action(detail=False, url_path="is-following")
+    def is_following(self, request):
+        """Whether you follow a user"""
+        [user_id] = self.get_user_ids("user")
+        return Response(
+            {"user": user_id, "following": graph.is_following(request.user.id, user_id)}
+        )
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="ids",
+                description="Comma separated user ids",
+                required=True,
+                type=str,
+            ),
+        ],
+        responses=FollowStatusSerializer(many=True),
+    )
+    @action(detail=False, url_path="are-following")
+    def are_following(self, request):
+        """Whether you follow each of a batch of users"""
+        ids = self.get_user_ids("ids", settings.FOLLOW_GRAPH_MAX_IDS)
+        statuses = graph.are_following(request.user.id, ids)
+        return Response(
+            [{"user": user_id, "following": statuses[user_id]} for user_id in ids]
+        )
+
+    @extend_schema(
+        parameters=[LIMIT_PARAMETER], responses=UserSummarySerializer(many=True)
+    )
+    @action(detail=False)
+    def mutuals(self, request):
+        """Users you follow who follow you back"""
+        ids = graph.mutuals(request.user.id)[: get_limit(request)]
+        return Response(
+            UserSummarySerializer(
+                self.get_users(ids), many=True, context=self.get_serializer_context()
+            ).data
+        )
+
+    @extend_schema(
+        parameters=[LIMIT_PARAMETER], responses=FollowSuggestionSerializer(many=True)
+    )
+    @action(detail=False)
+    def suggestions(self, request):
+        """Users followed by the people you follow, most shared first"""
+        counts = dict(graph.suggestions(request.user.id, get_limit(request)))
+        users = self.get_users(list(counts))
+        for user in users:
+            user.mutual_count = counts[user.id]
+        return Response(
+            FollowSuggestionSerializer(
+                users, many=True, context=self.get_serializer_context()
+            ).data
+        )
+
+
+class TrendingViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+    serializer_class = TrendingPostSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = None
+
+    def get_queryset(self):
+        queryset = select_expanded(
+            Post.objects.all(), self.request, {"author": "author__userprofile"}
+        )
+        return select_fields(queryset, self.request)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="limit",
+                description="Number of posts to return (default 20, max 100)",
+                required=False,
+                type=int,
+            ),
+            EXPAND_PARAMETER,
+            FIELDS_PARAMETER,
+        ]
+    )
+    def list(self, request):
+        """Posts with the most recent likes and comments, hottest first"""
+        scores = dict(trending.trending(limit=get_limit(request)))
+        posts = self.get_queryset().in_bulk(list(scores))
+        ranked = []
+        for post_id, score in scores.items():
+            if post_id in posts:
+                posts[post_id].trending_score = score
+                ranked.append(posts[post_id])
+        return Response(self.get_serializer(ranked, many=True).data)
+
+
+class NotificationViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+    serializer_class = NotificationSerializer
+    permission_classes = [IsAuthenticated]
+    ordering = ["-updated_at", "-id"]
+
+    def get_queryset(self):
+        if getattr(self, "swagger_fake_view", False):
+            return Notification.objects.none()
+        return Notification.objects.filter(
+            recipient=self.request.user, read=False
+        ).select_related("actor__userprofile")
+
+    def list(self, request):
+        """Your unread notifications, most recent first"""
+        return super().list(request)
+
+    @extend_schema(responses=UnreadCountSerializer)
+    @action(detail=False)
+    def unread(self, request):
+        """Number of your unread notifications"""
+        return Response({"unread": unread_count(request.user.id)})
+
+    @extend_schema(request=MarkReadSerializer, responses=UnreadCountSerializer)
+    @action(detail=False, methods=["post"])
+    def read(self, request):
+        """Mark the listed notifications, or all of them, as read"""
+        serializer = MarkReadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        mark_read(request.user.id, serializer.validated_data.get("ids"))
+        return Response({"unread": unread_count(request.user.id)})
+
+
+class SearchViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+    permission_classes = [IsAuthenticated]
+    pagination_class = SearchPagination
+    filter_backends = []
+    search_types = {
+        "post": (Post, PostSearchSerializer, {"author": "author__userprofile"}),
+        "comment": (
+            Comment,
+            CommentSearchSerializer,
+            {"author": "author__userprofile", "post": "post"},
+        ),
+    }
+
+    def get_search_type(self):
+        search_type = self.request.query_params.get("type", "post")
+        if search_type not in self.search_types:
+            raise ValidationError(
+                {"type": [f"Must be one of: {', '.join(self.search_types)}."]}
+            )
+        return self.search_types[search_type]
+
+    def get_serializer_class(self):
+        return self.get_search_type()[1]
+
+    def get_queryset(self):
+        model, serializer_class, related = self.get_search_type()
+        query = self.request.query_params.get("q", "").strip()
+        if not query:
+            raise ValidationError({"q": ["This query parameter is required."]})
+        queryset = select_expanded(model.objects.all(), self.request, related)
+        return SearchResults(queryset, query)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="q",
+                description="Words to search for",
+                required=True,
+                type=str,
+            ),
+            OpenApiParameter(
+                name="type",
+                description="What to search: post (default) or comment",
+                required=False,
+                type=str,
+                enum=["post", "comment"],
+            ),
+            EXPAND_PARAMETER,
+            FIELDS_PARAMETER,
+        ]
+    )
+    def list(self, request):
+        """Search post or comment content, best matches first"""
+        return super().list(request)
+
+
+class ExportView(APIView):
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [JSONRenderer, NDJSONRenderer]
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="user",
+                description="User id to export, staff only (defaults to yourself)",
+                required=False,
+                type=int,
+            ),
+        ],
+        responses={(200, "application/x-ndjson"): OpenApiTypes.BINARY},
+    )
+    def get(self, request):
+        """Stream your posts, comments and likes as NDJSON, gzip'd on request"""
+        user_id = request.user.id
+        requested = request.query_params.get("user")
+        if requested and requested != str(user_id):
+            if not request.user.is_staff:
+                raise PermissionDenied("Only staff can export other users.")
+            if not (
+                requested.isdigit()
+                and get_user_model().objects.filter(pk=requested).exists()
+            ):
+                raise NotFound("User not found.")
+            user_id = int(requested)
+
+        chunks = export_ndjson(user_id)
+        response = StreamingHttpResponse(content_type="application/x-ndjson")
+        if "gzip" in request.headers.get("Accept-Encoding", ""):
+            chunks = gzip_stream(chunks)
+            response["Content-Encoding"] = "gzip"
+        patch_vary_headers(response, ["Accept-Encoding"])
+        response["Content-Disposition"] = (
+            f'attachment; filename="user-{user_id}.ndjson"'
+        )
+        if isinstance(request._request, ASGIRequest):
+            chunks = async_chunks(chunks)
+        response.streaming_content = chunks
+        return response
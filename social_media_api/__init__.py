@@ -0,0 +1,4 @@
+from social_media_api.celery import app as celery_app
+from social_media_api import db  # noqa: F401
+
+__all__ = ("celery_app",)
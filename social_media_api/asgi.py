@@ -12,5 +12,8 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'social_media_api.settings')
+os.environ.setdefault('ASYNC_READ_PATH', 'True')
+# Connections are not reused across requests under ASGI
+os.environ.setdefault('CONN_MAX_AGE', '0')
 
 application = get_asgi_application()
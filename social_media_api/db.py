@@ -0,0 +1,47 @@
+"""SQLite tuning for single-node deployments.
+
+With ``SQLITE_TUNED`` every new SQLite connection switches the database to
+write-ahead logging, so readers no longer block the writer and the writer
+no longer blocks readers, and relaxes ``synchronous`` to ``NORMAL``, which
+is still crash safe in WAL mode but skips the fsync on every commit.
+Writers wait up to ``SQLITE_BUSY_TIMEOUT`` milliseconds for the lock
+instead of failing with "database is locked", and reads go through a
+memory map of up to ``SQLITE_MMAP_SIZE`` bytes.
+
+Transactions are started with ``BEGIN IMMEDIATE``. A deferred transaction
+takes the write lock only at its first write, and in WAL mode SQLite
+fails that upgrade at once, without waiting, when another connection
+committed since the transaction's snapshot was taken.
+"""
+
+from functools import partial
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+def sqlite_pragmas():
+    return {
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT,
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+    }
+
+
+def begin_immediate(connection):
+    # Django 5.0 has no "transaction_mode" option (added in 5.1)
+    connection.cursor().execute("BEGIN IMMEDIATE")
+
+
+@receiver(connection_created)
+def tune_sqlite(sender, connection, **kwargs):
+    if connection.vendor != "sqlite" or not settings.SQLITE_TUNED:
+        return
+    with connection.cursor() as cursor:
+        for name, value in sqlite_pragmas().items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+    connection._start_transaction_under_autocommit = partial(
+        begin_immediate, connection
+    )
@@ -0,0 +1,223 @@
+"""Per-view request timing, database usage and response size.
+
+``InstrumentationMiddleware`` measures every request and adds a
+``Server-Timing`` header with the wall and database time. A database
+``execute_wrapper`` installed on every connection counts the queries of
+the request being measured, including queries run by the async ORM in
+worker threads. Requests with more than ``QUERY_COUNT_THRESHOLD`` queries
+are logged and counted, so N+1 regressions show up in the metrics.
+
+Measurements are aggregated per resolved view name in the process and
+flushed to the shared counters of ``social_media_api.metrics`` every
+``METRICS_FLUSH_INTERVAL`` seconds; ``/metrics`` renders those counters in
+the Prometheus text format to requests bearing ``METRICS_TOKEN``, or to
+anyone only when ``METRICS_PUBLIC`` is set.
+"""
+
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+
+from social_media_api import metrics
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the request duration histogram, in milliseconds
+DURATION_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+_current = ContextVar("request_stats", default=None)
+
+
+class RequestStats:
+    __slots__ = ("queries", "db_time")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+
+
+def count_queries(execute, sql, params, many, context):
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.db_time += time.perf_counter() - start
+        stats.queries += 1
+
+
+def install_wrapper(connection, **kwargs):
+    if count_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_queries)
+
+
+connection_created.connect(install_wrapper)
+
+
+class Recorder:
+    """Process-local totals, periodically added to the shared counters"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.totals = defaultdict(int)
+        self.flushed_at = time.monotonic()
+
+    def record(self, view, duration, stats, size):
+        duration_us = int(duration * 1_000_000)
+        bucket = next(
+            (str(le) for le in DURATION_BUCKETS_MS if duration_us <= le * 1000),
+            "+Inf",
+        )
+        with self.lock:
+            totals = self.totals
+            totals[("http_requests", view, None)] += 1
+            totals[("http_request_duration_us", view, None)] += duration_us
+            totals[("http_request_duration_bucket", view, bucket)] += 1
+            totals[("db_queries", view, None)] += stats.queries
+            totals[("db_duration_us", view, None)] += int(stats.db_time * 1_000_000)
+            if size is not None:
+                totals[("response_bytes", view, None)] += size
+            if stats.queries > settings.QUERY_COUNT_THRESHOLD:
+                totals[("query_threshold_exceeded", view, None)] += 1
+            due = time.monotonic() - self.flushed_at >= settings.METRICS_FLUSH_INTERVAL
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            totals, self.totals = self.totals, defaultdict(int)
+            self.flushed_at = time.monotonic()
+        for (name, view, le), value in totals.items():
+            if le is None:
+                metrics.increment(name, value, view=view)
+            else:
+                metrics.increment(name, value, view=view, le=le)
+
+
+recorder = Recorder()
+
+
+class InstrumentationMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        for connection in connections.all(initialized_only=True):
+            install_wrapper(connection)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        stats = RequestStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, stats, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        stats = RequestStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, stats, time.perf_counter() - start)
+
+    def finish(self, request, response, stats, duration):
+        match = request.resolver_match
+        view = match.view_name if match else "unresolved"
+        size = None if response.streaming else len(response.content)
+
+        response["Server-Timing"] = (
+            f"app;dur={duration * 1000:.2f}, "
+            f'db;dur={stats.db_time * 1000:.2f};desc="{stats.queries} queries"'
+        )
+        if stats.queries > settings.QUERY_COUNT_THRESHOLD:
+            logger.warning(
+                "%s %s ran %d queries (threshold %d)",
+                request.method,
+                request.path,
+                stats.queries,
+                settings.QUERY_COUNT_THRESHOLD,
+            )
+        recorder.record(view, duration, stats, size)
+        return response
+
+
+def _labels(labels):
+    return ",".join(f'{key}="{value}"' for key, value in labels)
+
+
+def render_prometheus(counters):
+    """Prometheus text exposition of ``metrics.snapshot()``"""
+    by_name = defaultdict(list)
+    for (name, labels), value in sorted(counters.items()):
+        by_name[name].append((labels, value))
+
+    lines = []
+    durations = by_name.pop("http_request_duration_us", [])
+    buckets = defaultdict(dict)
+    for labels, value in by_name.pop("http_request_duration_bucket", []):
+        labels = dict(labels)
+        buckets[labels.pop("le")][tuple(labels.items())] = value
+    if durations:
+        name = "http_request_duration_seconds"
+        lines.append(f"# TYPE {name} histogram")
+        counts = dict(by_name.get("http_requests", []))
+        for labels, value in durations:
+            cumulative = 0
+            for le in (*map(str, DURATION_BUCKETS_MS), "+Inf"):
+                cumulative += buckets[le].get(labels, 0)
+                bound = le if le == "+Inf" else str(int(le) / 1000)
+                lines.append(
+                    f'{name}_bucket{{{_labels(labels)},le="{bound}"}} {cumulative}'
+                )
+            lines.append(f"{name}_sum{{{_labels(labels)}}} {value / 1_000_000}")
+            lines.append(f"{name}_count{{{_labels(labels)}}} {counts.get(labels, 0)}")
+
+    for name, samples in by_name.items():
+        scale = 1
+        if name.endswith("_us"):
+            name, scale = f"{name[:-3]}_seconds", 1_000_000
+        lines.append(f"# TYPE {name}_total counter")
+        for labels, value in samples:
+            value = value / scale if scale != 1 else value
+            lines.append(f"{name}_total{{{_labels(labels)}}} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def metrics_allowed(request):
+    if not settings.METRICS_TOKEN:
+        return settings.METRICS_PUBLIC
+    return constant_time_compare(
+        request.headers.get("Authorization", ""), f"Bearer {settings.METRICS_TOKEN}"
+    )
+
+
+def metrics_view(request):
+    if not metrics_allowed(request):
+        return HttpResponseForbidden()
+    recorder.flush()
+    return HttpResponse(
+        render_prometheus(metrics.snapshot()),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
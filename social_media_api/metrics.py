@@ -0,0 +1,60 @@
+"""Process-shared counters stored in the default cache.
+
+Counters live in the cache so every worker process increments the same
+value. Their keys are listed in numbered index slots so they can be
+enumerated without scanning the cache: the process that creates a counter
+claims the next slot with an atomic ``incr`` and writes the key into it,
+so concurrent registrations never overwrite each other.
+"""
+
+from django.core.cache import cache
+
+INDEX_KEY = "metrics:keys"
+
+
+def _key(name, labels):
+    label_str = ",".join(f"{key}={value}" for key, value in sorted(labels.items()))
+    return f"metrics:{name}|{label_str}"
+
+
+def _slot_key(slot):
+    return f"{INDEX_KEY}:{slot}"
+
+
+def _register(key):
+    try:
+        slot = cache.incr(INDEX_KEY)
+    except ValueError:
+        cache.add(INDEX_KEY, 0, timeout=None)
+        slot = cache.incr(INDEX_KEY)
+    cache.set(_slot_key(slot), key, timeout=None)
+
+
+def _keys():
+    size = cache.get(INDEX_KEY, 0)
+    slots = cache.get_many([_slot_key(slot) for slot in range(1, size + 1)])
+    return set(slots.values())
+
+
+def increment(name, delta=1, **labels):
+    key = _key(name, labels)
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        if cache.add(key, delta, timeout=None):
+            _register(key)
+        else:
+            cache.incr(key, delta)
+
+
+def snapshot():
+    """Return ``{(name, labels): value}`` for every known counter"""
+    values = cache.get_many(_keys())
+    result = {}
+    for key, value in values.items():
+        name, _, label_str = key[len("metrics:") :].partition("|")
+        labels = tuple(
+            tuple(pair.split("=", 1)) for pair in label_str.split(",") if pair
+        )
+        result[(name, labels)] = value
+    return result
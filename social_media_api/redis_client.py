@@ -0,0 +1,14 @@
+from functools import lru_cache
+
+import redis
+from django.conf import settings
+
+
+@lru_cache(maxsize=None)
+def _client(url: str) -> redis.Redis:
+    return redis.Redis.from_url(url)
+
+
+def get_redis_client() -> redis.Redis:
+    """Shared Redis client for the url configured in ``REDIS_URL``"""
+    return _client(settings.REDIS_URL)
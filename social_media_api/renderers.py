@@ -0,0 +1,49 @@
+"""DRF's JSON renderer on top of orjson.
+
+``ORJSONRenderer`` answers ``application/json`` with the same document as
+``rest_framework.renderers.JSONRenderer`` in its default compact, UTF-8
+mode: values orjson would format differently (datetimes, decimals, lazy
+strings) go through DRF's encoder, and U+2028/U+2029 are escaped the same
+way. Floats are the exception: orjson writes the shortest form without a
+``+`` or leading zeros in the exponent (``1e20``, ``0.000032``) where
+``json`` writes ``1e+20`` and ``3.2e-05``, so such floats parse to the same
+value but not from the same bytes. Indented output, as asked for by the
+browsable API or ``Accept: application/json; indent=4``, falls back to
+DRF's renderer.
+"""
+
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+OPTIONS = (
+    orjson.OPT_NON_STR_KEYS
+    | orjson.OPT_PASSTHROUGH_DATETIME
+    | orjson.OPT_PASSTHROUGH_DATACLASS
+)
+
+encode_default = JSONEncoder().default
+
+
+class ORJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        renderer_context = renderer_context or {}
+        if (
+            self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=encode_default, option=OPTIONS)
+        except orjson.JSONEncodeError:
+            # Integers beyond 64 bits and other values only json handles
+            return super().render(data, accepted_media_type, renderer_context)
+        # U+2028 and U+2029 in UTF-8
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
@@ -52,10 +52,25 @@ INSTALLED_APPS = [
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "user.authentication.StatelessJWTAuthentication",
+    ),
+    "DEFAULT_RENDERER_CLASSES": (
+        "social_media_api.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
     ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_FILTER_BACKENDS": ("django_filters.rest_framework.DjangoFilterBackend",),
+    "DEFAULT_PAGINATION_CLASS": "features.pagination.KeysetPagination",
+    "DEFAULT_THROTTLE_CLASSES": ("social_media_api.throttling.TokenBucketThrottle",),
+    "PAGE_SIZE": 20,
+}
+
+# Token bucket sizes and refill periods per throttle scope, applied per user
+# (or client IP when anonymous); an empty rate disables the scope
+THROTTLE_RATES = {
+    "read": os.getenv("THROTTLE_RATE_READ", "600/min"),
+    "write": os.getenv("THROTTLE_RATE_WRITE", "120/min"),
+    "auth": os.getenv("THROTTLE_RATE_AUTH", "20/min"),
 }
 
 SIMPLE_JWT = {
@@ -64,13 +79,108 @@ SIMPLE_JWT = {
     "ROTATE_REFRESH_TOKENS": False,
 }
 
+# Users' current token versions are cached for this many seconds
+TOKEN_VERSION_CACHE_TTL = int(os.getenv("TOKEN_VERSION_CACHE_TTL", 24 * 60 * 60))
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Social Media API",
     "DESCRIPTION": "Project for managing social media",
     "VERSION": "1.0.0",
     "SERVE_INCLUDE_SCHEMA": False,
 }
+
+REDIS_URL = os.getenv("REDIS_URL")
+
+# Redis when REDIS_URL is set, a per-process memory cache otherwise (tests,
+# local development).
+CACHES = {
+    "default": (
+        {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+        if REDIS_URL
+        else {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    )
+}
+
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", 60))
+
+# Request instrumentation: requests running more queries than the threshold
+# are logged, process totals are flushed to the shared metrics every
+# interval, and /metrics requires this bearer token; without a token it is
+# closed unless METRICS_PUBLIC opts out of authentication
+QUERY_COUNT_THRESHOLD = int(os.getenv("QUERY_COUNT_THRESHOLD", 20))
+METRICS_FLUSH_INTERVAL = int(os.getenv("METRICS_FLUSH_INTERVAL", 10))
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+METRICS_PUBLIC = os.getenv("METRICS_PUBLIC") == "True"
+
+THROTTLE_STORE = os.getenv(
+    "THROTTLE_STORE",
+    "social_media_api.throttling.%sTokenBucketStore"
+    % ("Redis" if REDIS_URL else "Local"),
+)
+
+# Without a broker tasks run in the calling process: nothing reads the
+# per-process memory transport, so queued tasks would be silently lost.
+CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", REDIS_URL or "memory://")
+CELERY_TASK_ALWAYS_EAGER = (
+    os.getenv("CELERY_TASK_ALWAYS_EAGER", str(CELERY_BROKER_URL == "memory://"))
+    == "True"
+)
+CELERY_TASK_IGNORE_RESULT = True
+CELERY_BEAT_SCHEDULE = {
+    "rebuild-trending": {
+        "task": "features.tasks.rebuild_trending",
+        "schedule": int(os.getenv("TRENDING_REBUILD_INTERVAL", 5 * 60)),
+    },
+    "trim-timelines": {
+        "task": "features.tasks.trim_timelines",
+        "schedule": int(os.getenv("FEED_TRIM_INTERVAL", 60 * 60)),
+    },
+}
+
+# Square thumbnail sizes generated for every uploaded profile picture
+PROFILE_PICTURE_SIZES = (64, 256)
+
+BULK_CREATE_MAX_BATCH_SIZE = int(os.getenv("BULK_CREATE_MAX_BATCH_SIZE", 100))
+IDEMPOTENCY_KEY_TTL = int(os.getenv("IDEMPOTENCY_KEY_TTL", 24 * 60 * 60))
+
+# Rows fetched per database round trip and bytes per chunk of data exports
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", 2000))
+EXPORT_BUFFER_SIZE = int(os.getenv("EXPORT_BUFFER_SIZE", 64 * 1024))
+
+# Home timeline: posts of authors with more followers than the threshold
+# are merged on read instead of being pushed to every follower.
+FEED_BACKEND = os.getenv("FEED_BACKEND", "features.feed.DatabaseTimelineBackend")
+FEED_FANOUT_THRESHOLD = int(os.getenv("FEED_FANOUT_THRESHOLD", 1000))
+FEED_MAX_LENGTH = int(os.getenv("FEED_MAX_LENGTH", 800))
+
+# Cached follow graph adjacency sets, see features.graph
+FOLLOW_GRAPH_TTL = int(os.getenv("FOLLOW_GRAPH_TTL", 60 * 60))
+FOLLOW_GRAPH_MAX_IDS = int(os.getenv("FOLLOW_GRAPH_MAX_IDS", 100))
+FOLLOW_SUGGESTION_SAMPLE = int(os.getenv("FOLLOW_SUGGESTION_SAMPLE", 200))
+
+# Full-text search ranks this many of the most recent matches, see
+# features.search
+SEARCH_MAX_CANDIDATES = int(os.getenv("SEARCH_MAX_CANDIDATES", 1000))
+
+# Trending posts: likes plus weighted comments, halved every half-life
+# seconds of post age. The periodic rebuild keeps the posts of the window
+# with the highest scores.
+TRENDING_BACKEND = os.getenv(
+    "TRENDING_BACKEND",
+    "features.trending.%sTrendingBackend" % ("Redis" if REDIS_URL else "Local"),
+)
+TRENDING_HALF_LIFE = int(os.getenv("TRENDING_HALF_LIFE", 6 * 60 * 60))
+TRENDING_WINDOW = int(os.getenv("TRENDING_WINDOW", 3 * 24 * 60 * 60))
+TRENDING_COMMENT_WEIGHT = int(os.getenv("TRENDING_COMMENT_WEIGHT", 2))
+TRENDING_MAX_SIZE = int(os.getenv("TRENDING_MAX_SIZE", 10_000))
+
 MIDDLEWARE = [
+    "social_media_api.instrumentation.InstrumentationMiddleware",
+    # Inside the instrumentation so response sizes are counted compressed
+    "django.middleware.gzip.GZipMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -100,16 +210,51 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "social_media_api.wsgi.application"
 
+# Serve GET on the post, comment and follow routes with native async views.
+# Enabled by asgi.py; WSGI deployments keep the DRF viewsets.
+ASYNC_READ_PATH = os.getenv("ASYNC_READ_PATH") == "True"
+
 
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+# PostgreSQL when POSTGRES_DB is set, SQLite otherwise. Connections are kept
+# open for CONN_MAX_AGE seconds and checked before being reused. Set
+# POSTGRES_POOLER=transaction behind PgBouncer's transaction pooling, where
+# server-side cursors cannot be used.
+CONN_MAX_AGE = int(os.getenv("CONN_MAX_AGE", 60))
+
+if os.getenv("POSTGRES_DB"):
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.getenv("POSTGRES_DB"),
+            "USER": os.getenv("POSTGRES_USER", "postgres"),
+            "PASSWORD": os.getenv("POSTGRES_PASSWORD", ""),
+            "HOST": os.getenv("POSTGRES_HOST", "localhost"),
+            "PORT": os.getenv("POSTGRES_PORT", "5432"),
+            "CONN_MAX_AGE": CONN_MAX_AGE,
+            "CONN_HEALTH_CHECKS": True,
+            "DISABLE_SERVER_SIDE_CURSORS": (
+                os.getenv("POSTGRES_POOLER") == "transaction"
+            ),
+        }
+    }
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.getenv("SQLITE_PATH", BASE_DIR / "db.sqlite3"),
+            "CONN_MAX_AGE": CONN_MAX_AGE,
+            "CONN_HEALTH_CHECKS": True,
+        }
     }
-}
+
+# WAL journal, synchronous=NORMAL, busy timeout (ms) and mmap size (bytes)
+# applied to every SQLite connection, see social_media_api.db
+SQLITE_TUNED = os.getenv("SQLITE_TUNED", "True") == "True"
+SQLITE_BUSY_TIMEOUT = int(os.getenv("SQLITE_BUSY_TIMEOUT", 5000))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024))
 
 
 # Password validation
@@ -148,6 +293,9 @@ USE_TZ = True
 
 STATIC_URL = "static/"
 
+MEDIA_URL = "media/"
+MEDIA_ROOT = BASE_DIR / "media"
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
@@ -0,0 +1,64 @@
+import sqlite3
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from unittest import skipUnless
+
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import SimpleTestCase, override_settings
+
+
+@skipUnless(connection.vendor == "sqlite", "SQLite tuning")
+class SQLiteTuningTests(SimpleTestCase):
+    @contextmanager
+    def database(self):
+        with tempfile.TemporaryDirectory() as directory:
+            settings_dict = {
+                **connection.settings_dict,
+                "NAME": str(Path(directory) / "tuned.sqlite3"),
+            }
+            wrapper = DatabaseWrapper(settings_dict, alias="tuned")
+            try:
+                yield wrapper
+            finally:
+                wrapper.close()
+
+    def pragmas(self, *names):
+        with self.database() as wrapper, wrapper.cursor() as cursor:
+            return {
+                name: cursor.execute(f"PRAGMA {name}").fetchone()[0] for name in names
+            }
+
+    @override_settings(
+        SQLITE_TUNED=True, SQLITE_BUSY_TIMEOUT=1234, SQLITE_MMAP_SIZE=1 << 20
+    )
+    def test_new_connections_are_tuned(self):
+        self.assertEqual(
+            self.pragmas("journal_mode", "synchronous", "busy_timeout", "mmap_size"),
+            {
+                "journal_mode": "wal",
+                "synchronous": 1,
+                "busy_timeout": 1234,
+                "mmap_size": 1 << 20,
+            },
+        )
+
+    @override_settings(SQLITE_TUNED=True)
+    def test_transactions_take_the_write_lock(self):
+        with self.database() as wrapper:
+            wrapper.ensure_connection()
+            wrapper._start_transaction_under_autocommit()
+            other = sqlite3.connect(wrapper.settings_dict["NAME"], timeout=0)
+            try:
+                with self.assertRaisesMessage(
+                    sqlite3.OperationalError, "database is locked"
+                ):
+                    other.execute("BEGIN IMMEDIATE")
+            finally:
+                other.close()
+                wrapper.connection.rollback()
+
+    @override_settings(SQLITE_TUNED=False)
+    def test_tuning_can_be_disabled(self):
+        self.assertEqual(self.pragmas("journal_mode"), {"journal_mode": "delete"})
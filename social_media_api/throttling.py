@@ -0,0 +1,123 @@
+"""Token bucket rate limiting shared by every worker process.
+
+Each user (or client IP for anonymous requests) has one bucket per scope:
+``read`` for safe methods, ``write`` for the others and whatever a view
+names in ``throttle_scope`` (``auth`` for the login endpoints). A rate of
+``"60/min"`` is a bucket of 60 requests refilled at one per second, so a
+client may burst up to the whole bucket and then continues at the average
+rate. Buckets live in Redis and are updated by a Lua script in one atomic
+step; without ``REDIS_URL`` they are kept in the local memory cache.
+"""
+
+import math
+import threading
+import time
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import BaseThrottle
+
+from social_media_api import metrics
+from social_media_api.redis_client import get_redis_client
+
+PERIODS = {"s": 1, "m": 60, "h": 60 * 60, "d": 24 * 60 * 60}
+
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'at')
+local tokens = tonumber(state[1]) or capacity
+local at = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - at) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'at', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return tostring(wait)
+"""
+
+
+def parse_rate(rate):
+    """``"60/min"`` -> ``(60, 60)``: bucket size and refill period in seconds"""
+    requests, period = rate.split("/")
+    return int(requests), PERIODS[period[0]]
+
+
+class RedisTokenBucketStore:
+    def __init__(self):
+        self.script = get_redis_client().register_script(TOKEN_BUCKET_SCRIPT)
+
+    def consume(self, key, capacity, rate):
+        """Take a token; returns the seconds to wait, 0 when one was free"""
+        return float(self.script(keys=[key], args=[capacity, rate]))
+
+
+class LocalTokenBucketStore:
+    """Buckets in the local memory cache, for tests and single-process use"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+
+    def consume(self, key, capacity, rate):
+        now = time.time()
+        with self.lock:
+            tokens, at = cache.get(key, (capacity, now))
+            tokens = min(capacity, tokens + max(0, now - at) * rate)
+            wait = 0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / rate
+            cache.set(key, (tokens, now), math.ceil(capacity / rate))
+        return wait
+
+
+@lru_cache(maxsize=None)
+def _store(path):
+    return import_string(path)()
+
+
+def get_throttle_store():
+    return _store(settings.THROTTLE_STORE)
+
+
+class TokenBucketThrottle(BaseThrottle):
+    def get_scope(self, request, view):
+        scope = getattr(view, "throttle_scope", None)
+        if scope:
+            return scope
+        return "read" if request.method in SAFE_METHODS else "write"
+
+    def allow_request(self, request, view):
+        self.retry_after = None
+        scope = self.get_scope(request, view)
+        rate = settings.THROTTLE_RATES.get(scope)
+        if not rate:
+            return True
+
+        if request.user and request.user.is_authenticated:
+            ident = f"user:{request.user.pk}"
+        else:
+            ident = f"ip:{self.get_ident(request)}"
+        capacity, period = parse_rate(rate)
+        wait = get_throttle_store().consume(
+            f"throttle:{scope}:{ident}", capacity, capacity / period
+        )
+        if not wait:
+            return True
+
+        self.retry_after = wait
+        metrics.increment("throttle_rejected", scope=scope)
+        return False
+
+    def wait(self):
+        return self.retry_after
@@ -15,6 +15,8 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+from django.conf import settings
+from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path, include
 from drf_spectacular.views import (
@@ -22,6 +24,8 @@ from drf_spectacular.views import (
     SpectacularSwaggerView,
 )
 
+from social_media_api.instrumentation import metrics_view
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/user/", include("user.urls", namespace="user")),
@@ -32,4 +36,5 @@ urlpatterns = [
         SpectacularSwaggerView.as_view(url_name="schema"),
         name="swagger-ui",
     ),
-]
+    path("metrics", metrics_view, name="metrics"),
+] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -0,0 +1,156 @@
+"""JWT authentication without a user query per request.
+
+Access tokens carry the user's ``username``, ``is_active`` and token
+version (``ver``) as signed claims. ``StatelessJWTAuthentication`` builds
+the user from them as a ``User`` instance whose other fields are deferred,
+so the row is only read when a view touches one of those fields.
+
+Tokens are revoked by bumping ``UserProfile.token_version``; the current
+version of every user is cached, and tokens carrying an older one are
+rejected, as are tokens of users whose profile no longer exists. Tokens
+issued without the claims fall back to a database lookup.
+"""
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from drf_spectacular.contrib.rest_framework_simplejwt import (
+    SimpleJWTScheme,
+    TokenObtainPairSerializerExtension,
+    TokenRefreshSerializerExtension,
+)
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from user.models import UserProfile
+
+USER_CLAIMS = ("username", "is_active", "ver")
+
+
+def _version_key(user_id):
+    return f"auth:token_version:{user_id}"
+
+
+def get_token_version(user_id):
+    """The user's current token version, None once the user is deleted"""
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = (
+            UserProfile.objects.filter(user_id=user_id)
+            .values_list("token_version", flat=True)
+            .first()
+        )
+        if version is not None:
+            cache.set(key, version, settings.TOKEN_VERSION_CACHE_TTL)
+    return version
+
+
+async def aget_token_version(user_id):
+    key = _version_key(user_id)
+    version = await cache.aget(key)
+    if version is None:
+        version = (
+            await UserProfile.objects.filter(user_id=user_id)
+            .values_list("token_version", flat=True)
+            .afirst()
+        )
+        if version is not None:
+            await cache.aset(key, version, settings.TOKEN_VERSION_CACHE_TTL)
+    return version
+
+
+def forget_token_version(user_id):
+    """Drop the cached version, now and once the transaction commits"""
+    key = _version_key(user_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def revoke_tokens(user_id):
+    """Invalidate every token issued to the user so far"""
+    UserProfile.objects.filter(user_id=user_id).update(
+        token_version=F("token_version") + 1
+    )
+    forget_token_version(user_id)
+
+
+def add_user_claims(token, user):
+    token["username"] = user.get_username()
+    token["is_active"] = user.is_active
+    token["ver"] = get_token_version(user.pk)
+    return token
+
+
+def user_from_claims(validated_token):
+    """A ``User`` with only the claimed fields loaded"""
+    user_model = get_user_model()
+    claims = {
+        jwt_settings.USER_ID_FIELD: validated_token[jwt_settings.USER_ID_CLAIM],
+        user_model.USERNAME_FIELD: validated_token["username"],
+        "is_active": validated_token["is_active"],
+    }
+    # from_db() expects the values in field order
+    field_names = [
+        field.attname
+        for field in user_model._meta.concrete_fields
+        if field.attname in claims
+    ]
+    return user_model.from_db(
+        "default", field_names, [claims[name] for name in field_names]
+    )
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    def has_user_claims(self, validated_token):
+        return all(claim in validated_token for claim in USER_CLAIMS)
+
+    def check_user(self, validated_token, version):
+        if version is None:
+            raise AuthenticationFailed("User not found", code="user_not_found")
+        if not validated_token["is_active"]:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        if validated_token["ver"] != version:
+            raise AuthenticationFailed("Token has been revoked", code="token_revoked")
+        return user_from_claims(validated_token)
+
+    def get_user(self, validated_token):
+        if not self.has_user_claims(validated_token):
+            return super().get_user(validated_token)
+        user_id = validated_token[jwt_settings.USER_ID_CLAIM]
+        return self.check_user(validated_token, get_token_version(user_id))
+
+    async def aget_user(self, validated_token):
+        if not self.has_user_claims(validated_token):
+            user = await self.user_model.objects.filter(
+                **{
+                    jwt_settings.USER_ID_FIELD: validated_token[
+                        jwt_settings.USER_ID_CLAIM
+                    ]
+                }
+            ).afirst()
+            if user is None:
+                raise AuthenticationFailed("User not found", code="user_not_found")
+            if not user.is_active:
+                raise AuthenticationFailed("User is inactive", code="user_inactive")
+            return user
+        user_id = validated_token[jwt_settings.USER_ID_CLAIM]
+        return self.check_user(validated_token, await aget_token_version(user_id))
+
+
+# drf-spectacular only matches its simplejwt extensions on the exact classes
+
+
+class StatelessJWTScheme(SimpleJWTScheme):
+    target_class = "user.authentication.StatelessJWTAuthentication"
+
+
+class LoginSerializerExtension(TokenObtainPairSerializerExtension):
+    target_class = "user.serializers.LoginSerializer"
+
+
+class RefreshSerializerExtension(TokenRefreshSerializerExtension):
+    target_class = "user.serializers.RefreshSerializer"
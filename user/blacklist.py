@@ -0,0 +1,70 @@
+"""Refresh token blacklist kept in the cache.
+
+Blacklisted tokens are stored by ``jti`` with a timeout equal to the
+token's remaining lifetime, so every check is a single key lookup and an
+entry disappears as soon as the token would have expired anyway. With
+``REDIS_URL`` set the entries live in Redis and are shared by every
+process; otherwise the local memory cache stands in.
+
+Keys include a generation number; ``flush()`` moves to the next one and
+the entries of the previous generation are left to expire.
+"""
+
+import time
+
+from django.core.cache import cache
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from user.authentication import get_token_version
+
+GENERATION_KEY = "auth:blacklist:generation"
+
+
+def _generation():
+    return cache.get_or_set(GENERATION_KEY, 0, timeout=None)
+
+
+def _key(jti, generation):
+    return f"auth:blacklist:{generation}:{jti}"
+
+
+def blacklist_jti(jti, expires_at):
+    """Blacklist ``jti`` until the unix timestamp ``expires_at``"""
+    timeout = int(expires_at - time.time()) + 1
+    if timeout <= 0:
+        return False
+    cache.set(_key(jti, _generation()), 1, timeout)
+    return True
+
+
+def blacklist_token(token):
+    return blacklist_jti(token[jwt_settings.JTI_CLAIM], token["exp"])
+
+
+def is_blacklisted(jti):
+    return cache.get(_key(jti, _generation())) is not None
+
+
+def flush():
+    """Drop every entry; returns the new generation"""
+    cache.add(GENERATION_KEY, 0, timeout=None)
+    return cache.incr(GENERATION_KEY)
+
+
+class BlacklistRefreshToken(RefreshToken):
+    """Refresh token rejected once blacklisted, revoked or its user deleted"""
+
+    def verify(self, *args, **kwargs):
+        super().verify(*args, **kwargs)
+        if is_blacklisted(self.payload[jwt_settings.JTI_CLAIM]):
+            raise TokenError("Token is blacklisted")
+        version = get_token_version(self.payload[jwt_settings.USER_ID_CLAIM])
+        if version is None:
+            raise TokenError("User not found")
+        if "ver" in self.payload and self.payload["ver"] != version:
+            raise TokenError("Token has been revoked")
+
+    def blacklist(self):
+        return blacklist_token(self)
@@ -0,0 +1,54 @@
+from datetime import timezone as dt_timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from user import blacklist
+
+OUTSTANDING_TABLE = "token_blacklist_outstandingtoken"
+BLACKLISTED_TABLE = "token_blacklist_blacklistedtoken"
+
+
+class Command(BaseCommand):
+    help = "Migrate simplejwt's database blacklist into the cache, or flush it"
+
+    def add_arguments(self, parser):
+        group = parser.add_mutually_exclusive_group(required=True)
+        group.add_argument(
+            "--migrate",
+            action="store_true",
+            help="Copy unexpired entries of the token_blacklist tables",
+        )
+        group.add_argument(
+            "--flush",
+            action="store_true",
+            help="Remove every blacklisted token",
+        )
+
+    def handle(self, *args, **options):
+        if options["flush"]:
+            generation = blacklist.flush()
+            self.stdout.write(f"Blacklist flushed (generation {generation})")
+            return
+
+        tables = set(connection.introspection.table_names())
+        if not {OUTSTANDING_TABLE, BLACKLISTED_TABLE} <= tables:
+            raise CommandError("No token_blacklist tables to migrate from")
+
+        migrated = 0
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT o.jti, o.expires_at FROM {OUTSTANDING_TABLE} o "
+                f"JOIN {BLACKLISTED_TABLE} b ON b.token_id = o.id "
+                "WHERE o.expires_at > %s",
+                [connection.ops.adapt_datetimefield_value(timezone.now())],
+            )
+            for jti, expires_at in cursor:
+                if isinstance(expires_at, str):
+                    expires_at = parse_datetime(expires_at)
+                if timezone.is_naive(expires_at):
+                    expires_at = timezone.make_aware(expires_at, dt_timezone.utc)
+                migrated += blacklist.blacklist_jti(jti, expires_at.timestamp())
+        self.stdout.write(f"{migrated} tokens migrated")
@@ -0,0 +1,56 @@
+# Generated by Django 5.0.6 on 2026-10-18 18:55
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def populate_profiles(apps, schema_editor):
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split("."))
+    UserProfile = apps.get_model("user", "UserProfile")
+    Follow = apps.get_model("features", "Follow")
+
+    UserProfile.objects.bulk_create(
+        [
+            UserProfile(user_id=user_id)
+            for user_id in User.objects.filter(userprofile__isnull=True).values_list(
+                "id", flat=True
+            )
+        ]
+    )
+    for field, relation in (
+        ("followers_count", "followed"),
+        ("following_count", "follower"),
+    ):
+        counts = (
+            Follow.objects.filter(**{relation: OuterRef("user")})
+            .order_by()
+            .values(relation)
+            .annotate(total=Count("id"))
+            .values("total")
+        )
+        UserProfile.objects.update(**{field: Coalesce(Subquery(counts), Value(0))})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("user", "0001_initial"),
+        ("features", "0005_indexes_and_unique_constraints"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userprofile",
+            name="followers_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="userprofile",
+            name="following_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_profiles, migrations.RunPython.noop),
+    ]
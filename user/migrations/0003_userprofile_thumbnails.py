@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-18 19:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("user", "0002_profile_counters"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userprofile",
+            name="thumbnails",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-18 19:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("user", "0003_userprofile_thumbnails"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userprofile",
+            name="token_version",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
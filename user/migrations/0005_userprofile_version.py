@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-18 19:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("user", "0004_userprofile_token_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userprofile",
+            name="version",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
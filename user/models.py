@@ -19,6 +19,12 @@ class UserProfile(models.Model):
         upload_to=profile_picture_file_path, blank=True, null=True
     )
     bio = models.TextField(blank=True, null=True)
+    thumbnails = models.JSONField(default=dict, blank=True)
+    followers_count = models.PositiveIntegerField(default=0)
+    following_count = models.PositiveIntegerField(default=0)
+    token_version = models.PositiveIntegerField(default=0)
+    # Bumped on every change to the serialized profile, see UserProfileView
+    version = models.PositiveIntegerField(default=0)
 
     def __str__(self):
         return self.user.username
@@ -1,6 +1,14 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 
+from user.authentication import add_user_claims
+from user.blacklist import BlacklistRefreshToken
 from user.models import UserProfile
 
 
@@ -18,5 +26,44 @@ class UserSerializer(serializers.ModelSerializer):
 class UserProfileSerializer(serializers.ModelSerializer):
     class Meta:
         model = UserProfile
-        fields = ["id", "user", "profile_picture", "bio"]
-        read_only_fields = ["id", "user"]
+        fields = [
+            "id",
+            "user",
+            "profile_picture",
+            "thumbnails",
+            "bio",
+            "followers_count",
+            "following_count",
+        ]
+        read_only_fields = [
+            "id",
+            "user",
+            "thumbnails",
+            "followers_count",
+            "following_count",
+        ]
+
+
+class LoginSerializer(TokenObtainPairSerializer):
+    token_class = BlacklistRefreshToken
+
+    @classmethod
+    def get_token(cls, user):
+        return add_user_claims(super().get_token(user), user)
+
+
+class RefreshSerializer(TokenRefreshSerializer):
+    token_class = BlacklistRefreshToken
+
+
+class LogoutSerializer(serializers.Serializer):
+    refresh_token = serializers.CharField(write_only=True)
+
+    def validate_refresh_token(self, value):
+        try:
+            token = BlacklistRefreshToken(value)
+        except TokenError as e:
+            raise serializers.ValidationError(str(e))
+        if token[jwt_settings.USER_ID_CLAIM] != self.context["request"].user.pk:
+            raise serializers.ValidationError("Token belongs to another user")
+        return token
@@ -0,0 +1,39 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from user.authentication import forget_token_version, revoke_tokens
+from user.models import UserProfile
+
+
+@receiver(post_save, sender=get_user_model())
+def create_user_profile(sender, instance, created, **kwargs):
+    if created:
+        UserProfile.objects.get_or_create(user=instance)
+
+
+@receiver(post_delete, sender=UserProfile)
+def forget_deleted_token_version(sender, instance, **kwargs):
+    forget_token_version(instance.user_id)
+
+
+@receiver(pre_save, sender=get_user_model())
+def detect_credential_change(sender, instance, update_fields=None, **kwargs):
+    """Flag users whose password or active state is about to change"""
+    watched = {"password", "is_active"}
+    if instance._state.adding or (update_fields and not watched & set(update_fields)):
+        return
+    loaded = watched - instance.get_deferred_fields()
+    if not loaded:
+        return
+    current = sender.objects.filter(pk=instance.pk).values(*loaded).first()
+    instance._revoke_tokens = current is not None and any(
+        current[name] != getattr(instance, name) for name in loaded
+    )
+
+
+@receiver(post_save, sender=get_user_model())
+def revoke_changed_credentials(sender, instance, created, **kwargs):
+    if getattr(instance, "_revoke_tokens", False):
+        instance._revoke_tokens = False
+        revoke_tokens(instance.pk)
@@ -0,0 +1,44 @@
+import os
+from io import BytesIO
+
+from celery import shared_task
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db.models import F
+from PIL import Image, ImageOps
+
+from user.models import UserProfile
+
+THUMBNAIL_FORMATS = (("WEBP", "webp"), ("JPEG", "jpg"))
+
+
+@shared_task
+def generate_profile_thumbnails(profile_id):
+    """Store resized, EXIF-free copies of a profile picture and their urls"""
+    profile = UserProfile.objects.filter(pk=profile_id).first()
+    if profile is None or not profile.profile_picture:
+        return
+
+    picture_name = profile.profile_picture.name
+    with profile.profile_picture.open("rb") as picture:
+        image = ImageOps.exif_transpose(Image.open(picture))
+        image = image.convert("RGB")
+
+    base_name, _ = os.path.splitext(picture_name)
+    thumbnails = {}
+    for size in settings.PROFILE_PICTURE_SIZES:
+        thumbnail = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+        for image_format, extension in THUMBNAIL_FORMATS:
+            buffer = BytesIO()
+            thumbnail.save(buffer, image_format, quality=85)
+            name = default_storage.save(
+                f"{base_name}-{size}.{extension}", ContentFile(buffer.getvalue())
+            )
+            thumbnails.setdefault(str(size), {})[extension] = default_storage.url(name)
+
+    # Skip the write if another picture was uploaded while this one was
+    # being processed; its own task will record the thumbnails.
+    UserProfile.objects.filter(pk=profile_id, profile_picture=picture_name).update(
+        thumbnails=thumbnails, version=F("version") + 1
+    )
@@ -0,0 +1,132 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import AccessToken
+
+from user.authentication import revoke_tokens
+
+LOGIN_URL = reverse("user:login")
+PROFILE_URL = reverse("user:profile")
+POST_URL = reverse("features:post-list")
+
+
+class StatelessJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            "reader", "reader@test.com", "testpass123"
+        )
+        self.client = APIClient()
+
+    def login(self):
+        res = self.client.post(
+            LOGIN_URL, {"username": "reader", "password": "testpass123"}
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        access = res.data["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        return access
+
+    def count_queries(self, url):
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return len(queries)
+
+    def test_login_token_carries_user_claims(self):
+        token = AccessToken(self.login())
+
+        self.assertEqual(token["username"], "reader")
+        self.assertTrue(token["is_active"])
+        self.assertEqual(token["ver"], 0)
+
+    def test_no_user_query_per_request(self):
+        self.login()
+        stateless = self.count_queries(POST_URL)
+
+        with mock.patch.object(APIView, "authentication_classes", [JWTAuthentication]):
+            with_user_query = self.count_queries(POST_URL)
+
+        self.assertEqual(stateless, with_user_query - 1)
+
+    def test_other_fields_load_lazily(self):
+        self.login()
+
+        res = self.client.get(PROFILE_URL)
+        user = res.wsgi_request.user
+
+        self.assertEqual(user.get_deferred_fields() & {"id", "username"}, set())
+        self.assertIn("email", user.get_deferred_fields())
+        with self.assertNumQueries(1):
+            self.assertEqual(user.email, "reader@test.com")
+
+    def test_revoked_tokens_are_rejected(self):
+        self.login()
+
+        revoke_tokens(self.user.id)
+
+        res = self.client.get(POST_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(res.data["code"], "token_revoked")
+
+        self.login()
+        self.assertEqual(self.client.get(POST_URL).status_code, status.HTTP_200_OK)
+
+    def test_deleted_users_tokens_are_rejected(self):
+        self.login()
+        self.assertEqual(self.client.get(POST_URL).status_code, status.HTTP_200_OK)
+
+        self.user.delete()
+
+        for url in (POST_URL, PROFILE_URL):
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+            self.assertEqual(res.data["code"], "user_not_found")
+        res = self.client.post(POST_URL, {"content": "Post"})
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_password_change_and_deactivation_revoke_tokens(self):
+        for change in ("password", "is_active"):
+            with self.subTest(change=change):
+                self.user.is_active = True
+                self.user.set_password("testpass123")
+                self.user.save()
+                self.login()
+
+                if change == "password":
+                    self.user.set_password("newpass123")
+                else:
+                    self.user.is_active = False
+                self.user.save()
+
+                res = self.client.get(POST_URL)
+                self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_unrelated_save_keeps_tokens(self):
+        self.login()
+
+        self.user.email = "new@test.com"
+        self.user.save()
+
+        self.assertEqual(self.client.get(POST_URL).status_code, status.HTTP_200_OK)
+
+    def test_tokens_without_claims_fall_back_to_database(self):
+        token = AccessToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        self.assertEqual(self.client.get(POST_URL).status_code, status.HTTP_200_OK)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(
+            self.client.get(POST_URL).status_code, status.HTTP_401_UNAUTHORIZED
+        )
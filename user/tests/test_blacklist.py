@@ -0,0 +1,132 @@
+import time
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command, CommandError
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from user import blacklist
+from user.authentication import revoke_tokens
+
+LOGIN_URL = reverse("user:login")
+REFRESH_URL = reverse("user:token_refresh")
+LOGOUT_URL = reverse("user:logout")
+
+
+class RefreshTokenBlacklistTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            "reader", "reader@test.com", "testpass123"
+        )
+        self.client = APIClient()
+        res = self.client.post(
+            LOGIN_URL, {"username": "reader", "password": "testpass123"}
+        )
+        self.refresh = res.data["refresh"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {res.data['access']}")
+
+    def refresh_status(self):
+        return APIClient().post(REFRESH_URL, {"refresh": self.refresh}).status_code
+
+    def test_refresh(self):
+        res = APIClient().post(REFRESH_URL, {"refresh": self.refresh})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn("access", res.data)
+
+    def test_logout_blacklists_refresh_token(self):
+        res = self.client.post(LOGOUT_URL, {"refresh_token": self.refresh})
+
+        self.assertEqual(res.status_code, status.HTTP_205_RESET_CONTENT)
+        self.assertEqual(self.refresh_status(), status.HTTP_401_UNAUTHORIZED)
+
+    def test_logout_twice(self):
+        self.client.post(LOGOUT_URL, {"refresh_token": self.refresh})
+        res = self.client.post(LOGOUT_URL, {"refresh_token": self.refresh})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_logout_invalid_token(self):
+        for data in ({}, {"refresh_token": "invalid"}):
+            res = self.client.post(LOGOUT_URL, data)
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_logout_other_users_token(self):
+        other = get_user_model().objects.create_user("other", "o@test.com", "pass")
+        res = self.client.post(
+            LOGOUT_URL, {"refresh_token": str(RefreshToken.for_user(other))}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_revoked_refresh_token(self):
+        revoke_tokens(self.user.id)
+
+        self.assertEqual(self.refresh_status(), status.HTTP_401_UNAUTHORIZED)
+
+    def test_deleted_users_refresh_token(self):
+        tokens = [self.refresh, str(RefreshToken.for_user(self.user))]
+
+        self.user.delete()
+
+        for token in tokens:
+            res = APIClient().post(REFRESH_URL, {"refresh": token})
+            self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_entry_expires_with_token(self):
+        self.assertFalse(blacklist.blacklist_jti("expired", time.time() - 1))
+        self.assertFalse(blacklist.is_blacklisted("expired"))
+
+        self.assertTrue(blacklist.blacklist_jti("valid", time.time() + 60))
+        self.assertTrue(blacklist.is_blacklisted("valid"))
+
+    def test_flush_command(self):
+        self.client.post(LOGOUT_URL, {"refresh_token": self.refresh})
+        call_command("jwt_blacklist", "--flush", stdout=StringIO())
+
+        self.assertEqual(self.refresh_status(), status.HTTP_200_OK)
+
+    def test_migrate_without_tables(self):
+        with self.assertRaises(CommandError):
+            call_command("jwt_blacklist", "--migrate", stdout=StringIO())
+
+    def test_migrate_command(self):
+        now = timezone.now()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "CREATE TABLE token_blacklist_outstandingtoken "
+                "(id integer PRIMARY KEY, jti varchar(255), expires_at datetime)"
+            )
+            cursor.execute(
+                "CREATE TABLE token_blacklist_blacklistedtoken "
+                "(id integer PRIMARY KEY, token_id integer)"
+            )
+            for id, jti, expires_at in (
+                (1, "active", now + timedelta(hours=1)),
+                (2, "expired", now - timedelta(hours=1)),
+                (3, "outstanding", now + timedelta(hours=1)),
+            ):
+                cursor.execute(
+                    "INSERT INTO token_blacklist_outstandingtoken VALUES (%s, %s, %s)",
+                    [id, jti, connection.ops.adapt_datetimefield_value(expires_at)],
+                )
+            cursor.execute(
+                "INSERT INTO token_blacklist_blacklistedtoken VALUES (1, 1), (2, 2)"
+            )
+
+        out = StringIO()
+        call_command("jwt_blacklist", "--migrate", stdout=out)
+
+        self.assertIn("1 tokens migrated", out.getvalue())
+        self.assertTrue(blacklist.is_blacklisted("active"))
+        self.assertFalse(blacklist.is_blacklisted("expired"))
+        self.assertFalse(blacklist.is_blacklisted("outstanding"))
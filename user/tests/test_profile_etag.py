@@ -0,0 +1,49 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+PROFILE_URL = reverse("user:profile")
+FOLLOW_URL = reverse("features:follow-list")
+
+
+class ProfileETagTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("user", "testpass")
+        self.other = get_user_model().objects.create_user("other", "testpass")
+        self.client.force_authenticate(self.user)
+
+    def poll(self, etag):
+        return self.client.get(PROFILE_URL, HTTP_IF_NONE_MATCH=etag)
+
+    def test_unchanged_profile_is_not_modified(self):
+        etag = self.client.get(PROFILE_URL)["ETag"]
+
+        res = self.poll(etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res["ETag"], etag)
+
+    def test_update_changes_the_etag(self):
+        etag = self.client.get(PROFILE_URL)["ETag"]
+
+        res = self.client.patch(PROFILE_URL, {"bio": "Hello"})
+        self.assertEqual(res.data["bio"], "Hello")
+
+        res = self.poll(etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["bio"], "Hello")
+        self.assertNotEqual(res["ETag"], etag)
+
+    def test_follow_counters_change_the_etag(self):
+        etag = self.client.get(PROFILE_URL)["ETag"]
+
+        self.client.force_authenticate(self.other)
+        self.client.post(FOLLOW_URL, {"follower": self.user.id})
+        self.client.force_authenticate(self.user)
+
+        res = self.poll(etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["followers_count"], 1)
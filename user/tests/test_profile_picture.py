@@ -0,0 +1,102 @@
+import shutil
+import tempfile
+from io import BytesIO
+
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from features.models import Post
+from social_media_api.celery import app as celery_app
+from user.models import UserProfile
+
+PROFILE_URL = reverse("user:profile")
+POST_URL = reverse("features:post-list")
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def sample_image_file(size=(800, 600)):
+    image = Image.new("RGB", size, "red")
+    exif = Image.Exif()
+    exif[0x010F] = "Camera maker"
+    buffer = BytesIO()
+    image.save(buffer, "JPEG", exif=exif.tobytes())
+    buffer.seek(0)
+    buffer.name = "picture.jpg"
+    return buffer
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, PROFILE_PICTURE_SIZES=(64, 256))
+class ProfilePictureTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.celery_config = {
+            "CELERY_TASK_ALWAYS_EAGER": celery_app.conf.task_always_eager,
+            "CELERY_BROKER_URL": celery_app.conf.broker_url,
+        }
+        celery_app.conf.update(
+            CELERY_TASK_ALWAYS_EAGER=True, CELERY_BROKER_URL="memory://"
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        celery_app.conf.update(cls.celery_config)
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("reader", "testpass")
+        self.client.force_authenticate(self.user)
+
+    def test_upload_generates_thumbnails(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.patch(
+                PROFILE_URL,
+                {"profile_picture": sample_image_file()},
+                format="multipart",
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["thumbnails"], {})
+
+        profile = UserProfile.objects.get(user=self.user)
+        self.assertEqual(set(profile.thumbnails), {"64", "256"})
+        for size, urls in profile.thumbnails.items():
+            self.assertEqual(set(urls), {"webp", "jpg"})
+            name = urls["jpg"][len("/media/") :]
+            with default_storage.open(name) as thumbnail:
+                image = Image.open(thumbnail)
+                self.assertEqual(image.size, (int(size), int(size)))
+                self.assertEqual(len(image.getexif()), 0)
+
+    def test_update_without_picture_skips_processing(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            res = self.client.patch(PROFILE_URL, {"bio": "Hello"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(callbacks, [])
+
+    def test_upload_changes_expanded_post_pages(self):
+        Post.objects.create(author=self.user, content="Post")
+        params = {"expand": "author"}
+        first = self.client.get(POST_URL, params)
+        self.assertIsNone(first.data["results"][0]["author"]["profile_picture"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                PROFILE_URL,
+                {"profile_picture": sample_image_file()},
+                format="multipart",
+            )
+
+        res = self.client.get(POST_URL, params, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res["ETag"], first["ETag"])
+        self.assertEqual(res["X-Cache"], "MISS")
+        self.assertIsNotNone(res.data["results"][0]["author"]["profile_picture"])
@@ -5,11 +5,18 @@ from rest_framework_simplejwt.views import (
     TokenVerifyView,
 )
 
-from user.views import RegisterView, LoginView, LogoutView, UserProfileView
+from user.views import (
+    RegisterView,
+    LoginView,
+    RefreshView,
+    LogoutView,
+    UserProfileView,
+)
 
 urlpatterns = [
     path("register/", RegisterView.as_view(), name="create"),
     path("login/", LoginView.as_view(), name="login"),
+    path("token/refresh/", RefreshView.as_view(), name="token_refresh"),
     path("logout/", LogoutView.as_view(), name="logout"),
     path("profile/", UserProfileView.as_view(), name="profile"),
 ]
@@ -1,32 +1,52 @@
 from django.contrib.auth import get_user_model
-from rest_framework import generics, permissions, views, status
+from django.db import transaction
+from django.db.models import F
+from django.utils.cache import get_conditional_response, quote_etag
+from drf_spectacular.utils import extend_schema
+from rest_framework import generics, permissions, status
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
-from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
-from user.serializers import UserSerializer, UserProfileSerializer
+from features.cache import invalidate, profile_namespaces
+from user.blacklist import blacklist_token
+from user.models import UserProfile
+from user.serializers import (
+    UserSerializer,
+    UserProfileSerializer,
+    LoginSerializer,
+    RefreshSerializer,
+    LogoutSerializer,
+)
+from user.tasks import generate_profile_thumbnails
 
 
 class RegisterView(generics.CreateAPIView):
     serializer_class = UserSerializer
+    throttle_scope = "auth"
 
 
 class LoginView(TokenObtainPairView):
     permission_classes = [permissions.AllowAny]
+    serializer_class = LoginSerializer
+    throttle_scope = "auth"
 
 
-class LogoutView(views.APIView):
+class RefreshView(TokenRefreshView):
+    serializer_class = RefreshSerializer
+    throttle_scope = "auth"
+
+
+class LogoutView(generics.GenericAPIView):
     permission_classes = (permissions.IsAuthenticated,)
+    serializer_class = LogoutSerializer
 
+    @extend_schema(responses={205: None})
     def post(self, request):
-        try:
-            refresh_token = request.data["refresh_token"]
-            token = RefreshToken(refresh_token)
-            token.blacklist()
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        blacklist_token(serializer.validated_data["refresh_token"])
 
-            return Response(status=status.HTTP_205_RESET_CONTENT)
-        except Exception as e:
-            return Response(status=status.HTTP_400_BAD_REQUEST)
+        return Response(status=status.HTTP_205_RESET_CONTENT)
 
 
 class UserProfileView(generics.RetrieveUpdateAPIView):
@@ -36,4 +56,25 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
     ]
 
     def get_object(self):
-        return self.request.user
+        profile, _ = UserProfile.objects.get_or_create(user=self.request.user)
+        return profile
+
+    def retrieve(self, request, *args, **kwargs):
+        profile = self.get_object()
+        etag = quote_etag(f"profile-{profile.pk}-{profile.version}")
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = Response(self.get_serializer(profile).data)
+        response["ETag"] = etag
+        return response
+
+    def perform_update(self, serializer):
+        version = F("version") + 1
+        if "profile_picture" not in serializer.validated_data:
+            serializer.save(version=version)
+            return
+
+        profile = serializer.save(thumbnails={}, version=version)
+        invalidate(*profile_namespaces())
+        if profile.profile_picture:
+            transaction.on_commit(lambda: generate_profile_thumbnails.delay(profile.id))